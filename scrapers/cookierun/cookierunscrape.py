@@ -1,10 +1,10 @@
-import requests
 import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from service.googlecloudservice import upload_image_to_gcs
+from service.api_service import get_http_session
 
 def process_card_data(card):
     """Process and clean card data"""
@@ -89,7 +89,7 @@ def scrape_specific_card(card_id):
     """Scrape a specific card by ID"""
     try:
         api_url = "https://cookierunbraverse.com/data/json/cardList_asia.json"
-        response = requests.get(api_url, timeout=30)
+        response = get_http_session().get(api_url, timeout=30)
         response.raise_for_status()
         
         api_response = response.json()
@@ -1,4 +1,3 @@
-import requests
 
 import os
 import sys
@@ -9,6 +8,7 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from service.github_service import GitHubService
 from service.mongo_service import MongoService
+from service.api_service import get_http_session
 
 # Initialize Service Layer
 github_service = GitHubService()
@@ -29,7 +29,7 @@ try:
         "Accept": "application/json, text/plain, */*",
     }
         
-    response = requests.get(api_url, headers=headers, timeout=30)
+    response = get_http_session().get(api_url, headers=headers, timeout=30)
     response.raise_for_status()
         
     api_response = response.json()
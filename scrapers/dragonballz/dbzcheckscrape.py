@@ -1,4 +1,3 @@
-import requests
 import json
 import os
 from bs4 import BeautifulSoup
@@ -7,6 +6,7 @@ import sys
 # Add parent directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from service.github_service import GitHubService
+from service.api_service import get_http_session
 from dragonballzfwscrape import scrape_dragonballzfw_cards
 
 # Initialize GitHub service
@@ -15,7 +15,7 @@ FILE_PATH = "dragonballzdb/series.json"
 
 # Step 1: Scrape the current list of series values from the Gundam site
 series_url = "https://www.dbs-cardgame.com/fw/en/cardlist"
-response = requests.get(series_url)
+response = get_http_session().get(series_url)
 soup = BeautifulSoup(response.content, 'html.parser')
 
 # Find all package links in the filter list (ignore "ALL" which has empty data-val)
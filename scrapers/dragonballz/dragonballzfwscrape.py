@@ -1,5 +1,3 @@
-import requests
-from bs4 import BeautifulSoup
 import os
 import sys
 from urllib.parse import urljoin
@@ -8,6 +6,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from service.googlecloudservice import upload_image_to_gcs
 from service.mongo_service import MongoService
+from service.api_service import ApiService, get_http_session
+from service.parse_service import parse_html
 
 # Initialize Service Layer
 mongo_service = MongoService()
@@ -43,13 +43,22 @@ def scrape_dragonballzfw_cards(package_value):
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = get_http_session().get(url, headers=headers)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = parse_html(response, only='.cardCol')
 
         card_items = [item for item in soup.select('.cardCol .cardItem') 
                      if 'display: none' not in item.get('style', '')]
 
+        # Fetch every detail page up front, several at a time, instead of one per card
+        detail_urls = []
+        for item in card_items:
+            card_link = item.find('a', class_='cardStr')
+            if card_link and card_link.get('data-src'):
+                detail_urls.append(urljoin(base_url, card_link['data-src']))
+        detail_urls = list(dict.fromkeys(detail_urls))
+        detail_pages = dict(zip(detail_urls, ApiService(default_headers=headers).gather(detail_urls)))
+
         json_data = []
 
         for item in card_items:
@@ -83,8 +92,12 @@ def scrape_dragonballzfw_cards(package_value):
 
                 # Get additional details from detail page
                 try:
-                    detail_response = requests.get(detail_url, headers=headers)
-                    detail_soup = BeautifulSoup(detail_response.content, 'html.parser')
+                    detail_page = detail_pages.get(detail_url)
+                    if not detail_page:
+                        raise Exception("no detail page link")
+                    if not detail_page['success']:
+                        raise Exception(detail_page.get('error') or f"HTTP {detail_page['status']}")
+                    detail_soup = parse_html(detail_page)
 
                     # Extract common card details
                     card_data['cardNo'] = detail_soup.find('div', class_='cardNo').text.strip() if detail_soup.find('div', class_='cardNo') else ''
@@ -3,20 +3,25 @@ from typing import Dict, Any
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
 import re
 
+from service.document_service import get_document_fetcher
+from service.selenium_service import wait_for_dom_quiet
+
 
 class DuelMastersCardWikiScraper:
     """Scrapes card information from Duel Masters wiki pages."""
     
-    def __init__(self, driver):
-        """Initialize scraper with a Selenium WebDriver instance.
+    def __init__(self, driver=None, fetcher=None):
+        """Initialize scraper with a Selenium WebDriver instance or a DocumentFetcher.
         
         Args:
             driver: A Selenium WebDriver instance to use for fetching pages.
+            fetcher: A DocumentFetcher (plain HTTP first, browser only if needed).
+                Used when no driver is given; defaults to the shared fetcher.
         """
         self.driver = driver
+        self.fetcher = fetcher
     
     def extract_text_content(self, element) -> str:
         """Extract clean text from an element, preserving proper spacing."""
@@ -141,14 +146,20 @@ class DuelMastersCardWikiScraper:
     
     def fetch_page(self, url: str) -> str:
         """Fetch the wiki page content using Selenium and wait for AJAX content."""
+        if self.driver is None:
+            result = (self.fetcher or get_document_fetcher()).fetch(url, selector="table.wikitable")
+            if not result['success']:
+                print(f"Error fetching page: {result['error']}")
+                return None
+            return result['html']
         try:
             self.driver.get(url)
             # Wait for the wikitable to be present (max 15 seconds)
             WebDriverWait(self.driver, 15).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "wikitable"))
             )
-            # Extra wait to ensure all AJAX content is loaded
-            time.sleep(2)
+            # Let late AJAX content settle (returns as soon as the table stops changing)
+            wait_for_dom_quiet(self.driver, quiet=0.4, timeout=2, root_selector="#content")
             return self.driver.page_source
         except Exception as e:
             print(f"Error fetching page with Selenium: {e}")
@@ -316,19 +327,28 @@ class DuelMastersCardWikiScraper:
         Example:
             {"SSP1/SSP1": "https://duelmasters.fandom.com/wiki/Mendelssohn"}
         """
+        if self.driver is None:
+            result = (self.fetcher or get_document_fetcher()).fetch(url, selector="ul")
+            if not result['success']:
+                print(f"Error fetching booster page: {result['error']}")
+                return {}
+            return self._parse_booster_page(result['html'])
         try:
             self.driver.get(url)
             # Wait for the page to load
             WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "ul"))
             )
-            time.sleep(1)  # Extra wait for any dynamic content
+            wait_for_dom_quiet(self.driver, quiet=0.4, timeout=2, root_selector="#content")
             
             html_content = self.driver.page_source
         except Exception as e:
             print(f"Error fetching booster page: {e}")
             return {}
-        
+        return self._parse_booster_page(html_content)
+    
+    def _parse_booster_page(self, html_content: str) -> Dict[str, str]:
+        """Card ID to URL mappings from a booster page's HTML (see scrape_booster_page)."""
         soup = BeautifulSoup(html_content, 'html.parser')
         card_mapping = {}
         
@@ -2,7 +2,6 @@ import json
 import os
 import sys
 from bs4 import BeautifulSoup
-import requests
 
 # Add project root to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -11,6 +10,7 @@ from scrapers.duelmasters.pipelines.a_scrape_covers import duelmaster_cover_scra
 from scrapers.duelmasters.pipelines.b_scrape_cards import startscraping
 from service.utils_service import find_missing_values
 from service.github_service import GitHubService
+from service.api_service import get_http_session
 
 github_service = GitHubService()
 FILE_PATH = "duelmasterdb/series.json"
@@ -19,7 +19,7 @@ def scrape_website_values():
     print("🌐 Scraping website values...")
     url = "https://dm.takaratomy.co.jp/card/"
     try:
-        response = requests.get(url)
+        response = get_http_session().get(url)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import json
 import re
@@ -12,6 +11,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 from service.googlecloudservice import upload_image_to_gcs
 from service.mongo_service import MongoService
 from service.github_service import GitHubService
+from service.api_service import get_http_session
 
 # Initialize Service Layer
 github_service = GitHubService()
@@ -22,7 +22,7 @@ DATE_FILE_PATH = "duelmasterdb/last_pdt_date.json"
 
 # Function to scrape a single page
 def scrape_page(url, category_key):
-    response = requests.get(url)
+    response = get_http_session().get(url)
     soup = BeautifulSoup(response.text, 'html.parser')
 
     # Find all items on the page - use category-specific class
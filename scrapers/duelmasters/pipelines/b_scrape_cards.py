@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import time
 import re
@@ -7,11 +6,10 @@ import os
 import sys
 import base64
 import unicodedata
+from urllib.parse import urljoin
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
@@ -19,30 +17,19 @@ from service.googlecloudservice import upload_image_to_gcs
 from service.mongo_service import MongoService
 from service.translationservice import translate_data
 from service.github_service import GitHubService
+from service.api_service import ApiService
+from service.document_service import DocumentFetcher, HTML_HEADERS
+from service.parse_service import parse_html
+from service.selenium_service import SeleniumService, chrome_service, wait_for_count_stable, wait_for_network_idle
 
 # Initialize Service Layer
 github_service = GitHubService()
 mongo_service = MongoService()
 
-
-def fetch_with_retry(url: str, max_retries: int = 3, timeout: int = 30):
-    """requests.get with timeout + retries on Timeout/ConnectionError.
-
-    The detail-page fetch was hanging indefinitely (no timeout set) and any
-    transient network blip killed the whole booster scrape.
-    """
-    last_exc = None
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = requests.get(url, timeout=timeout)
-            response.raise_for_status()
-            return response
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-            last_exc = e
-            print(f"⚠️ fetch failed for {url} (attempt {attempt}/{max_retries}): {e}")
-            if attempt < max_retries:
-                time.sleep(2 ** attempt)
-    raise last_exc
+# Every card list URL differs only in its JSON query, so they share one transport decision
+CARDLIST_PATTERN = "dm.takaratomy.co.jp/card/"
+# Card detail pages fetched at once
+DETAIL_CONCURRENCY = 8
 
 
 def normalize_jp_name(s: str) -> str:
@@ -74,11 +61,13 @@ def _build_chrome_options():
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
-    return chrome_options
+    return SeleniumService.apply_profile_options(chrome_options, "scrape")
 
 
 def _new_driver():
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=_build_chrome_options())
+    # chromedriver is resolved once per process, so recreating a driver after a crash stays cheap
+    driver = webdriver.Chrome(service=chrome_service(), options=_build_chrome_options())
+    return SeleniumService.apply_profile(driver, "scrape")
 
 
 def safe_get(driver, url, max_retries=3):
@@ -107,7 +96,8 @@ def get_total_pages(driver, booster):
     url = f"https://dm.takaratomy.co.jp/card/?v=%7B%22suggest%22:%22on%22,%22keyword_type%22:%5B%22card_name%22,%22card_ruby%22,%22card_text%22%5D,%22culture_cond%22:%5B%22%E5%8D%98%E8%89%B2%22,%22%E5%A4%9A%E8%89%B2%22%5D,%22pagenum%22:%221%22,%22samename%22:%22show%22,%22products%22:%22{booster}%22,%22sort%22:%22release_new%22%7D"
     
     driver.get(url)
-    time.sleep(3)
+    wait_for_network_idle(driver, timeout=15)
+    wait_for_count_stable(driver, By.CSS_SELECTOR, "div.wp-pagenavi a.page", min_count=0, stable_for=0.3, timeout=5)
 
     try:
         pagination = driver.find_elements(By.CSS_SELECTOR, "div.wp-pagenavi a.page")
@@ -166,7 +156,19 @@ def split_civilization(civilization_string):
     
     return [c.strip() for c in civilization_string.split("/") if c.strip()]
 
-def scrape_all_pages(driver, booster):
+def fetch_list_page(fetcher, url, max_retries=3):
+    """Fetch a card list page (plain HTTP when the list is server-rendered), with retries."""
+    for attempt in range(1, max_retries + 1):
+        result = fetcher.fetch(url, selector='div#cardlist li', pattern=CARDLIST_PATTERN)
+        if result['success']:
+            return result
+        print(f"⚠️ Fetching card list failed (attempt {attempt}/{max_retries}): {result['error']}")
+        if attempt < max_retries:
+            time.sleep(5)
+    return result
+
+
+def scrape_all_pages(fetcher, booster):
     all_card_data = []
     page_num = 1
     consecutive_empty_pages = 0
@@ -176,19 +178,19 @@ def scrape_all_pages(driver, booster):
         print(f"\n📄 Scraping Page {page_num}")
         url = f"https://dm.takaratomy.co.jp/card/?v=%7B%22suggest%22:%22on%22,%22keyword_type%22:%5B%22card_name%22,%22card_ruby%22,%22card_text%22%5D,%22culture_cond%22:%5B%22%E5%8D%98%E8%89%B2%22,%22%E5%A4%9A%E8%89%B2%22%5D,%22pagenum%22:%22{page_num}%22,%22samename%22:%22show%22,%22products%22:%22{booster}%22,%22sort%22:%22release_new%22%7D"
 
-        driver = safe_get(driver, url)
-        time.sleep(3)
+        result = fetch_list_page(fetcher, url)
+        if not result['success']:
+            raise RuntimeError(f"Could not fetch card list page {page_num}: {result['error']}")
 
-        card_items = driver.find_elements(By.CSS_SELECTOR, 'div#cardlist li')
+        soup = BeautifulSoup(result['html'], 'html.parser')
+        card_items = soup.select('div#cardlist li')
         page_data = []
 
         for card in card_items:
             try:
-                img = card.find_element(By.TAG_NAME, 'img')
-                image_url = img.get_attribute('src')
-
-                link = card.find_element(By.TAG_NAME, 'a')
-                detail_url = link.get_attribute('href')
+                # Resolve relative links the way the browser's .src/.href did
+                image_url = urljoin(result['url'], card.find('img')['src'])
+                detail_url = urljoin(result['url'], card.find('a')['href'])
 
                 card_id = detail_url.split('=')[-1] if detail_url else 'No ID'
 
@@ -208,10 +210,9 @@ def scrape_all_pages(driver, booster):
             all_card_data.extend(page_data)
         
         page_num += 1
-        time.sleep(1)
     
     print(f"\n✅ Total cards scraped: {len(all_card_data)}")
-    return all_card_data, driver
+    return all_card_data
 
 def scrape_card_details(card_data):
     """Scrapes the detailed information for each card and processes it."""
@@ -223,12 +224,17 @@ def scrape_card_details(card_data):
     # card_data = card_data[:4]
     # print(f"⚠️ TEST MODE: Processing only first 4 cards")
 
-    for card in card_data:
+    # Fetch every detail page up front, several at a time, instead of one per card
+    detail_pages = ApiService(default_headers=HTML_HEADERS).gather(
+        [card[2] for card in card_data], concurrency=DETAIL_CONCURRENCY
+    )
+
+    for card, detail_page in zip(card_data, detail_pages):
         try:
             card = process_card(card)  # Process the card to extract booster, cardUid, and urlimage
-            detail_url = card["detailUrl"]
-            response = fetch_with_retry(detail_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            if not detail_page['success']:
+                raise Exception(f"detail page {detail_page['url']}: {detail_page.get('error') or detail_page['status']}")
+            soup = parse_html(detail_page)
 
             # Scraping details
             full_name = soup.find("h3", class_="card-name").text.strip()
@@ -535,12 +541,13 @@ def apply_wiki_data(card, wiki_card):
 
 
 def startscraping(booster_list):
-    driver = _new_driver()
+    # Chrome is only started if the list pages turn out to need JavaScript
+    fetcher = DocumentFetcher(driver_factory=_new_driver)
 
     try:
         for booster in booster_list:
             print(f"🚀 Processing booster: {booster}")
-            card_data, driver = scrape_all_pages(driver, booster)
+            card_data = scrape_all_pages(fetcher, booster)
 
             # Pre-filter: skip cards whose cardUid already exists in DB so we
             # don't pay the detail-page fetch + GCS upload cost for them.
@@ -664,8 +671,8 @@ def startscraping(booster_list):
                     fields_to_translate=['cardName', 'cardName2', 'effects', 'effects2', 'race', 'race2'],
                     src_lang='ja',
                     dest_lang='en',
-                    batch_size=100,
-                    max_retries=3
+                    max_retries=3,
+                    segmented=True
                 )
 
             if not detailed_card_data:
@@ -723,5 +730,5 @@ def startscraping(booster_list):
                 print("⚠️ MongoDB collection name not found in environment variables")
         
     finally:
-        driver.quit()
+        fetcher.close()
 
@@ -3,23 +3,25 @@ import sys
 import json
 import random
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import quote, urlsplit, urlunsplit
 
 from bs4 import BeautifulSoup
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 from dotenv import load_dotenv
 from scrapers.duelmasters.lib.wiki_card_scraper import DuelMastersCardWikiScraper
 from service.mongo_service import MongoService
+from service.document_service import DocumentFetcher
+from service.selenium_service import SeleniumService, WebDriverPool, chrome_service, wait_for_dom_quiet
 
 load_dotenv()
 
@@ -30,6 +32,8 @@ UPDATE_CARDS_PATH = project_root / "duelmasterdb" / "update.json"
 WIKI_SETS_PATH = project_root / "duelmasterdb" / "wiki_sets.json"
 WIKI_BASE = "https://duelmasters.fandom.com"
 UPLOAD_BATCH_SIZE = 10
+# Pages a pooled driver serves before it is restarted (also rotates the user agent)
+DRIVER_MAX_PAGES = 50
 
 # Known non-card wiki page paths (lowercase, for exact skip check)
 NON_CARD_WIKI_PATHS = {
@@ -119,10 +123,12 @@ def create_driver():
     chrome_options.add_argument("--disable-logging")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
-    return webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
+    SeleniumService.apply_profile_options(chrome_options, "scrape")
+    driver = webdriver.Chrome(
+        service=chrome_service(),
         options=chrome_options,
     )
+    return SeleniumService.apply_profile(driver, "scrape")
 
 
 def _safe_url(url: str) -> str:
@@ -142,11 +148,10 @@ def fetch_card_links_from_set(set_url: str) -> list[str]:
     try:
         driver.set_page_load_timeout(30)
         driver.get(_safe_url(set_url))
-        time.sleep(3)
         WebDriverWait(driver, 30).until(
             EC.presence_of_element_located((By.ID, "content"))
         )
-        time.sleep(2)
+        wait_for_dom_quiet(driver, quiet=0.5, timeout=5, root_selector="#content")
         soup = BeautifulSoup(driver.page_source, 'html.parser')
     finally:
         driver.quit()
@@ -197,7 +202,76 @@ def flush_batch(mongo_service, batch):
         batch.clear()
 
 
-def scrape_bulk(limit=None):
+def scrape_urls(urls, mongo_service, workers=1, indent="  "):
+    """
+    Scrape wiki card URLs and upload in batches.
+
+    Pages are fetched over plain HTTP when the card table is already in the
+    served HTML; a shared pool of drivers is only started if it is not.
+
+    Args:
+        urls: Card URLs to scrape
+        mongo_service: MongoService used for uploads
+        workers: Number of pages fetched in parallel
+        indent: Log prefix
+
+    Returns:
+        (scraped count, failed URLs)
+    """
+    batch = []
+    failed = []
+    scraped = 0
+    lock = threading.Lock()
+
+    def scrape_one(idx, url, fetcher):
+        nonlocal scraped
+        print(f"{indent}[{idx}/{len(urls)}] {url}")
+        try:
+            card_obj = DuelMastersCardWikiScraper(fetcher=fetcher).scrape_card(url)
+        except Exception as e:
+            print(f"{indent}  -> ERROR: {e}")
+            with lock:
+                failed.append(url)
+            return
+
+        with lock:
+            if card_obj:
+                batch.append(card_obj)
+                scraped += 1
+                forms = [c.get('name', '?') for c in card_obj.get('cards', [])]
+                print(f"{indent}  -> {' / '.join(forms)}")
+            else:
+                print(f"{indent}  -> no data returned")
+                failed.append(url)
+            if len(batch) >= UPLOAD_BATCH_SIZE:
+                flush_batch(mongo_service, batch)
+
+    with WebDriverPool(size=workers, max_pages=DRIVER_MAX_PAGES, factory=create_driver) as pool, \
+            DocumentFetcher(pool=pool) as fetcher:
+        if workers <= 1:
+            for idx, url in enumerate(urls, 1):
+                scrape_one(idx, url, fetcher)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(scrape_one, idx, url, fetcher): url
+                    for idx, url in enumerate(urls, 1)
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # scrape_one handles scrape errors itself; this is e.g. a failed batch upload
+                        print(f"{indent}  -> ERROR in worker for {futures[future]}: {e}")
+                        with lock:
+                            failed.append(futures[future])
+        print(f"{indent}Transport: {fetcher.stats['http']} over HTTP, {fetcher.stats['browser']} in a browser")
+
+    flush_batch(mongo_service, batch)
+    return scraped, failed
+
+
+def scrape_bulk(limit=None, workers=1):
     with open(UNIQUE_CARDS_PATH, encoding='utf-8') as f:
         data = json.load(f)
     all_urls = data['urls']
@@ -226,36 +300,7 @@ def scrape_bulk(limit=None):
         print("Nothing to scrape.")
         return
 
-    batch = []
-    failed = []
-    scraped = 0
-
-    for idx, url in enumerate(urls_to_scrape, 1):
-        print(f"[{idx}/{len(urls_to_scrape)}] {url}")
-        driver = create_driver()
-        try:
-            card_obj = DuelMastersCardWikiScraper(driver).scrape_card(url)
-            if card_obj:
-                batch.append(card_obj)
-                scraped += 1
-                forms = [c.get('name', '?') for c in card_obj.get('cards', [])]
-                print(f"  -> {' / '.join(forms)}")
-            else:
-                print(f"  -> no data returned")
-                failed.append(url)
-        except Exception as e:
-            print(f"  -> ERROR: {e}")
-            failed.append(url)
-        finally:
-            try:
-                driver.quit()
-            except Exception:
-                pass
-
-        if len(batch) >= UPLOAD_BATCH_SIZE:
-            flush_batch(mongo_service, batch)
-
-    flush_batch(mongo_service, batch)
+    scraped, failed = scrape_urls(urls_to_scrape, mongo_service, workers=workers, indent="")
 
     print(f"\nDone.")
     print(f"  Scraped & uploaded : {scraped}")
@@ -283,7 +328,7 @@ def derive_set_code_from_url(set_url: str) -> str | None:
     return m.group(1) if m else None
 
 
-def scrape_from_set_url(set_url: str, set_code: str | None):
+def scrape_from_set_url(set_url: str, set_code: str | None, workers: int = 1):
     set_code_from_lookup = None
     if WIKI_SETS_PATH.exists():
         with open(WIKI_SETS_PATH, encoding='utf-8') as f:
@@ -328,36 +373,7 @@ def scrape_from_set_url(set_url: str, set_code: str | None):
         print("Nothing to scrape.")
         return
 
-    batch = []
-    failed = []
-    scraped = 0
-
-    for idx, url in enumerate(urls_to_scrape, 1):
-        print(f"  [{idx}/{len(urls_to_scrape)}] {url}")
-        driver = create_driver()
-        try:
-            card_obj = DuelMastersCardWikiScraper(driver).scrape_card(url)
-            if card_obj:
-                batch.append(card_obj)
-                scraped += 1
-                forms = [c.get('name', '?') for c in card_obj.get('cards', [])]
-                print(f"    -> {' / '.join(forms)}")
-            else:
-                print(f"    -> no data returned")
-                failed.append(url)
-        except Exception as e:
-            print(f"    -> ERROR: {e}")
-            failed.append(url)
-        finally:
-            try:
-                driver.quit()
-            except Exception:
-                pass
-
-        if len(batch) >= UPLOAD_BATCH_SIZE:
-            flush_batch(mongo_service, batch)
-
-    flush_batch(mongo_service, batch)
+    scraped, failed = scrape_urls(urls_to_scrape, mongo_service, workers=workers)
 
     print(f"\nDone scraping set {set_code}.")
     print(f"  Scraped & uploaded : {scraped}")
@@ -374,9 +390,10 @@ if __name__ == "__main__":
     parser.add_argument('--test', action='store_true', help='Scrape only the first 3 cards')
     parser.add_argument('--set-url', type=str, help='Scrape cards from a specific wiki set page URL')
     parser.add_argument('--set-code', type=str, help='Set code for wiki_set_cards.json (auto-derived if omitted)')
+    parser.add_argument('--workers', type=int, default=1, help='Wiki pages fetched in parallel (one pooled browser each)')
     args = parser.parse_args()
 
     if args.set_url:
-        scrape_from_set_url(args.set_url, args.set_code)
+        scrape_from_set_url(args.set_url, args.set_code, workers=args.workers)
     else:
-        scrape_bulk(limit=3 if args.test else None)
+        scrape_bulk(limit=3 if args.test else None, workers=args.workers)
@@ -1,10 +1,10 @@
-import requests
 import re
 import json
 import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from service.api_service import get_http_session
 
 WIKI_API = "https://duelmasters.fandom.com/api.php"
 WIKI_BASE = "https://duelmasters.fandom.com/wiki/"
@@ -36,7 +36,7 @@ def fetch_wikitext(page: str) -> str:
     headers = {
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
     }
-    response = requests.get(WIKI_API, params=params, headers=headers, timeout=30)
+    response = get_http_session().get(WIKI_API, params=params, headers=headers, timeout=30)
     response.raise_for_status()
     data = response.json()
     return data["parse"]["wikitext"]["*"]
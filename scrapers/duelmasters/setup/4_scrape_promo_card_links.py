@@ -28,10 +28,9 @@ import sys
 import time
 from pathlib import Path
 
-import requests
-
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
+from service.api_service import get_http_session
 
 WIKI_API = "https://duelmasters.fandom.com/api.php"
 WIKI_BASE = "https://duelmasters.fandom.com/wiki/"
@@ -135,7 +134,7 @@ LINK_RE = re.compile(r'\[\[([^|\]#]+?)(?:\|[^\]]*)?\]\]')
 
 
 def fetch_wikitext(page: str) -> str:
-    r = requests.get(
+    r = get_http_session().get(
         WIKI_API,
         params={"action": "parse", "page": page, "prop": "wikitext", "format": "json"},
         headers={"User-Agent": "Mozilla/5.0"},
@@ -10,6 +10,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from service.googlecloudservice import upload_image_to_gcs
 from service.mongo_service import MongoService
 from service.api_service import ApiService
+from service.diff_service import ERRATA_CHECK, CardDiff
 
 # Environment Variables
 C_GUNDAM = os.getenv('C_GUNDAM')
@@ -20,8 +21,21 @@ BASE_URL = "https://www.gundam-gcg.com"
 mongo_service = MongoService()
 api_service = ApiService(BASE_URL)
 
-def scrape_gundam_cards(package_value):
-    """Scrape Gundam cards for a specific package value and upload to MongoDB/GCS"""
+# Fields of stored cards compared for errata
+ERRATA_FIELDS = [
+    'cardName', 'series', 'cardId', 'rarity', 'level', 'cost', 'color', 'cardType', 'effect',
+    'zone', 'trait', 'link', 'attackPower', 'hitPoints', 'sourceTitle', 'obtainedFrom',
+]
+card_diff = CardDiff(C_GUNDAM, fields=ERRATA_FIELDS, key='cardUid', site='gundam', mongo=mongo_service)
+
+def scrape_gundam_cards(package_value, check_errata=ERRATA_CHECK):
+    """
+    Scrape Gundam cards for a specific package value and upload to MongoDB/GCS
+
+    Args:
+        package_value: Package code
+        check_errata: Also re-read stored cards and update fields that changed on the site
+    """
     if not package_value:
         print("❌ package_value is not provided. Exiting.")
         return
@@ -36,28 +50,44 @@ def scrape_gundam_cards(package_value):
                      if 'display: none' not in item.get('style', '')]
 
         json_data = []
-        carduid_from_mongo = set(mongo_service.get_unique_values_scoped(C_GUNDAM,"package",package_value,"cardUid"))
+        stored_cards = []
+        existing_docs = mongo_service.find_all_by_field(C_GUNDAM, "package", package_value)
+        carduid_from_mongo = {doc.get('cardUid') for doc in existing_docs}
+        # Read every card link first so the detail pages can be fetched together
+        entries = []
         for item in card_items:
             try:
                 card_link = item.find('a', class_='cardStr')
                 if not card_link:
                     continue
 
-                base_url = BASE_URL
                 # Extract basic card info
                 detail_url = card_link.get('data-src', '')
                 card_id = detail_url.split('detailSearch=')[-1] if 'detailSearch=' in detail_url else ''
                 image_url = card_link.find('img').get('data-src', '') or card_link.find('img').get('src', '')
                 alt_text = card_link.find('img').get('alt', '')
 
-                # Process image
-                full_image_url = urljoin(base_url, image_url) if image_url else ''
                 filename = image_url.split('/')[-1].split('?')[0] if image_url else ''
                 card_uid = filename.replace('.webp', '')
-                if card_uid in carduid_from_mongo:
+                stored = card_uid in carduid_from_mongo
+                if stored and not check_errata:
                     print(f"⚠️ Skipping existing cardUid: {card_uid}")
                     continue
-                urlimage = upload_image_to_gcs(full_image_url, card_uid, gcs_imgpath_value)
+                entries.append((detail_url, card_id, image_url, alt_text, card_uid, stored))
+            except Exception as e:
+                print(f"❌ Error processing card: {str(e)}")
+
+        detail_urls = [entry[0] for entry in entries if entry[0]]
+        detail_pages = dict(zip(detail_urls, api_service.gather(
+            [f"/asia-en/cards/{detail_url}" for detail_url in detail_urls]
+        )))
+
+        for detail_url, card_id, image_url, alt_text, card_uid, stored in entries:
+            try:
+                base_url = BASE_URL
+                # Process image
+                full_image_url = urljoin(base_url, image_url) if image_url else ''
+                urlimage = None if stored else upload_image_to_gcs(full_image_url, card_uid, gcs_imgpath_value)
 
                 # Initialize card data structure
                 card_data = {
@@ -72,8 +102,10 @@ def scrape_gundam_cards(package_value):
                 # Get additional details from detail page if available
                 if detail_url:
                     try:
-                        print(f"Fetching details for card ID: {card_uid} from {detail_url}")
-                        detail_response = api_service.get(f"/asia-en/cards/{detail_url}")
+                        print(f"Reading details for card ID: {card_uid} from {detail_url}")
+                        detail_response = detail_pages[detail_url]
+                        if not detail_response['success']:
+                            raise RuntimeError(detail_response.get('error') or f"HTTP {detail_response['status']}")
                         detail_soup = BeautifulSoup(detail_response['data'], 'html.parser')
                         
                         # Extract card number and rarity
@@ -155,13 +187,19 @@ def scrape_gundam_cards(package_value):
                     except Exception as e:
                         print(f"⚠️ Couldn't fetch details for {card_id}: {str(e)}")
 
-                json_data.append(card_data)
+                if stored:
+                    stored_cards.append(card_data)
+                    continue
+                json_data.append(card_diff.stamp(card_data))
                 print(json.dumps(card_data, indent=2, ensure_ascii=False))
                 print(f"✅ Success: {card_data['cardName']} ({card_id})")
 
             except Exception as e:
                 print(f"❌ Error processing card: {str(e)}")
 
+        if stored_cards:
+            card_diff.apply(card_diff.compare(stored_cards, existing_docs, scope={"package": package_value}))
+
         # Upload to MongoDB only if there's new data
         collection_value = C_GUNDAM # Default collection name
         if json_data:  # Only upload if there are new cards
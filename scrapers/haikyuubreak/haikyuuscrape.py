@@ -15,6 +15,7 @@ import certifi
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from service.selenium_service import SeleniumService
+from service.api_service import host_turn
 from service.mongo_service import MongoService
 from service.googlecloudservice import upload_image_to_gcs
 from service.openrouter_service import OpenRouterService
@@ -321,6 +322,32 @@ def scrape_cards_for_booster(booster_code):
             pass
 
 
+def _labelled_items(section):
+    """Spec for the <div><h3>label</h3>value</div> rows of a detail section"""
+    return {
+        '_scope': f'div.{section}',
+        'items': {'_each': 'div', 'label': ('h3', 'strings'), 'strings': ('', 'strings')},
+    }
+
+
+# Detail page fields read in a single round trip (see compile_extract_spec).
+# 'strings' mirrors BeautifulSoup's stripped_strings, so get_text(strip=True) is ''.join(strings)
+CARD_DETAIL_SPEC = {
+    'attribute': _labelled_items('attribute'),
+    'txt': {
+        '_scope': 'div.txt',
+        'items': {
+            '_each': 'div',
+            'label': ('h3', 'strings'),
+            'value_html': ('div[style="white-space: pre-line;"]', 'outerHTML'),
+        },
+    },
+    'status': _labelled_items('status'),
+    'products': _labelled_items('products'),
+    'other': _labelled_items('other'),
+}
+
+
 def scrape_card_details(selenium, detail_url, card_id):
     """
     Scrape detailed information from a card's detail page using Selenium
@@ -337,7 +364,6 @@ def scrape_card_details(selenium, detail_url, card_id):
     import time
 
     main_sec = None
-    soup = None
     max_attempts = 3
     for attempt in range(1, max_attempts + 1):
         try:
@@ -347,12 +373,8 @@ def scrape_card_details(selenium, detail_url, card_id):
             # Wait longer on each retry to give a degraded session more time to render
             time.sleep(2 * attempt)
 
-            # Get the rendered HTML
-            page_source = selenium.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-
-            # Find main card section
-            main_sec = soup.find('div', class_='main_sec_inner_card')
+            # Read just the fields we need from the rendered main card section
+            main_sec = selenium.extract(CARD_DETAIL_SPEC, root='div.main_sec_inner_card')
             if main_sec:
                 break
 
@@ -367,14 +389,13 @@ def scrape_card_details(selenium, detail_url, card_id):
         details = {}
         
         # Extract attribute information
-        attribute_div = main_sec.find('div', class_='attribute')
+        attribute_div = main_sec['attribute']
         if attribute_div:
-            for item in attribute_div.find_all('div'):
-                h3 = item.find('h3')
-                if h3:
-                    label = h3.get_text(strip=True)
+            for item in attribute_div['items']:
+                if item['label'] is not None:
+                    label = ''.join(item['label'])
                     # Get the value (text after h3)
-                    value = item.get_text(strip=True).replace(label, '').strip()
+                    value = ''.join(item['strings']).replace(label, '').strip()
                     if label == 'カテゴリ':
                         details['category'] = value
                     elif label == 'バボリティ':
@@ -382,7 +403,7 @@ def scrape_card_details(selenium, detail_url, card_id):
                     elif label == '所属':
                         # Extract text content, ignoring ruby tags
                         affiliation_text = ''
-                        for text in item.stripped_strings:
+                        for text in item['strings']:
                             if text != label:
                                 affiliation_text += text
                         # Parse affiliation with year mapping
@@ -391,7 +412,7 @@ def scrape_card_details(selenium, detail_url, card_id):
                     elif label == 'ポジション':
                         # Extract text content, ignoring ruby tags
                         position_text = ''
-                        for text in item.stripped_strings:
+                        for text in item['strings']:
                             if text != label:
                                 position_text += text
                         details['position'] = position_text.strip()
@@ -399,14 +420,15 @@ def scrape_card_details(selenium, detail_url, card_id):
             print(f"      ⚠️ No attribute section found")
         
         # Extract skills and notes
-        txt_div = main_sec.find('div', class_='txt')
+        txt_div = main_sec['txt']
         if txt_div:
-            for item in txt_div.find_all('div'):
-                h3 = item.find('h3')
-                if h3:
-                    label = h3.get_text(strip=True)
+            for item in txt_div['items']:
+                if item['label'] is not None:
+                    label = ''.join(item['label'])
                     # Get value from the next div, preserving icon representations
-                    value_div = item.find('div', style='white-space: pre-line;')
+                    value_div = None
+                    if item['value_html']:
+                        value_div = BeautifulSoup(item['value_html'], 'html.parser').find('div')
                     value = extract_text_with_icons(value_div)
                     if label == 'スキル':
                         details['effectsJP'] = value
@@ -416,13 +438,12 @@ def scrape_card_details(selenium, detail_url, card_id):
             print(f"      ⚠️ No txt section found")
         
         # Extract status (serve, block, receive, toss, attack)
-        status_div = main_sec.find('div', class_='status')
+        status_div = main_sec['status']
         if status_div:
-            for item in status_div.find_all('div'):
-                h3 = item.find('h3')
-                if h3:
-                    label = h3.get_text(strip=True)
-                    value = item.get_text(strip=True).replace(label, '').strip()
+            for item in status_div['items']:
+                if item['label'] is not None:
+                    label = ''.join(item['label'])
+                    value = ''.join(item['strings']).replace(label, '').strip()
                     if label == 'サーブ':
                         details['serve'] = value
                     elif label == 'ブロック':
@@ -437,25 +458,23 @@ def scrape_card_details(selenium, detail_url, card_id):
             print(f"      ⚠️ No status section found")
         
         # Extract recorded in (product)
-        products_div = main_sec.find('div', class_='products')
+        products_div = main_sec['products']
         if products_div:
-            for item in products_div.find_all('div'):
-                h3 = item.find('h3')
-                if h3:
-                    if h3.get_text(strip=True) == '収録先':
-                        details['recorded_in'] = item.get_text(strip=True).replace('収録先', '').strip()
+            for item in products_div['items']:
+                if item['label'] is not None:
+                    if ''.join(item['label']) == '収録先':
+                        details['recorded_in'] = ''.join(item['strings']).replace('収録先', '').strip()
         else:
             print(f"      ⚠️ No products section found")
         
         # Extract illustrator
-        other_div = main_sec.find('div', class_='other')
+        other_div = main_sec['other']
         if other_div:
-            for item in other_div.find_all('div'):
-                h3 = item.find('h3')
-                if h3:
-                    label = h3.get_text(strip=True)
+            for item in other_div['items']:
+                if item['label'] is not None:
+                    label = ''.join(item['label'])
                     if label == 'illust:':
-                        details['illustrator'] = item.get_text(strip=True).replace('illust:', '').strip()
+                        details['illustrator'] = ''.join(item['strings']).replace('illust:', '').strip()
         else:
             print(f"      ⚠️ No other section found")
         
@@ -487,16 +506,16 @@ def update_card_with_details(selenium, cards_list):
             if i % 10 == 0:
                 print(f"  ⏳ Progress: {i}/{len(cards_list)}")
             
-            # Scrape details
-            card_details = scrape_card_details(selenium, detail_url, card['cardId'])
+            # Scrape details, paced by the site's adaptive rate
+            with host_turn(detail_url) as fail:
+                card_details = scrape_card_details(selenium, detail_url, card['cardId'])
+                # An empty result means the page never rendered its card section
+                if not card_details:
+                    fail()
             
             # Merge details into card data
             card.update(card_details)
             
-            # Small delay to avoid rate limiting
-            import time
-            time.sleep(0.5)
-            
         except Exception as e:
             print(f"  ⚠️ Error updating card {card['cardId']}: {e}")
             continue
@@ -669,7 +688,8 @@ def start_scraping(booster_list=None):
                         ('effectsJP', 'effects'),
                         ('notesJP', 'notes')
                     ],
-                    batch_size=8
+                    segmented=True,
+                    run_id=f"haikyuu:{'+'.join(booster_list)}"
                 )
                 
                 if translation_result['success']:
@@ -2,7 +2,6 @@ import json
 import os
 import sys
 from bs4 import BeautifulSoup
-import requests
 from dotenv import load_dotenv
 from datetime import datetime
 from pymongo import MongoClient
@@ -15,6 +14,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from service.utils_service import find_missing_values
 from service.mongo_service import MongoService
 from service.googlecloudservice import upload_image_to_gcs
+from service.api_service import get_http_session
 from scrapers.haikyuubreak.haikyuuscrape import start_scraping
 
 load_dotenv()
@@ -41,7 +41,7 @@ def scrape_detailed_products():
     url = f"{BASE_URL}/product/"
     
     try:
-        response = requests.get(url)
+        response = get_http_session().get(url)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
         
@@ -95,7 +95,7 @@ def scrape_detailed_products():
                     # Fetch detail page to get main image
                     print(f"  📄 Fetching detail page: {href}")
                     detail_url = f"{BASE_URL}/product/{href}"
-                    detail_response = requests.get(detail_url)
+                    detail_response = get_http_session().get(detail_url)
                     detail_response.raise_for_status()
                     detail_soup = BeautifulSoup(detail_response.text, 'html.parser')
                     
@@ -157,7 +157,7 @@ def scrape_website_values():
     url = f"{BASE_URL}/product/"
     
     try:
-        response = requests.get(url)
+        response = get_http_session().get(url)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
         
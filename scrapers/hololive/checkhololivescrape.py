@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import json
 import os
@@ -14,6 +13,7 @@ from service.mongo_service import MongoService
 from service.github_service import GitHubService
 from service.googlecloudservice import upload_image_to_gcs
 from service.selenium_service import SeleniumService
+from service.api_service import get_http_session
 from hololivescrape import scrape_hololive_card
 
 github_service = GitHubService()
@@ -49,7 +49,7 @@ def scrape_expansions_from_cardlist():
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = get_http_session().get(url, headers=headers, timeout=30)
         response.raise_for_status()
         soup = BeautifulSoup(response.content, 'html.parser')
 
@@ -177,7 +177,6 @@ def scrape_cards_for_expansion(expansion_code, expansion_title):
                 card_data['booster'] = expansion_code
                 card_data['expansionTitle'] = expansion_title
                 cards_data.append(card_data)
-            time.sleep(0.3)
         except Exception as e:
             print(f"    Error: {e}")
             continue
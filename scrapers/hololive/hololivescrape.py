@@ -1,5 +1,4 @@
 import requests
-from bs4 import BeautifulSoup
 import os
 import sys
 import re
@@ -8,6 +7,8 @@ from urllib.parse import urljoin
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from service.googlecloudservice import upload_image_to_gcs
+from service.api_service import get_http_session
+from service.parse_service import parse_html
 
 
 def parse_color_icon(dd):
@@ -36,9 +37,9 @@ def scrape_hololive_card(card_id, translate=True):
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = get_http_session().get(url, headers=headers, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = parse_html(response, only='div.cardlist-Detail_Box')
 
         card_data = {
             "cardId": str(card_id),
@@ -1,6 +1,4 @@
-import requests
 import re
-from bs4 import BeautifulSoup
 import os
 import sys
 import json
@@ -10,11 +8,16 @@ import argparse
 # Add parent directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from service.mongo_service import MongoService
+from service.api_service import get_http_session
+from service.parse_service import parse_html
 from cleanup_utils import cleanup_old_backups
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Only the item list and the pagination links are read from a list page
+PAGE_PARSE_TARGETS = ['div.indexItemBox', 'li.next']
+
 class FullaheadScraper:
     """Scraper for Fulla Ahead Union Arena shop"""
     
@@ -42,7 +45,7 @@ class FullaheadScraper:
             
             while current_url:
                 print(f"\n🔄 Fetching page {page_num}: {current_url}")
-                response = requests.get(current_url, timeout=10)
+                response = get_http_session().get(current_url, timeout=10)
                 response.encoding = 'utf-8'
                 
                 if response.status_code != 200:
@@ -50,10 +53,11 @@ class FullaheadScraper:
                     break
                 
                 print(f"🔄 Parsing HTML and extracting card data from page {page_num}")
-                self.extract_cardlist_data(response.text)
+                self.extract_cardlist_data(response)
                 
                 # Check for next page link - specifically look for "次の50件" (next 50 items)
-                soup = BeautifulSoup(response.text, 'html.parser')
+                # (same targets as extract_cardlist_data, so this reuses its parsed tree)
+                soup = parse_html(response, only=PAGE_PARSE_TARGETS)
                 next_link = None
                 
                 # Find all <li class="next"> elements
@@ -88,7 +92,7 @@ class FullaheadScraper:
     
     def extract_cardlist_data(self, html_content):
         """
-        Extract card data from HTML content
+        Extract card data from HTML content (text or the page's response)
         
         Card name format: UA01ST/CGH-1-015 ルルーシュ・ランペルージ U
         - booster: UA01ST (before /)
@@ -97,7 +101,7 @@ class FullaheadScraper:
         - rarity: U (last character)
         """
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = parse_html(html_content, only=PAGE_PARSE_TARGETS)
             
             # Find the main container with all items
             main_container = soup.find('div', {'class': 'indexItemBox cf'})
@@ -7,11 +7,13 @@ import json
 from selenium.webdriver.common.by import By
 import time
 from datetime import datetime
+from urllib.parse import urljoin
 import argparse
 
 # Add parent directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from service.selenium_service import SeleniumService
+from service.document_service import fetch_document
 from service.mongo_service import MongoService
 from cleanup_utils import cleanup_old_backups
 from dotenv import load_dotenv
@@ -23,7 +25,7 @@ class YuyuTeiScraper:
     
     def __init__(self, headless=True):
         """Initialize the scraper"""
-        self.selenium = SeleniumService(headless=headless, window_size="1920,1080", timeout=10)
+        self.selenium = SeleniumService(headless=headless, window_size="1920,1080", timeout=10, profile="scrape")
         self.mongo = MongoService()
         self.base_url = "https://yuyu-tei.jp/top/ua"
         self.all_hrefs = []
@@ -44,7 +46,7 @@ class YuyuTeiScraper:
             # Step 1: Navigate to the website
             print(f"🔄 Navigating to {self.base_url}")
             self.selenium.navigate_to(self.base_url)
-            self.selenium.sleep(2)  # Wait for page to load
+            self.selenium.wait_for_network_idle(timeout=10)
             
             # Step 2: Click the "シングルカード販売" button
             print("🔄 Clicking the 'シングルカード販売' button to expand the menu")
@@ -58,7 +60,12 @@ class YuyuTeiScraper:
                 # Alternative: click by data-bs-target attribute
                 self.selenium.click_element(By.CSS_SELECTOR, "[data-bs-target='#side-sell-single']")
             
-            self.selenium.sleep(2)  # Wait for menu to expand
+            # Wait for the Bootstrap collapse to finish expanding
+            self.selenium.wait_for_js(
+                "const menu = document.querySelector('#side-sell-single');"
+                "return !!menu && menu.classList.contains('show') && !menu.classList.contains('collapsing');",
+                timeout=5
+            )
             
             # Step 3: Extract all href links from the expanded menu
             print("🔄 Extracting all href links from the expanded menu")
@@ -137,24 +144,31 @@ class YuyuTeiScraper:
                 continue
             
             try:
-                print(f"\n  [{idx}/{len(self.all_hrefs)}] 📂 Navigating to: {category_name}")
-                self.selenium.navigate_to(href)
-                self.selenium.sleep(1.5)  # Wait for page to load
+                print(f"\n  [{idx}/{len(self.all_hrefs)}] 📂 Fetching: {category_name}")
+                # Category pages are server-rendered, so this is usually a plain HTTP GET
+                result = fetch_document(urljoin(self.base_url, href), selector='div.cards-list')
+                if not result['success']:
+                    print(f"    ❌ Failed to fetch {category_name}: {result['error']}")
+                    continue
                 
                 # Extract card data from this page
-                self.extract_cardlist_data()
+                self.extract_cardlist_data(result['html'])
                 
             except Exception as e:
                 print(f"    ❌ Error scraping {category_name}: {str(e)}")
                 continue
     
-    def extract_cardlist_data(self):
+    def extract_cardlist_data(self, page_source=None):
         """
         Extract cardlist data mapping rarity with card information
         Extracts: rarity, card ID, card name, price, stock status
+        
+        Args:
+            page_source: HTML of the category page (default: the browser's current page)
         """
         try:
-            page_source = self.selenium.get_page_source()
+            if page_source is None:
+                page_source = self.selenium.get_page_source()
             soup = BeautifulSoup(page_source, 'html.parser')
             
             # Find all cards-list sections
@@ -1,13 +1,13 @@
 import json
 import os
 import sys
-import requests
 from dotenv import load_dotenv
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
 from service.github_service import GitHubService
 from service.mongo_service import MongoService
+from service.api_service import get_http_session
 from lcscrape import scrape_lorcana_set
 
 github_service = GitHubService()
@@ -25,7 +25,7 @@ existing_standard = set(existing_data.get("standard", []))
 existing_special = set(existing_data.get("special", []))
 
 API_URL = "https://cards.disneylorcana.com/en-US/api/cards/en"
-resp = requests.get(API_URL, timeout=60)
+resp = get_http_session().get(API_URL, timeout=60)
 resp.raise_for_status()
 data = resp.json()
 filters = data.get("filters", {})
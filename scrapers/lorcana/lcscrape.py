@@ -1,4 +1,3 @@
-import requests
 import os
 import sys
 from dotenv import load_dotenv
@@ -9,6 +8,7 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
 from service.googlecloudservice import upload_image_to_gcs
 from service.mongo_service import MongoService
 from service.notification_service import NotificationService
+from service.api_service import get_http_session
 
 mongo_service = MongoService()
 notification_service = NotificationService()
@@ -34,7 +34,7 @@ API_URL = "https://cards.disneylorcana.com/en-US/api/cards/en"
 
 def fetch_all_cards():
     print(f"Fetching {API_URL}")
-    resp = requests.get(API_URL, timeout=120)
+    resp = get_http_session().get(API_URL, timeout=120)
     resp.raise_for_status()
     data = resp.json()
     cards = data.get("cards", [])
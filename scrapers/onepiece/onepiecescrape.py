@@ -1,18 +1,46 @@
-from bs4 import BeautifulSoup
-import requests
-import re
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from service.googlecloudservice import upload_image_to_gcs
+from service.googlecloudservice import ImageIngestor
 from service.mongo_service import MongoService
 from service.notification_service import NotificationService
+from service.api_service import get_http_session
+from service.parse_service import parse_lxml
+from service.extract_service import ExtractError, Field, chain, compile_spec, css_to_xpath, first_match, remove, split_list
+from service.fingerprint_service import fingerprint, get_fingerprint_store
+from service.diff_service import ERRATA_CHECK, CardDiff
 
 # Initialize Service Layer
 mongo_service = MongoService()
 notification_service = NotificationService()
+fingerprints = get_fingerprint_store()
+
+BASE_URL = "https://asia-en.onepiece-cardgame.com"
+# Series scraped at the same time by scrape_onepiece_series
+ONEPIECE_SERIES_WORKERS = int(os.getenv('ONEPIECE_SERIES_WORKERS', '4'))
+
+# Fields of one card block (dl.modalCol) on a card list page, in stored order
+CARD_SPEC = {
+    'cardName': 'div.cardName',
+    'cardId': Field('div.infoCol span', index=0, default='none'),
+    'rarity': Field('div.infoCol span', index=1, default='none'),
+    'category': Field('div.infoCol span', index=2, default='none'),
+    'lifecost': Field('div.cost', post=first_match(r'\d+', default='none')),
+    'attribute': Field('div.attribute img', attr='alt', post=split_list('/'), default=['none']),
+    'power': Field('div.power', post=remove('Power')),
+    'counter': Field('div.counter', post=remove('Counter')),
+    'color': Field('div.color', post=remove('Color')),
+    'typing': Field('div.feature', post=chain(remove('Type'), split_list('/'))),
+    'effects': Field('div.text', post=remove('Effect')),
+    'trigger': Field('div.trigger', post=remove('Trigger'), default='none'),
+}
+card_extractor = compile_spec(CARD_SPEC, name='onepiece')
+# Stored cards are compared on every parsed field for errata
+card_diff = CardDiff(os.getenv('C_ONEPIECE'), fields=list(CARD_SPEC), key='cardUid', site='onepiece', mongo=mongo_service)
+_CARD_BLOCKS = css_to_xpath('dl.modalCol')
 
 def map_booster(code):
     if code == '556701':
@@ -85,288 +113,271 @@ def get_category_from_booster(booster_code):
     else:
         return "others"  # Default fallback for special cases (FDS, LIMITED, PROMO, etc.)
 
-def scrape_onepiece_cards(series_value):
-    if not series_value:
-        print("❌ series_value is not provided. Exiting.")
-        return
-    
-    gcs_imgpath_value = os.getenv('GCS_ONEPIECE')
-    url = f"https://asia-en.onepiece-cardgame.com/cardlist/?series={series_value}"
-    source_id = series_value
-    booster_mapped = map_booster(source_id)
-    base_url = "https://asia-en.onepiece-cardgame.com"
+def fetch_cardlist_page(series_value):
+    """
+    Fetch a series' card list page
 
+    Returns:
+        (image URLs, card blocks) in page order
+    """
+    url = f"{BASE_URL}/cardlist/?series={series_value}"
     headers = {
         "User-Agent": "Mozilla/5.0",
         "Accept-Language": "en-US,en;q=0.5",
-        "Referer": base_url + "/"
+        "Referer": BASE_URL + "/"
     }
 
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    response = get_http_session().get(url, headers=headers)
+    tree = parse_lxml(response)
 
     image_urls = []
-    for a_tag in soup.find_all('a'):
-        img_tag = a_tag.find('img')
-        if img_tag:
+    for a_tag in tree.iter('a'):
+        img_tag = a_tag.find('.//img')
+        if img_tag is not None:
             img_src = img_tag.get('data-src') or img_tag.get('src')
             if img_src and '/images/common' not in img_src:
-                full_url = base_url + img_src if img_src.startswith('/') else img_src
+                full_url = BASE_URL + img_src if img_src.startswith('/') else img_src
                 image_urls.append(full_url)
 
-    dl_elements = soup.find_all('dl', class_='modalCol')
+    dl_elements = tree.xpath(_CARD_BLOCKS)
     if len(image_urls) != len(dl_elements):
-        print(f"⚠️  Mismatch in {source_id}: {len(image_urls)} images vs {len(dl_elements)} cards")
+        print(f"⚠️  Mismatch in {series_value}: {len(image_urls)} images vs {len(dl_elements)} cards")
+    return image_urls, dl_elements
 
-    csv_data = [["cardname", "cardid", "rarity", "category", "lifecost", "attribute", "power", "counter", "color", "typing", "effects", "trigger", "urlimage", "cardUid", "booster"]]
-    json_data = []
+def image_filename(url):
+    return url.split('/')[-1].split('?')[0]
 
+def cardlist_fingerprint(image_urls, dl_elements):
+    """Fingerprint of a card list: every card block plus the image filenames"""
+    return fingerprint([*dl_elements, *(image_filename(url) for url in image_urls)])
+
+def parse_cardlist(series_value, image_urls, dl_elements):
+    """
+    Extract the cards of a fetched card list page
+
+    Returns:
+        List of (image filename, card fields) per card block; fields is None
+        for a block that couldn't be parsed
+    """
+    cards = []
     for idx, dl_element in enumerate(dl_elements):
+        filename = image_filename(image_urls[idx]) if idx < len(image_urls) else 'none'
         try:
-            raw_url = image_urls[idx] if idx < len(image_urls) else 'none'
-            filename = raw_url.split('/')[-1].split('?')[0]
-            urlforscraping = f"{base_url}/images/cardlist/card/{filename}"
-            card_uid = filename.replace('.png', '')
-            urlimage = upload_image_to_gcs(urlforscraping, card_uid, gcs_imgpath_value)
+            fields = card_extractor(dl_element)
+        except ExtractError as e:
+            print(f"❌ Error parsing card in {map_booster(series_value)}: {e}")
+            fields = None
+        cards.append((filename, fields))
+    card_extractor.report()
+    return cards
+
+def fetch_cardlist(series_value):
+    """Fetch and parse a series' card list page, see parse_cardlist"""
+    return parse_cardlist(series_value, *fetch_cardlist_page(series_value))
+
+def build_card(fields, filename, booster_mapped, urlimage):
+    """Card document from parsed fields and its uploaded image URL"""
+    return {
+        **fields,
+        "urlimage": urlimage,
+        "cardUid": filename.replace('.png', ''),
+        "booster": booster_mapped
+    }
 
-            cardname = dl_element.find('div', class_='cardName').text.strip()
+def build_cards(parsed, booster_mapped, ingestor):
+    """
+    Card documents for parsed (filename, fields) pairs, uploading their images
+    through the shared ingestor
 
-            try:
-                card3span = dl_element.find('div', class_="infoCol").find_all('span')
-                cardid = card3span[0].text.strip()
-                rarity = card3span[1].text.strip()
-                category = card3span[2].text.strip()
-            except:
-                cardid = rarity = category = "none"
+    Returns:
+        List of card documents (cards whose fields failed to parse are left out)
+    """
+    gcs_imgpath_value = os.getenv('GCS_ONEPIECE')
+    pending = []
+    for filename, fields in parsed:
+        if fields is None:
+            continue
+        card_uid = filename.replace('.png', '')
+        urlforscraping = f"{BASE_URL}/images/cardlist/card/{filename}"
+        pending.append((filename, fields, ingestor.submit(urlforscraping, card_uid, gcs_imgpath_value)))
+
+    cards = []
+    for filename, fields, upload in pending:
+        cards.append(build_card(fields, filename, booster_mapped, upload.result()))
+        print(f"{booster_mapped} ✅ Parsed: {fields['cardName']}")
+    return cards
+
+def register_boosters(boosters):
+    """Add boosters missing from the booster list in one write, with a single notification"""
+    booster_collection_value = os.getenv('C_BOOSTERLIST') or "BoosterList"
+    new_boosters = []
+    for booster_mapped in boosters:
+        if mongo_service.validate_field(collection_name=booster_collection_value, field_name="pathname", field_value=booster_mapped)['exists']:
+            continue
+        new_boosters.append({
+            "pathname": booster_mapped,
+            "alt": booster_mapped,
+            "imageSrc": f"https://images.geekstack.dev/boostercover/opdeckimage_{booster_mapped.lower()}.webp",
+            "tcg": "onepiece",
+            "order": calculate_order(booster_mapped),
+            "imgWidth": "110%",
+            "category": f"{get_category_from_booster(booster_mapped)}_unreleased"
+        })
+    if not new_boosters:
+        return
 
-            cost_text = dl_element.find('div', class_='cost').text
-            cost_match = re.search(r'\d+', cost_text)
-            cost = cost_match.group() if cost_match else "none"
+    names = [booster['pathname'] for booster in new_boosters]
+    if len(names) == 1:
+        message = f"A new set '{names[0]}' has been added to the One Piece collection."
+    else:
+        message = f"New sets {', '.join(names)} have been added to the One Piece collection."
+    notification_service.send_email_notification(
+        subject="New One Piece Booster Detected",
+        message=message,
+    )
+
+    mongo_service.upload_data(
+        data=new_boosters,
+        collection_name=booster_collection_value,
+        backup_before_upload=True
+    )
+
+def upload_onepiece_cards(cards, boosters, backup_before_upload=True):
+    """
+    Insert cards, then register their boosters
+
+    Returns:
+        True if the cards were inserted
+    """
+    collection_value = os.getenv('C_ONEPIECE')
+    if not collection_value:
+        print("⚠️ MongoDB collection name not found in environment variables")
+        return False
+    inserted = mongo_service.upload_data(
+        data=cards,
+        collection_name=collection_value,
+        backup_before_upload=backup_before_upload
+    )
+    if inserted and boosters:
+        try:
+            register_boosters(boosters)
+        except Exception as e:
+            print(f"❌ MongoDB operation failed: {str(e)}")
+    return inserted
+
+def scrape_onepiece_series(series_values, workers=ONEPIECE_SERIES_WORKERS):
+    """
+    Scrape several series concurrently and store them together
+
+    Card lists are fetched and parsed by up to `workers` threads and images go
+    through one shared ImageIngestor. The collection is backed up once, each
+    series is inserted on its own (so one bad series doesn't drop the others),
+    and the boosters of every inserted series are registered in one step.
+
+    Args:
+        series_values: Series codes, e.g. ['556111', '556025']
+        workers: Series processed at the same time
+
+    Returns:
+        Dict of series code -> True if its cards were inserted
+    """
+    series_values = [value for value in series_values if value]
+    if not series_values:
+        print("❌ series_value is not provided. Exiting.")
+        return {}
 
-            try:
-                attribute = dl_element.find('div', class_='attribute').find('img').get('alt', '')
-            except:
-                attribute = "none"
-
-            power = dl_element.find('div', class_='power').text.replace('Power', '').strip()
-            counter = dl_element.find('div', class_='counter').text.replace('Counter', '').strip()
-            color = dl_element.find('div', class_='color').text.replace('Color', '').strip()
-            typing = dl_element.find('div', class_='feature').text.replace('Type', '').strip()
-            effect = dl_element.find('div', class_='text').get_text().replace('Effect', '').strip()
-            try:
-                trigger = dl_element.find('div', class_='trigger').text.replace('Trigger', '').strip()
-            except:
-                trigger = "none"
-
-            csv_data.append([
-                cardname, cardid, rarity, category, cost, attribute, power, counter,
-                color, typing, effect, trigger, urlimage, card_uid, booster_mapped
-            ])
-
-            json_data.append({
-                "cardName": cardname,
-                "cardId": cardid,
-                "rarity": rarity,
-                "category": category,
-                "lifecost": cost,
-                "attribute": [attr.strip() for attr in attribute.split("/")] if attribute else [],
-                "power": power,
-                "counter": counter,
-                "color": color,
-                "typing": [t.strip() for t in typing.split("/")] if typing else [],
-                "effects": effect,
-                "trigger": trigger,
-                "urlimage": urlimage,
-                "cardUid": card_uid,
-                "booster": booster_mapped
-            })
-
-            print(f"{booster_mapped} ✅ Parsed: {cardname}")
+    results = {}
+    with ImageIngestor() as ingestor, \
+            ThreadPoolExecutor(max_workers=max(1, min(workers, len(series_values)))) as executor:
+        def scrape_series(value):
+            return build_cards(fetch_cardlist(value), map_booster(value), ingestor)
 
-        except Exception as e:
-            print(f"❌ Error parsing card in {booster_mapped}: {e}")
+        futures = {value: executor.submit(scrape_series, value) for value in series_values}
+        for value, future in futures.items():
+            try:
+                results[value] = [card_diff.stamp(card) for card in future.result()]
+            except Exception as e:
+                print(f"❌ Failed to scrape {map_booster(value)}: {e}")
 
+    scraped = [value for value in series_values if results.get(value)]
+    print(f"📦 {sum(len(results[value]) for value in scraped)} card(s) from {len(scraped)} series: "
+          f"{', '.join(map_booster(value) for value in scraped) or 'none'}")
 
+    inserted = {value: False for value in series_values}
     collection_value = os.getenv('C_ONEPIECE')
-    booster_collection_value = os.getenv('C_BOOSTERLIST') or "BoosterList"
-    if collection_value:
+    if scraped and collection_value:
+        # One backup for the whole run instead of one per series
+        mongo_service.backup_collection(collection_value)
+    for value in scraped:
+        inserted[value] = upload_onepiece_cards(results[value], [], backup_before_upload=False)
+
+    boosters = [map_booster(value) for value in scraped if inserted[value]]
+    if boosters:
         try:
-            mongo_service.upload_data(
-                data=json_data,
-                collection_name=collection_value,
-                backup_before_upload=True
-            )
-            if not mongo_service.validate_field(collection_name=booster_collection_value, field_name="pathname", field_value=booster_mapped)['exists']:
-                new_booster = {
-                    "pathname": booster_mapped,
-                    "alt": booster_mapped,
-                    "imageSrc": f"https://images.geekstack.dev/boostercover/opdeckimage_{booster_mapped.lower()}.webp",
-                    "tcg": "onepiece",
-                    "order": calculate_order(booster_mapped),
-                    "imgWidth": "110%",
-                    "category": f"{get_category_from_booster(booster_mapped)}_unreleased"
-                }
-
-                notification_service.send_email_notification(
-                    subject="New One Piece Booster Detected",
-                    message=f"A new set '{booster_mapped}' has been added to the One Piece collection.",
-                )
-
-                mongo_service.upload_data(
-                    data=new_booster,
-                    collection_name=booster_collection_value,
-                    backup_before_upload=True
-                )
-
+            register_boosters(boosters)
         except Exception as e:
             print(f"❌ MongoDB operation failed: {str(e)}")
-    else:
-        print("⚠️ MongoDB collection name not found in environment variables")
 
+    failed = [map_booster(value) for value in series_values if not inserted[value]]
+    if failed:
+        print(f"⚠️ Not stored: {', '.join(failed)}")
+    return inserted
+
+def scrape_onepiece_cards(series_value):
+    return scrape_onepiece_series([series_value]).get(series_value, False)
+
+
+def scrape_onepiece_cards_incremental(series_value, skip_unchanged=True, check_errata=ERRATA_CHECK):
+    """
+    Scrape a series and only insert cards not already in MongoDB (by cardUid).
 
-def scrape_onepiece_cards_incremental(series_value):
-    """Scrape a series and only insert cards not already in MongoDB (by cardUid)."""
+    Args:
+        series_value: Series code, e.g. '556801'
+        skip_unchanged: Stop right after the page fetch when the card list's
+                        fingerprint matches the last successful check
+        check_errata: Update fields of stored cards that changed on the site
+    """
     if not series_value:
         print("❌ series_value is not provided. Exiting.")
         return
 
-    gcs_imgpath_value = os.getenv('GCS_ONEPIECE')
-    url = f"https://asia-en.onepiece-cardgame.com/cardlist/?series={series_value}"
-    source_id = series_value
-    booster_mapped = map_booster(source_id)
-    base_url = "https://asia-en.onepiece-cardgame.com"
+    booster_mapped = map_booster(series_value)
 
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Referer": base_url + "/"
-    }
-
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
-
-    image_urls = []
-    for a_tag in soup.find_all('a'):
-        img_tag = a_tag.find('img')
-        if img_tag:
-            img_src = img_tag.get('data-src') or img_tag.get('src')
-            if img_src and '/images/common' not in img_src:
-                full_url = base_url + img_src if img_src.startswith('/') else img_src
-                image_urls.append(full_url)
+    image_urls, dl_elements = fetch_cardlist_page(series_value)
+    fingerprint_key = f"onepiece:{series_value}"
+    page_fingerprint = cardlist_fingerprint(image_urls, dl_elements)
+    if skip_unchanged and not fingerprints.changed(fingerprint_key, page_fingerprint):
+        print(f"⏭️ {booster_mapped}: card list unchanged since the last check, skipping")
+        return
 
-    dl_elements = soup.find_all('dl', class_='modalCol')
-    if len(image_urls) != len(dl_elements):
-        print(f"⚠️  Mismatch in {source_id}: {len(image_urls)} images vs {len(dl_elements)} cards")
+    cards = parse_cardlist(series_value, image_urls, dl_elements)
+    # Cards that failed to parse or upload are retried next run, so don't mark the page as seen
+    complete = all(fields is not None for _, fields in cards)
 
     collection_value = os.getenv('C_ONEPIECE')
-    booster_collection_value = os.getenv('C_BOOSTERLIST') or "BoosterList"
 
     # Get existing cardUids from MongoDB for this booster
     existing_docs = mongo_service.find_all_by_field(collection_value, 'booster', booster_mapped)
     existing_card_uids = {doc['cardUid'] for doc in existing_docs}
     print(f"🔍 {booster_mapped}: {len(existing_card_uids)} cards already in MongoDB")
 
-    new_cards = []
-
-    for idx, dl_element in enumerate(dl_elements):
-        try:
-            raw_url = image_urls[idx] if idx < len(image_urls) else 'none'
-            filename = raw_url.split('/')[-1].split('?')[0]
-            card_uid = filename.replace('.png', '')
-
-            if card_uid in existing_card_uids:
-                continue  # Already exists, skip
-
-            urlforscraping = f"{base_url}/images/cardlist/card/{filename}"
-            urlimage = upload_image_to_gcs(urlforscraping, card_uid, gcs_imgpath_value)
-
-            cardname = dl_element.find('div', class_='cardName').text.strip()
-
-            try:
-                card3span = dl_element.find('div', class_="infoCol").find_all('span')
-                cardid = card3span[0].text.strip()
-                rarity = card3span[1].text.strip()
-                category = card3span[2].text.strip()
-            except:
-                cardid = rarity = category = "none"
-
-            cost_text = dl_element.find('div', class_='cost').text
-            cost_match = re.search(r'\d+', cost_text)
-            cost = cost_match.group() if cost_match else "none"
-
-            try:
-                attribute = dl_element.find('div', class_='attribute').find('img').get('alt', '')
-            except:
-                attribute = "none"
-
-            power = dl_element.find('div', class_='power').text.replace('Power', '').strip()
-            counter = dl_element.find('div', class_='counter').text.replace('Counter', '').strip()
-            color = dl_element.find('div', class_='color').text.replace('Color', '').strip()
-            typing = dl_element.find('div', class_='feature').text.replace('Type', '').strip()
-            effect = dl_element.find('div', class_='text').get_text().replace('Effect', '').strip()
-            try:
-                trigger = dl_element.find('div', class_='trigger').text.replace('Trigger', '').strip()
-            except:
-                trigger = "none"
-
-            new_cards.append({
-                "cardName": cardname,
-                "cardId": cardid,
-                "rarity": rarity,
-                "category": category,
-                "lifecost": cost,
-                "attribute": [attr.strip() for attr in attribute.split("/")] if attribute else [],
-                "power": power,
-                "counter": counter,
-                "color": color,
-                "typing": [t.strip() for t in typing.split("/")] if typing else [],
-                "effects": effect,
-                "trigger": trigger,
-                "urlimage": urlimage,
-                "cardUid": card_uid,
-                "booster": booster_mapped
-            })
-
-            print(f"{booster_mapped} ✅ New card: {cardname}")
-
-        except Exception as e:
-            print(f"❌ Error parsing card in {booster_mapped}: {e}")
+    # Errata on stored cards become $set updates; the rest are new
+    parsed = [(filename, {**fields, 'cardUid': filename.replace('.png', '')})
+              for filename, fields in cards if fields is not None]
+    if check_errata:
+        diff = card_diff.compare([fields for _, fields in parsed], existing_docs, scope={"booster": booster_mapped})
+        complete = card_diff.apply(diff) and complete
+    new_parsed = [(filename, card_diff.stamp(fields)) for filename, fields in parsed
+                  if fields['cardUid'] not in existing_card_uids]
+    with ImageIngestor() as ingestor:
+        new_cards = build_cards(new_parsed, booster_mapped, ingestor)
 
     if not new_cards:
         print(f"{booster_mapped}: No new cards to insert.")
+        if complete:
+            fingerprints.save(fingerprint_key, page_fingerprint, cards=len(cards))
         return
 
     print(f"{booster_mapped}: Inserting {len(new_cards)} new card(s).")
-    if collection_value:
-        try:
-            mongo_service.upload_data(
-                data=new_cards,
-                collection_name=collection_value,
-                backup_before_upload=True
-            )
-            if not mongo_service.validate_field(collection_name=booster_collection_value, field_name="pathname", field_value=booster_mapped)['exists']:
-                new_booster = {
-                    "pathname": booster_mapped,
-                    "alt": booster_mapped,
-                    "imageSrc": f"https://images.geekstack.dev/boostercover/opdeckimage_{booster_mapped.lower()}.webp",
-                    "tcg": "onepiece",
-                    "order": calculate_order(booster_mapped),
-                    "imgWidth": "110%",
-                    "category": f"{get_category_from_booster(booster_mapped)}_unreleased"
-                }
-
-                notification_service.send_email_notification(
-                    subject="New One Piece Booster Detected",
-                    message=f"A new set '{booster_mapped}' has been added to the One Piece collection.",
-                )
-
-                mongo_service.upload_data(
-                    data=new_booster,
-                    collection_name=booster_collection_value,
-                    backup_before_upload=True
-                )
-        except Exception as e:
-            print(f"❌ MongoDB operation failed: {str(e)}")
-    else:
-        print("⚠️ MongoDB collection name not found in environment variables")
-
+    if upload_onepiece_cards(new_cards, [booster_mapped]) and complete:
+        fingerprints.save(fingerprint_key, page_fingerprint, cards=len(cards))
@@ -1,4 +1,3 @@
-import requests
 import json
 import os
 from bs4 import BeautifulSoup
@@ -7,7 +6,8 @@ import sys
 # Add parent directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from service.github_service import GitHubService
-from onepiecescrape import scrape_onepiece_cards, scrape_onepiece_cards_incremental
+from service.api_service import get_http_session
+from onepiecescrape import scrape_onepiece_series, scrape_onepiece_cards_incremental
 
 # Initialize GitHub service
 github_service = GitHubService()
@@ -15,7 +15,7 @@ FILE_PATH = "onepiecedb/series.json"
 
 # Step 1: Scrape the current list of series values from the site
 series_url = "https://asia-en.onepiece-cardgame.com/cardlist/"
-response = requests.get(series_url)
+response = get_http_session().get(series_url)
 soup = BeautifulSoup(response.content, 'html.parser')
 
 select = soup.find('select', {'name': 'series'})
@@ -37,6 +37,7 @@ missing_in_json = list(scraped_set - existing_set)
 extra_in_json = list(existing_set - scraped_set)
 
 # Step 6: Report results
+failed_series = []
 if not missing_in_json and not extra_in_json:
     print("same")
 else:
@@ -45,8 +46,13 @@ else:
         print("Missing in series.json:")
         for val in sorted(missing_in_json):
             print(f"  - {val}")
-            # Call the scrape_onepiece_cards function for each missing value
-            scrape_onepiece_cards(val)
+        # Scrape every missing series concurrently; only stored ones are recorded below
+        inserted = scrape_onepiece_series(sorted(missing_in_json))
+        failed_series = [val for val in missing_in_json if not inserted.get(val)]
+        if failed_series:
+            print("Not added to series.json (retried next run):")
+            for val in sorted(failed_series):
+                print(f"  - {val}")
 
     if extra_in_json:
         print("Extra in series.json:")
@@ -54,17 +60,20 @@ else:
             print(f"  - {val}")
 
     # Step 7: Update series.json with the new scraped values
-    updated_series = list(scraped_set)
+    updated_series = list(scraped_set - set(failed_series))
     updated_content = json.dumps(updated_series, indent=4)
 
     # Step 8: Commit the change to GitHub using GitHubService
-    commit_message = "Update series.json with new One Piece series"
-    success = github_service.update_file(FILE_PATH, updated_content, commit_message, file_sha)
-
-    if success:
-        print("\nseries.json has been updated on GitHub.")
+    if set(updated_series) == existing_set:
+        print("\nseries.json left unchanged (no new series were stored).")
     else:
-        print("Error updating file on GitHub.")
+        commit_message = "Update series.json with new One Piece series"
+        success = github_service.update_file(FILE_PATH, updated_content, commit_message, file_sha)
+
+        if success:
+            print("\nseries.json has been updated on GitHub.")
+        else:
+            print("Error updating file on GitHub.")
 
 # Always check LIMITED and PROMO for new cards, regardless of series list changes
 ALWAYS_CHECK_SERIES = ['556801', '556901']
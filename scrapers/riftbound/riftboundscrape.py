@@ -17,6 +17,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from service.googlecloudservice import upload_image_to_gcs
 from service.mongo_service import MongoService
 from service.github_service import GitHubService
+from service.selenium_service import SeleniumService, extract
+from service.api_service import host_turn
 load_dotenv()
 
 # Initialize Service Layer
@@ -146,10 +148,11 @@ def setup_selenium_driver():
     chrome_options.add_argument("--disable-plugins")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    SeleniumService.apply_profile_options(chrome_options, "scrape")
     
     try:
         driver = webdriver.Chrome(options=chrome_options)
-        return driver
+        return SeleniumService.apply_profile(driver, "scrape")
     except Exception as e:
         print(f"❌ Failed to create Chrome driver: {str(e)}")
         print("⚠️ Make sure chromedriver is installed and in PATH")
@@ -279,14 +282,28 @@ def navigate_to_card(driver, card_code):
         print(f"    ⚠️ Failed to load card modal: {str(e)}")
         return False
 
+# Fields read from the card lightbox in a single round trip (see compile_extract_spec)
+CARD_LIGHTBOX_SPEC = {
+    'title': 'h3',
+    # Card number is the <p> tag right after the title
+    'number': 'xpath:(.//h3)[1]/following::p[1]',
+    'image': {'_scope': 'img[class*="main-card-image"]', 'src': ('', 'src'), 'alt': ('', 'alt')},
+    'stats': {
+        '_each': 'div[class*="sc-3f327fbc-0"]',
+        'header': 'h6',
+        'values': ['p'],
+        'next_value': 'xpath:(.//h6)[1]/following::p[1]',
+        'styled_header': 'h6[class*="sc-fa72520a-0"]',
+        'styled_value': 'p[class*="jlpCll"]',
+    },
+    'ability': {'_scope': 'div[data-testid="rich-text"]', 'html': ('div[class*="sc-4225abdc"]', 'outerHTML')},
+}
+
+
 def extract_card_data(driver, card_code, booster):
     """Extract card data from the lightbox modal"""
     try:
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Find lightbox
-        lightbox = soup.find('div', {'data-testid': 'lightbox'})
+        lightbox = extract(driver, CARD_LIGHTBOX_SPEC, root='div[data-testid="lightbox"]')
         if not lightbox:
             print(f"    ❌ Lightbox not found for card {card_code}")
             return None
@@ -307,15 +324,12 @@ def extract_card_data(driver, card_code, booster):
         for field in expected_fields:
             card_data[field] = None
         
-        # Extract card title and number using HTML structure
-        title_elem = lightbox.find('h3')
-        if title_elem:
-            card_data['title'] = title_elem.text.strip()
+        # Extract card title and number
+        if lightbox['title'] is not None:
+            card_data['title'] = lightbox['title']
             
-            # Card number is the <p> tag right after the title
-            card_number_elem = title_elem.find_next('p')
-            if card_number_elem:
-                card_uid = card_number_elem.text.strip()
+            if lightbox['number'] is not None:
+                card_uid = lightbox['number']
                 card_data['cardUid'] = card_uid
                 
                 # Extract cardId by removing variant letters (e.g., OGN-030a/298 -> OGN-030/298)
@@ -323,9 +337,9 @@ def extract_card_data(driver, card_code, booster):
                 card_data['cardId'] = card_id
         
         # Extract card image
-        img_elem = lightbox.find('img', class_=re.compile('main-card-image'))
+        img_elem = lightbox['image']
         if img_elem:
-            src = img_elem.get('src', '')
+            src = img_elem['src'] or ''
             if src:
                 try:
                     # Remove query parameters from the URL (everything after .png, .jpg, etc.)
@@ -342,101 +356,59 @@ def extract_card_data(driver, card_code, booster):
                     print(f"    ⚠️ Failed to upload image: {str(e)}")
                     card_data['urlimage'] = src  # Fallback to original URL
             
-            alt = img_elem.get('alt', '')
+            alt = img_elem['alt'] or ''
             if alt:
                 card_data['alt'] = alt
         
         # Extract card stats based on HTML structure pattern
-        stats_sections = lightbox.find_all('div', class_=re.compile('sc-3f327fbc-0'))
+        stats_sections = lightbox['stats']
         
         for section in stats_sections:
-            header = section.find('h6')
-            if not header:
+            if section['header'] is None:
                 continue
             
-            stat_name = header.text.strip()
+            stat_name = section['header']
             
             # Handle multi-value stats (like Card Type or Domain)
             if stat_name in ['Card Type', 'Domain', 'Tags']:
-                values = []
-                # Find all <p> tags in this section that come after the header
-                all_p_tags = section.find_all('p')
-                for p_tag in all_p_tags:
-                    text = p_tag.text.strip()
-                    if text:
-                        values.append(text)
+                values = [text for text in section['values'] if text]
                 
                 if values:
                     card_data[stat_name.lower().replace(' ', '_')] = values if len(values) > 1 else values[0]
             else:
-                # For single-value stats, find the first <p> tag after the header
-                p_tag = header.find_next('p')
-                if p_tag:
-                    stat_value = p_tag.text.strip()
-                    if stat_value:
-                        card_data[stat_name.lower().replace(' ', '_')] = stat_value
+                # For single-value stats, use the first <p> tag after the header
+                stat_value = section['next_value']
+                if stat_value:
+                    card_data[stat_name.lower().replace(' ', '_')] = stat_value
         
         # Extract ability text
-        ability_elem = lightbox.find('div', {'data-testid': 'rich-text'})
-        if ability_elem:
-            ability_text_elem = ability_elem.find('div', class_=re.compile('sc-4225abdc'))
-            if ability_text_elem:
-                ability_html = str(ability_text_elem)
-                def replace_glyph(match):
-                    name = match.group(1)
-                    if name.startswith('rune_'):
-                        name = name[5:]
-                    parts = name.replace('_', ' ').split()
-                    return '{' + ' '.join(p.capitalize() for p in parts) + '}'
-                ability_html = re.sub(
-                    r'<img[^>]*src="[^"]*/([a-z0-9_]+)\.svg"[^>]*>',
-                    replace_glyph,
-                    ability_html
-                )
-                ability_html = re.sub(r'\s*<br\s*/?>\s*', '\n', ability_html)
-                p_tags = BeautifulSoup(ability_html, 'html.parser').find_all('p')
-                ability_text = '\n'.join(p.get_text() for p in p_tags)
-                if ability_text:
-                    card_data['ability'] = ability_text
-        
-        # Extract rarity
-        rarity_section = None
-        for section in stats_sections:
-            header = section.find('h6', class_=re.compile('sc-fa72520a-0'))
-            if header and 'Rarity' in header.text:
-                rarity_section = section
-                break
-        
-        if rarity_section:
-            rarity_text = rarity_section.find('p', class_=re.compile('jlpCll'))
-            if rarity_text:
-                card_data['rarity'] = rarity_text.text.strip()
-        
-        # Extract artist
-        artist_section = None
-        for section in stats_sections:
-            header = section.find('h6', class_=re.compile('sc-fa72520a-0'))
-            if header and 'Artist' in header.text:
-                artist_section = section
-                break
-        
-        if artist_section:
-            artist_text = artist_section.find('p', class_=re.compile('jlpCll'))
-            if artist_text:
-                card_data['artist'] = artist_text.text.strip()
-        
-        # Extract card set
-        card_set_section = None
-        for section in stats_sections:
-            header = section.find('h6', class_=re.compile('sc-fa72520a-0'))
-            if header and 'Card Set' in header.text:
-                card_set_section = section
-                break
-        
-        if card_set_section:
-            set_text = card_set_section.find('p', class_=re.compile('jlpCll'))
-            if set_text:
-                card_data['card_set'] = set_text.text.strip()
+        ability_html = (lightbox['ability'] or {}).get('html')
+        if ability_html:
+            def replace_glyph(match):
+                name = match.group(1)
+                if name.startswith('rune_'):
+                    name = name[5:]
+                parts = name.replace('_', ' ').split()
+                return '{' + ' '.join(p.capitalize() for p in parts) + '}'
+            ability_html = re.sub(
+                r'<img[^>]*src="[^"]*/([a-z0-9_]+)\.svg"[^>]*>',
+                replace_glyph,
+                ability_html
+            )
+            ability_html = re.sub(r'\s*<br\s*/?>\s*', '\n', ability_html)
+            p_tags = BeautifulSoup(ability_html, 'html.parser').find_all('p')
+            ability_text = '\n'.join(p.get_text() for p in p_tags)
+            if ability_text:
+                card_data['ability'] = ability_text
+        
+        # Extract rarity, artist and card set from their styled sections
+        for label, key in (('Rarity', 'rarity'), ('Artist', 'artist'), ('Card Set', 'card_set')):
+            for section in stats_sections:
+                header = section['styled_header']
+                if header is not None and label in header:
+                    if section['styled_value'] is not None:
+                        card_data[key] = section['styled_value']
+                    break
         
         print(f"    ✅ Extracted card data: {card_data.get('title', 'Unknown')}")
         return card_data
@@ -493,16 +465,18 @@ def scrape_set(driver, set_code, set_name, existing_cards=None):
         
         print(f"  🎴 Card {i}/{len(cards)}: {card_code}")
         
-        # Navigate to card detail
-        if navigate_to_card(driver, card_code):
+        # Navigate to card detail, paced by the gallery host's adaptive rate
+        with host_turn(BASE_URL) as fail:
+            opened = navigate_to_card(driver, card_code)
+            if not opened:
+                fail()
+        if opened:
             # Extract card data
             card_data = extract_card_data(driver, card_code, set_code)
             if card_data:
                 card_data['booster'] = set_code
                 card_data['boosterfull'] = set_name
                 scraped_cards.append(card_data)
-        
-        time.sleep(0.5)  # Be respectful with requests
     
     print(f"  ✅ Scraped {len(scraped_cards)} new cards, skipped {skipped_cards} existing cards")
     return scraped_cards
@@ -536,13 +510,15 @@ def main():
             set_name = set_info['name']
             
             # Select the set (filters are already open from detect_available_sets)
-            if select_set_radio(driver, set_code):
+            with host_turn(BASE_URL) as fail:
+                selected = select_set_radio(driver, set_code)
+                if not selected:
+                    fail()
+            if selected:
                 # Get cards and count them
                 cards_list = get_card_list_from_gallery(driver)
                 set_info['card_count'] = len(cards_list)
                 print(f"  📊 {set_name} ({set_code}) has {len(cards_list)} cards")
-            
-            time.sleep(0.5)
         
         
         # Load existing database from GitHub (for available_sets metadata)
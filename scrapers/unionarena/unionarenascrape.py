@@ -13,15 +13,18 @@ from service.github_service import GitHubService
 from service.selenium_service import SeleniumService
 from service.mongo_service import MongoService
 from service.api_service import ApiService
+from service.parse_service import parse_html
 from service.openrouter_service import OpenRouterService
 from service.googlecloudservice import upload_image_to_gcs
 from service.translationservice import translate_data
+from service.segment_service import needs_translation
+from service.diff_service import ERRATA_CHECK, CardDiff
 from dotenv import load_dotenv
 load_dotenv()
 
 # Initialize Service Layer
 github_service = GitHubService()
-selenium = SeleniumService(headless=True, window_size="1920,1080", timeout=10)
+selenium = SeleniumService(headless=True, window_size="1920,1080", timeout=10, profile="scrape")
 mongo_service = MongoService()
 openrouter_service = OpenRouterService()
 api_service = ApiService("https://www.unionarena-tcg.com")
@@ -36,6 +39,19 @@ except Exception as e:
     print(f"❌ Error loading ANIME_MAP: {e}")
     ANIME_MAP = {}
 
+# Untranslated fields of stored cards compared for errata (names, effects and traits are stored translated)
+ERRATA_FIELDS = [
+    "apcost", "basicpower", "category", "color", "energycost", "energygen",
+    "rarity", "rarityAct", "trigger", "triggerState",
+]
+card_diff = CardDiff(C_UNIONARENA, fields=ERRATA_FIELDS, key="cardcode", site="unionarena", mongo=mongo_service)
+
+
+def _field_needs_translation(value):
+    """True if a string field, or any entry of a list field, still has Japanese text"""
+    values = value if isinstance(value, list) else [value]
+    return any(isinstance(text, str) and needs_translation(text) for text in values)
+
 # def allocate_alt_suffix(processedCardUid, cardId,alt_allocation_map):
 #     """
 #     Allocate appropriate ALT suffix for UAPR cards to avoid duplicates
@@ -60,12 +76,13 @@ except Exception as e:
 #         print(f"Auto-allocated _ALT{next_alt_num} suffix for cardId {cardId}: {processedCardUid}")
 #     return processedCardUid
 
-def scrape_unionarena_cards(series_value):
+def scrape_unionarena_cards(series_value, check_errata=ERRATA_CHECK):
     """
     Scrape Union Arena cards for a specific series
     
     Args:
         series_value: The series value to scrape cards for
+        check_errata: Also re-read stored cards and update untranslated fields that changed
     """
     print(f"Starting scrape for series: {series_value}")
     
@@ -103,6 +120,13 @@ def scrape_unionarena_cards(series_value):
     # Track ALT allocations within this run to avoid duplicates
     alt_allocation_map = {}  # cardId -> highest_alt_num_allocated
     
+    # Fetch the detail pages of every new card (and stored ones when checking errata) up front, several at a time
+    fetch_card_numbers = [card_no for card_no in card_numbers if check_errata or card_no not in listofcards]
+    detail_pages = dict(zip(fetch_card_numbers, api_service.gather(
+        [f"/jp/cardlist/detail_iframe.php?card_no={card_no}" for card_no in fetch_card_numbers]
+    )))
+    stored_objects = []  # Stored cards as parsed now, compared for errata
+    
     for card_no in card_numbers:
         booster, cardUid = card_no.split('/') if '/' in card_no else (card_no, card_no)
         animeCode = cardUid.split('-')[0] if '-' in cardUid else cardUid
@@ -119,14 +143,15 @@ def scrape_unionarena_cards(series_value):
             processedCardUid = f"{cardId}_ALT" if next_alt_num == 1 else f"{cardId}_ALT{next_alt_num}"
             alt_allocation_map[cardId] = next_alt_num
 
-        if card_no in listofcards:
+        stored = card_no in listofcards
+        if stored and not check_errata:
             print(f"Card code {card_no} already exists in DB, skipping")
             continue
         
         try:
-            response = api_service.get(f"/jp/cardlist/detail_iframe.php?card_no={card_no}")
+            response = detail_pages[card_no]
             if response['status'] == 200:
-                soup = BeautifulSoup(response['data'], "html.parser")
+                soup = parse_html(response)
                 
                 # Extract card name
                 try:
@@ -329,18 +354,23 @@ def scrape_unionarena_cards(series_value):
                     triggerState = "color"
                 mappedCategory = CATEGORY_MAP.get(category, "-")
 
-                # Handle Image upload
-                urlimage = upload_image_to_gcs(card_image_url,processedCardUid,"UD/")
-                doc = mongo_service.find_by_field(C_UNIONARENA, "cardId", cardId) or {}
-                
-                # Use existing DB fields if doc exists, otherwise use scraped values
-                needs_translation = True
-                if doc:
-                    cardname = doc.get("cardName", "-")
-                    effects_jp = doc.get("effect", "-")
-                    traits = doc.get("traits", "-")
+                if stored:
+                    # Only compared for errata: no image upload or translation
+                    urlimage = None
                     needs_translation = False
-                    print(f"Using existing DB data for cardId {cardId}, skipping translation")
+                else:
+                    # Handle Image upload
+                    urlimage = upload_image_to_gcs(card_image_url,processedCardUid,"UD/")
+                    doc = mongo_service.find_by_field(C_UNIONARENA, "cardId", cardId) or {}
+
+                    # Use existing DB fields if doc exists, otherwise use scraped values
+                    needs_translation = True
+                    if doc:
+                        cardname = doc.get("cardName", "-")
+                        effects_jp = doc.get("effect", "-")
+                        traits = doc.get("traits", "-")
+                        needs_translation = False
+                        print(f"Using existing DB data for cardId {cardId}, skipping translation")
                 
                 # Create card object structure
                 card_object = {
@@ -348,7 +378,7 @@ def scrape_unionarena_cards(series_value):
                     "animeCode": animeCode.lower(),
                     "apcost": int(apcost) if apcost != "-" and apcost.isdigit() else 0,
                     "banRatio": 4,
-                    "basicpower": bpcost if bpcost != "-" else "-",
+                    "basicpower": bpcost or "-",  # Stored as "-" when empty, as in the final normalisation
                     "booster": booster,
                     "cardId": cardId,
                     "cardUid": processedCardUid,
@@ -368,6 +398,10 @@ def scrape_unionarena_cards(series_value):
                     "cardcode": card_no,
                 }
                 
+                if stored:
+                    stored_objects.append(card_object)
+                    continue
+
                 # Track separately which cards need translation
                 card_object["_needs_translation"] = needs_translation
                 
@@ -393,6 +427,10 @@ def scrape_unionarena_cards(series_value):
             print(f"Traceback: {traceback.format_exc()}")
             continue
 
+    if stored_objects:
+        existing_docs = mongo_service.find_all_by_field(C_UNIONARENA, "anime", anime)
+        card_diff.apply(card_diff.compare(stored_objects, existing_docs, scope={"anime": anime}))
+
     # Split objects into those needing translation and those already complete
     to_translate = [o for o in card_objects if o.get("_needs_translation", True)]
     skipped = [o for o in card_objects if not o.get("_needs_translation", True)]
@@ -401,14 +439,26 @@ def scrape_unionarena_cards(series_value):
 
     translated_list = []
     if to_translate:
-        translation_result = openrouter_service.translate_fields_unionarena(to_translate, fields_to_translate=["cardName","effect","traits"], source_lang="ja", target_lang="en", keep_original=False, context=series_value)
+        translation_result = openrouter_service.translate_fields_unionarena(to_translate, fields_to_translate=["cardName","effect","traits"], source_lang="ja", target_lang="en", keep_original=False, context=series_value, segment_fields=["effect"], on_batch_failure="keep_original", run_id=f"unionarena:{series_value}")
 
         if translation_result['success']:
             translated_list = translation_result['translated_data']
             print(f"✅ Translation successful: {len(translated_list)} objects translated")
+
+            # Only the cards from failed batches fall back to the translation service
+            failed_indices = translation_result.get('failed_indices', [])
+            if failed_indices:
+                print(f"⚠️ {len(failed_indices)} cards in failed batches, falling back to translation service for those")
+                failed_items = [translated_list[i] for i in failed_indices]
+                # Send each field only for the cards where it is still Japanese,
+                # so effects already handled by the segment path are not re-sent
+                for field in ["cardName","effect","traits"]:
+                    pending = [item for item in failed_items if _field_needs_translation(item.get(field))]
+                    if pending:
+                        translate_data(pending, fields_to_translate=[field], src_lang="ja", dest_lang="en", keep_original=False, segmented=(field == "effect"))
         else:
             print(f"❌ Translation failed: {translation_result.get('error', 'Unknown error')}, falling back to translation service")
-            translated_list = translate_data(to_translate, fields_to_translate=["cardName","effect","traits"], src_lang="ja", dest_lang="en", keep_original=False)
+            translated_list = translate_data(to_translate, fields_to_translate=["cardName","effect","traits"], src_lang="ja", dest_lang="en", keep_original=False, segmented=True)
 
     # Merge translated items with skipped items
     final_json = []
@@ -432,6 +482,7 @@ def scrape_unionarena_cards(series_value):
             item["traits"] = "-"
         if item.get("basicpower") is None or item.get("basicpower") == "":
             item["basicpower"] = "-"
+        card_diff.stamp(item)
     
     json_data = final_json
 
@@ -457,26 +508,33 @@ def navigate_to_selected_cardlist(series_value):
     try:
         # Navigate to page
         selenium.navigate_to("https://www.unionarena-tcg.com/jp/cardlist/")
-        selenium.sleep(3)  # Wait for page to load
+        selenium.wait_for_network_idle(timeout=15)
         
         # Handle cookies if present
         try:
-            selenium.click_element(By.CSS_SELECTOR, 'button[id="onetrust-reject-all-handler"]', timeout=5)
-            selenium.sleep(2)  # Wait for overlay to disappear
+            if selenium.click_element(By.CSS_SELECTOR, 'button[id="onetrust-reject-all-handler"]', timeout=5):
+                # Wait for overlay to disappear
+                selenium.wait_for_js(
+                    "const el = document.querySelector('.onetrust-pc-dark-filter, #onetrust-banner-sdk');"
+                    "return !el || el.offsetParent === null || getComputedStyle(el).display === 'none';",
+                    timeout=5
+                )
         except:
             print("No cookie banner found, continuing...")
         
         # Open series dropdown
         selenium.click_element(By.CLASS_NAME,'selModalButton')
-        selenium.sleep(2)  # Wait for dropdown to open
+        selenium.wait_for_visible(By.CSS_SELECTOR, f'li[data-value="{series_value}"]', timeout=5)
         
         # Select series
         selenium.click_element(By.CSS_SELECTOR, f'li[data-value="{series_value}"]')
-        selenium.sleep(1)  # Wait for selection
+        selenium.wait_for_dom_quiet(quiet=0.3, timeout=3)
         
         # Submit form
         selenium.click_element(By.CLASS_NAME,'submitBtn')
-        selenium.sleep(5)  # Wait for results to load
+        # Wait for results to load
+        selenium.wait_for_network_idle(timeout=15)
+        selenium.wait_for_count_stable(By.CLASS_NAME, 'modalCardDataOpen', stable_for=0.5, timeout=10)
         
 
         print(f"Scraping page {page_number}")
@@ -1,20 +1,19 @@
-import requests
 from bs4 import BeautifulSoup
 import json
 import os
 import sys
-import time
 import re
 import base64
 from datetime import datetime
 from urllib.parse import urljoin
-from wsbscraper import scrape_wsb_card
+from wsbscraper import scrape_wsb_cards, WSB_TRANSLATE_FIELDS
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from service.mongo_service import MongoService
 from service.translationservice import translate_data
 from service.googlecloudservice import upload_image_to_gcs
 from service.github_service import GitHubService
+from service.api_service import get_http_session
 
 #Initialize Service Layer
 github_service = GitHubService()
@@ -107,7 +106,7 @@ def scrape_cards_for_expansion(expansion_code, expansion_title, max_pages=10):
     while page <= max_pages:
         try:
             url = f"{base_url}?expansion={expansion_code}&page={page}"
-            response = requests.get(url, headers=headers)
+            response = get_http_session().get(url, headers=headers)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -135,21 +134,17 @@ def scrape_cards_for_expansion(expansion_code, expansion_title, max_pages=10):
             
             print(f"  📄 Page {page}: Found {len(card_nos)} cards")
             
-            # Scrape each card
-            for card_no in card_nos:
+            # Scrape the page's cards; their pages are fetched concurrently.
+            # Translation is deferred so the whole expansion goes through one concurrent batch
+            print(f"    🎴 Scraping cards: {', '.join(card_nos)}")
+            for card_no, card_data in zip(card_nos, scrape_wsb_cards(card_nos, expansion_code, translate=False)):
                 try:
-                    print(f"    🎴 Scraping card: {card_no}")
-                    # Try scraping without translation first to isolate issues
-                    card_data = scrape_wsb_card(card_no, expansion_code, translate=True)
                     print(f"📋 Card data: {card_data}")
                     if card_data:
                         card_data['booster'] = expansion_code
                         card_data['expansionTitle'] = expansion_title
                         cards_data.append(card_data)
                     
-                    # Small delay to be respectful
-                    time.sleep(0.5)
-                    
                 except Exception as e:
                     print(f"    ❌ Error scraping card {card_no}: {str(e)}")
                     import traceback
@@ -158,12 +153,16 @@ def scrape_cards_for_expansion(expansion_code, expansion_title, max_pages=10):
                     continue
             
             page += 1
-            time.sleep(1)  # Delay between pages
             
         except Exception as e:
             print(f"❌ Error scraping page {page} for expansion {expansion_title}: {str(e)}")
             break
     
+    if cards_data:
+        print(f"🔄 Translating {len(cards_data)} cards for {expansion_title}...")
+        # booster is the expansion code we assigned above, not scraped JP text
+        translate_data(cards_data, [f for f in WSB_TRANSLATE_FIELDS if f != 'booster'], segmented=True)
+    
     print(f"✅ Completed scraping {len(cards_data)} cards for {expansion_title}")
     return cards_data
 
@@ -177,7 +176,7 @@ def check_and_scrape_new_expansions():
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        response = get_http_session().get(url, headers=headers)
         response.raise_for_status()
         soup = BeautifulSoup(response.content, 'html.parser')
         
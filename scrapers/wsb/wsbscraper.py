@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import os
 import sys
@@ -8,6 +7,21 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from service.googlecloudservice import upload_image_to_gcs
 from service.translationservice import translate_data
+from service.api_service import ApiService, get_http_session
+from service.parse_service import parse_html
+
+# Fields translated for every WSB card (shared with checkwsbscraper's bulk translation)
+WSB_TRANSLATE_FIELDS = [
+    'cardName', 'booster', 'series', 'cardType',
+    'color', 'features', 'effect', 'specifications'
+]
+WSB_BASE_URL = "https://ws-blau.com"
+WSB_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Accept-Language": "en-US,en;q=0.9"
+}
+# Card pages fetched at once by scrape_wsb_cards
+WSB_DETAIL_CONCURRENCY = 8
 
 def process_effect_with_icons(detail_div):
     """Process the effect div to convert icon images to bracketed alt text"""
@@ -40,25 +54,45 @@ def process_effect_with_icons(detail_div):
         # Fallback to simple text extraction
         return detail_div.get_text(separator=' ', strip=True)
 
-def scrape_wsb_card(cardno, expansion_code, translate=True):
-    """Scrape WSB card data for a specific card number with optional translation"""
+def wsb_card_url(cardno):
+    return f"{WSB_BASE_URL}/cardlist/?cardno={cardno}"
+
+def scrape_wsb_cards(cardnos, expansion_code, translate=True, concurrency=WSB_DETAIL_CONCURRENCY):
+    """
+    Scrape several WSB cards, fetching their pages concurrently
+
+    Returns:
+        List with the card data (or None) for each card number, in order
+    """
+    pages = ApiService(default_headers=WSB_HEADERS).gather(
+        [wsb_card_url(cardno) for cardno in cardnos], concurrency=concurrency
+    )
+    cards = []
+    for cardno, page in zip(cardnos, pages):
+        if not page['success']:
+            print(f"❌ Error scraping card {cardno}: {page.get('error') or 'HTTP ' + str(page['status'])}")
+            cards.append(None)
+            continue
+        cards.append(scrape_wsb_card(cardno, expansion_code, translate=translate, content=page['content']))
+    return cards
+
+def scrape_wsb_card(cardno, expansion_code, translate=True, content=None):
+    """Scrape WSB card data for a specific card number with optional translation
+    (content: already fetched card page, skips the request)"""
     if not cardno:
         print("❌ cardno is not provided. Exiting.")
         return
     
-    base_url = "https://ws-blau.com"
-    url = f"{base_url}/cardlist/?cardno={cardno}"
+    base_url = WSB_BASE_URL
+    url = wsb_card_url(cardno)
     gcs_imgpath_value = f'WSB/{expansion_code}/'
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-        "Accept-Language": "en-US,en;q=0.9"
-    }
-
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        if content is None:
+            response = get_http_session().get(url, headers=WSB_HEADERS)
+            response.raise_for_status()
+            content = response.content
+        soup = parse_html(content, only='div.cardlist-Detail_Box')
 
         # Find the main card detail box
         detail_box = soup.find('div', class_='cardlist-Detail_Box')
@@ -172,11 +206,7 @@ def scrape_wsb_card(cardno, expansion_code, translate=True):
         # Apply translation if requested
         if translate:
             print(f"🔄 Translating card data...")
-            fields_to_translate = [
-                'cardName', 'booster', 'series', 'cardType', 
-                'color', 'features', 'effect', 'specifications'
-            ]
-            translated_data = translate_data([card_data], fields_to_translate)
+            translated_data = translate_data([card_data], WSB_TRANSLATE_FIELDS)
             card_data = translated_data[0] if translated_data else card_data
             print(f"✅ Translation completed")
         
@@ -1,14 +1,294 @@
 import requests
+import asyncio
 import json
-from typing import Dict, Any, Optional, Union
-from urllib.parse import urljoin
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Iterable, List, Optional, Union
+from urllib.parse import urljoin, urlsplit
+from requests.adapters import HTTPAdapter
+
+from service.http_cache_service import HttpCache, ReplayModeError, get_http_cache, replay_mode
+from service.ratelimit_service import HostRateLimiter
+
+# Defaults for every PooledSession (override per session or per request)
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '3'))
+# Base of the exponential backoff in seconds (full jitter: sleep is random in [0, base * 2^attempt])
+HTTP_BACKOFF = float(os.getenv('HTTP_BACKOFF', '1'))
+HTTP_BACKOFF_MAX = float(os.getenv('HTTP_BACKOFF_MAX', '30'))
+# Connections kept alive per host, and number of hosts with a live pool
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '16'))
+HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', '32'))
+# Requests in flight per host across all threads and sessions
+HTTP_HOST_CONCURRENCY = int(os.getenv('HTTP_HOST_CONCURRENCY', '8'))
+# Adaptive request rate per host (requests/second): where a new host starts, and the ceiling
+# it climbs to while responses stay fast and healthy
+HTTP_HOST_RATE = float(os.getenv('HTTP_HOST_RATE', '5'))
+HTTP_HOST_MAX_RATE = float(os.getenv('HTTP_HOST_MAX_RATE', '25'))
+# Requests in flight for one ApiService.gather call
+HTTP_GATHER_CONCURRENCY = int(os.getenv('HTTP_GATHER_CONCURRENCY', '8'))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+_adapter = None
+_adapter_lock = threading.Lock()
+_host_limits: Dict[str, int] = {}
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_lock = threading.Lock()
+_shared_session = None
+# Shared by every PooledSession, ApiService.gather and host_turn (browser navigation)
+host_rate_limiter = HostRateLimiter(HTTP_HOST_RATE, HTTP_HOST_MAX_RATE, burst=HTTP_HOST_CONCURRENCY)
+_shared_session_lock = threading.Lock()
+
+
+def _shared_adapter() -> HTTPAdapter:
+    """One connection-pool manager for the whole process, so keep-alive and TLS sessions are reused"""
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            _adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE)
+        return _adapter
+
+
+def set_host_concurrency(host: str, limit: int):
+    """
+    Cap concurrent requests to a host (applies to every PooledSession)
+    
+    Args:
+        host: Hostname, e.g. "www.onepiece-cardgame.com"
+        limit: Maximum requests in flight
+    """
+    with _host_lock:
+        _host_limits[host] = max(1, limit)
+        _host_semaphores[host] = threading.BoundedSemaphore(_host_limits[host])
+
+
+def set_host_rate(host: str, rate: float, max_rate: Optional[float] = None):
+    """
+    Start a host at a different adaptive rate (applies to every PooledSession and host_turn)
+    
+    Args:
+        host: Hostname, e.g. "ws-blau.com"
+        rate: Starting requests per second
+        max_rate: Ceiling the rate may climb to (default: HTTP_HOST_MAX_RATE)
+    """
+    host_rate_limiter.set_rate(host, rate, max_rate)
+
+
+@contextmanager
+def host_turn(url: str):
+    """
+    Pace a request that doesn't go through PooledSession (e.g. a browser
+    navigation) with the host's adaptive rate, and report how it went.
+    
+    Yields a callable to mark the turn as failed when the page loaded but was
+    unusable (missing content, navigation that returned False); an exception
+    inside the block counts as a failure too:
+    
+        with host_turn(detail_url) as fail:
+            driver.get(detail_url)
+            if not page_ok(driver):
+                fail()
+    """
+    host = urlsplit(url).hostname or url
+    host_rate_limiter.acquire(host)
+    started = time.monotonic()
+    outcome = {'status': 200}
+    
+    def fail():
+        outcome['status'] = None
+    
+    try:
+        yield fail
+    except Exception:
+        host_rate_limiter.record(host, None, time.monotonic() - started)
+        raise
+    host_rate_limiter.record(host, outcome['status'], time.monotonic() - started)
+
+
+@contextmanager
+def _host_slot(host: str):
+    with _host_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = _host_semaphores[host] = threading.BoundedSemaphore(
+                _host_limits.get(host, HTTP_HOST_CONCURRENCY)
+            )
+    with semaphore:
+        yield
+
+
+def backoff_delay(attempt: int, base: float = HTTP_BACKOFF, cap: float = HTTP_BACKOFF_MAX) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta or HTTP date), or None"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session with process-wide connection pools, a default timeout,
+    retries with jittered backoff on 429/5xx and connection errors, and a cap
+    on concurrent requests per host.
+    
+    Drop-in for requests.get & co:
+        http = get_http_session()
+        response = http.get(url, headers=headers)
+    """
+    
+    def __init__(self, timeout: Optional[float] = HTTP_TIMEOUT, max_retries: int = HTTP_MAX_RETRIES,
+                 backoff: float = HTTP_BACKOFF, cache: Union[HttpCache, None, bool] = True):
+        """
+        Initialize the session
+        
+        Args:
+            timeout: Default timeout in seconds when a request doesn't pass one
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff: Base of the exponential backoff in seconds
+            cache: HttpCache for GET responses; True uses the one configured by
+                   HTTP_CACHE (off by default), None/False disables caching
+        """
+        super().__init__()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = get_http_cache() if cache is True else (cache or None)
+        adapter = _shared_adapter()
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+    
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        method = method.upper()
+        if self.cache is not None and method == 'GET':
+            return self._cached_get(url, **kwargs)
+        if replay_mode() or (self.cache is not None and self.cache.replay):
+            raise ReplayModeError(f"{method} {url} not sent: HTTP cache is in replay mode")
+        return self._request_with_retries(method, url, **kwargs)
+    
+    def _cached_get(self, url, **kwargs):
+        # Prepare without sending to get the final URL and merged headers the key is built from
+        prepared = self.prepare_request(requests.Request(
+            'GET', url, params=kwargs.get('params'), headers=kwargs.get('headers'),
+            cookies=kwargs.get('cookies'), auth=kwargs.get('auth'),
+        ))
+        key = self.cache.key(prepared.url, prepared.headers)
+        if not self.cache.replay and self.cache.bypasses(prepared.url, prepared.headers):
+            # Always from the network, but recorded so replay mode can serve it
+            response = self._request_with_retries('GET', url, **kwargs)
+            if response.status_code == 200 and not kwargs.get('stream'):
+                self.cache.store(key, response)
+            return response
+        entry = self.cache.load(key)
+        if entry is not None and self.cache.is_fresh(entry[0]):
+            return self.cache.response(*entry, prepared, 'HIT')
+        if self.cache.replay:
+            return self.cache.miss(prepared)
+        
+        if entry is not None:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **self.cache.validators(entry[0])}
+        response = self._request_with_retries('GET', url, **kwargs)
+        if entry is not None and response.status_code == 304:
+            meta = self.cache.refresh(key, entry[0], entry[1], response)
+            return self.cache.response(meta, entry[1], prepared, 'REVALIDATED')
+        if response.status_code == 200 and not kwargs.get('stream'):
+            self.cache.store(key, response)
+        return response
+    
+    def _request_with_retries(self, method, url, **kwargs):
+        host = urlsplit(url).hostname or ''
+        # Non-idempotent requests are only retried when the server refused them outright (429)
+        idempotent = method in IDEMPOTENT_METHODS
+        
+        attempt = 0
+        while True:
+            host_rate_limiter.acquire(host)
+            started = time.monotonic()
+            try:
+                with _host_slot(host):
+                    started = time.monotonic()  # Latency excludes waiting for a slot
+                    response = super().request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                host_rate_limiter.record(host, None, time.monotonic() - started)
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff)
+                print(f"⚠️ {method} {url} failed ({type(e).__name__}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            else:
+                status = response.status_code
+                retry_after = retry_after_seconds(response) if status in RETRY_STATUSES else None
+                if retry_after is not None:
+                    retry_after = min(retry_after, HTTP_BACKOFF_MAX)
+                host_rate_limiter.record(host, status, time.monotonic() - started, retry_after)
+                if status not in RETRY_STATUSES or attempt >= self.max_retries or not (idempotent or status == 429):
+                    return response
+                response.close()
+                if retry_after is not None and status in (429, 503):
+                    # The limiter has paused the host for Retry-After; the next acquire waits it out
+                    delay = 0
+                    print(f"⚠️ {method} {url} returned {status}, retry {attempt + 1}/{self.max_retries} after {retry_after:.1f}s")
+                else:
+                    delay = retry_after if retry_after is not None else backoff_delay(attempt, self.backoff)
+                    print(f"⚠️ {method} {url} returned {status}, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+    
+    def close(self):
+        # Adapters are shared with every other session; leave their pools open
+        pass
+
+
+def create_http_session(**kwargs) -> PooledSession:
+    """New PooledSession (own cookies/headers, shared connection pools); kwargs as PooledSession"""
+    return PooledSession(**kwargs)
+
+
+def get_http_session() -> PooledSession:
+    """Process-wide PooledSession for scrapers that don't need their own cookies or headers"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = PooledSession()
+        return _shared_session
+
+
+def _run_coroutine(coro):
+    """Run a coroutine to completion from sync code, even when this thread already runs an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 
 class ApiService:
     """
     API service class that provides axios-like functionality using requests
     """
     
-    def __init__(self, base_url: str = "", default_headers: Optional[Dict[str, str]] = None, timeout: int = 30):
+    def __init__(self, base_url: str = "", default_headers: Optional[Dict[str, str]] = None, timeout: int = 30,
+                 session: Optional[requests.Session] = None):
         """
         Initialize the API service
         
@@ -16,10 +296,12 @@ class ApiService:
             base_url: Base URL for all requests
             default_headers: Default headers to include in all requests
             timeout: Default timeout for requests in seconds
+            session: Session to send requests with (default: a new PooledSession,
+                     which shares connection pools, retries and host limits)
         """
         self.base_url = base_url
         self.timeout = timeout
-        self.session = requests.Session()
+        self.session = session or create_http_session(timeout=timeout)
         
         # Set default headers
         self.default_headers = {
@@ -202,6 +484,134 @@ class ApiService:
                 'success': False, 'url': url, 'error': str(e)
             }
     
+    def gather(self, endpoints: Iterable[str], concurrency: int = HTTP_GATHER_CONCURRENCY,
+               headers: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        GET many endpoints concurrently (fan-out of detail pages)
+        
+        Requests run on an asyncio httpx client when httpx is installed, otherwise
+        on worker threads through this service's session. Either way they are
+        retried like PooledSession requests and capped per host.
+        
+        Args:
+            endpoints: API endpoints or full URLs
+            concurrency: Maximum requests in flight
+            headers: Additional headers for every request
+        
+        Returns:
+            Response dicts as from get(), plus the raw body under 'content',
+            in the same order as endpoints (failures are dicts with success False)
+        """
+        urls = [self._build_url(endpoint) for endpoint in endpoints]
+        if not urls:
+            return []
+        concurrency = max(1, min(concurrency, len(urls)))
+        # A GET has no body, so the JSON Content-Type default doesn't apply
+        request_headers = {
+            key: value for key, value in {**self.default_headers, **(headers or {})}.items()
+            if value is not None and key.lower() != 'content-type'
+        }
+        
+        try:
+            import httpx  # noqa: F401
+            use_async = True
+        except ImportError:
+            use_async = False
+        # Cached sessions serve hits from disk, so their requests go through the session
+        use_async = use_async and getattr(self.session, 'cache', None) is None and not replay_mode()
+        
+        started = time.time()
+        if use_async:
+            results = _run_coroutine(self._gather_async(urls, concurrency, request_headers))
+        else:
+            results = self._gather_threads(urls, concurrency, request_headers)
+        failed = sum(1 for result in results if not result['success'])
+        print(f"⚡ Fetched {len(urls)} URLs in {time.time() - started:.1f}s "
+              f"({concurrency} concurrent{f', {failed} failed' if failed else ''})")
+        return results
+    
+    def _gathered_response(self, response) -> Dict[str, Any]:
+        result = self._handle_response(response)
+        result['url'] = str(response.url)
+        result['content'] = response.content
+        return result
+    
+    @staticmethod
+    def _gather_error(url: str, e: Exception) -> Dict[str, Any]:
+        return {
+            'status': 0, 'data': str(e), 'headers': {}, 'content': b'',
+            'success': False, 'url': url, 'error': str(e)
+        }
+    
+    async def _gather_async(self, urls: List[str], concurrency: int, headers: Dict[str, str]) -> List[Dict[str, Any]]:
+        import httpx
+        
+        max_retries = getattr(self.session, 'max_retries', HTTP_MAX_RETRIES)
+        if not isinstance(max_retries, int):
+            max_retries = HTTP_MAX_RETRIES  # a plain requests.Session has an adapter-level Retry here
+        backoff = getattr(self.session, 'backoff', HTTP_BACKOFF)
+        slots = asyncio.Semaphore(concurrency)
+        host_slots: Dict[str, asyncio.Semaphore] = {}
+        
+        def host_slot(host: str) -> asyncio.Semaphore:
+            if host not in host_slots:
+                host_slots[host] = asyncio.Semaphore(_host_limits.get(host, HTTP_HOST_CONCURRENCY))
+            return host_slots[host]
+        
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(headers=headers, timeout=self.timeout, limits=limits,
+                                     follow_redirects=True, auth=self.session.auth) as client:
+            async def fetch(url: str) -> Dict[str, Any]:
+                try:
+                    host = urlsplit(url).hostname or ''
+                except ValueError as e:
+                    return self._gather_error(url, e)
+                attempt = 0
+                while True:
+                    await asyncio.to_thread(host_rate_limiter.acquire, host)
+                    started = time.monotonic()
+                    try:
+                        async with slots, host_slot(host):
+                            started = time.monotonic()  # Latency excludes waiting for a slot
+                            response = await client.get(url)
+                    except httpx.TransportError as e:
+                        host_rate_limiter.record(host, None, time.monotonic() - started)
+                        if attempt >= max_retries:
+                            return self._gather_error(url, e)
+                        delay = backoff_delay(attempt, backoff)
+                        print(f"⚠️ GET {url} failed ({type(e).__name__}), retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+                    except (httpx.HTTPError, httpx.InvalidURL) as e:
+                        # Redirect loops, undecodable bodies, bad URLs: not worth retrying
+                        return self._gather_error(url, e)
+                    else:
+                        retry_after = retry_after_seconds(response) if response.status_code in RETRY_STATUSES else None
+                        if retry_after is not None:
+                            retry_after = min(retry_after, HTTP_BACKOFF_MAX)
+                        host_rate_limiter.record(host, response.status_code, time.monotonic() - started, retry_after)
+                        if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                            return self._gathered_response(response)
+                        # With Retry-After on 429/503 the limiter has paused the host; acquire waits it out
+                        throttled = retry_after is not None and response.status_code in (429, 503)
+                        delay = 0 if throttled else (retry_after if retry_after is not None else backoff_delay(attempt, backoff))
+                        print(f"⚠️ GET {url} returned {response.status_code}, retry {attempt + 1}/{max_retries} in {retry_after if throttled else delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    attempt += 1
+            
+            return await asyncio.gather(*(fetch(url) for url in urls))
+    
+    def _gather_threads(self, urls: List[str], concurrency: int, headers: Dict[str, str]) -> List[Dict[str, Any]]:
+        # Session-level headers would put the JSON Content-Type back; None removes it
+        headers = {**headers, 'Content-Type': None}
+        
+        def fetch(url: str) -> Dict[str, Any]:
+            try:
+                return self._gathered_response(self.session.get(url, headers=headers, timeout=self.timeout))
+            except (requests.RequestException, ValueError) as e:  # ValueError: unparseable URL
+                return self._gather_error(url, e)
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(fetch, urls))
+    
     def set_auth(self, auth: Union[tuple, requests.auth.AuthBase]):
         """Set authentication for all requests"""
         self.session.auth = auth
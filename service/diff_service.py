@@ -0,0 +1,184 @@
+"""
+Field-level errata detection for cards that are already stored.
+
+Scrapers used to skip every card whose key (cardUid, cardcode) was in MongoDB,
+so changes to effects or power never reached the database. CardDiff compares
+freshly parsed cards with their stored documents on a configured field set
+and writes only what changed:
+
+    card_diff = CardDiff(C_ONEPIECE, fields=['power', 'effects'], key='cardUid', site='onepiece')
+    result = card_diff.compare(parsed_cards, existing_docs)
+    card_diff.apply(result)
+    insert(result['new'])
+
+Each stored card keeps a hash of its compared fields (contentHash), so an
+unchanged card is recognised without comparing field by field. The hash is
+only compared or recorded for a card that has every compared field; a
+partly parsed card is compared field by field on what it does have. Changes are
+written as minimal $set bulk updates and logged, old and new value per
+field, to C_CARD_CHANGES.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+# Compare already stored cards for errata in scrapers that support it. Off by default:
+# it re-fetches every stored card, so scheduled runs only insert new cards (set to 1 to enable)
+ERRATA_CHECK = os.getenv('ERRATA_CHECK', '0') not in ('0', 'false', 'no', '')
+# MongoDB collection receiving one entry per changed card
+CARD_CHANGES_COLLECTION = os.getenv('C_CARD_CHANGES', 'CL_card_changes')
+CONTENT_HASH_FIELD = 'contentHash'
+
+
+def content_hash(card: Dict[str, Any], fields: Iterable[str]) -> str:
+    """sha256 of the card's values for fields (fields the card doesn't have are left out)"""
+    values = {field: card[field] for field in fields if field in card}
+    encoded = json.dumps(values, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class CardDiff:
+    """Compares parsed cards with stored documents and applies the differences"""
+
+    def __init__(self, collection_name: Optional[str], fields: Iterable[str], key: str = 'cardUid',
+                 site: Optional[str] = None, hash_field: str = CONTENT_HASH_FIELD,
+                 changes_collection: Optional[str] = CARD_CHANGES_COLLECTION, mongo=None):
+        """
+        Initialize the diff stage
+
+        Args:
+            collection_name: Collection the cards are stored in
+            fields: Fields compared for errata (others, e.g. urlimage, are never touched)
+            key: Field identifying a card in both the parsed cards and the documents
+            site: Label for the change log and output, e.g. "onepiece"
+            hash_field: Document field holding the content hash
+            changes_collection: Collection for the change log (None disables it)
+            mongo: MongoService to write with (default: a new one)
+        """
+        self.collection_name = collection_name
+        self.fields = list(fields)
+        self.key = key
+        self.site = site or collection_name
+        self.hash_field = hash_field
+        self.changes_collection = changes_collection
+        self._mongo = mongo
+
+    @property
+    def mongo(self):
+        if self._mongo is None:
+            from service.mongo_service import MongoService
+            self._mongo = MongoService()
+        return self._mongo
+
+    def stamp(self, card: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the content hash to a card about to be inserted, if every compared field parsed"""
+        if all(field in card for field in self.fields):
+            card[self.hash_field] = content_hash(card, self.fields)
+        return card
+
+    def compare(self, cards: Iterable[Dict[str, Any]], existing_docs: Iterable[Dict[str, Any]],
+                scope: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Classify parsed cards against the stored documents
+
+        Only fields present in a parsed card are compared, so a field that
+        failed to parse never erases the stored value. A card missing any
+        compared field is neither matched nor stamped by hash, so a partial
+        parse can't record a hash that the next full parse reports as errata.
+
+        Args:
+            cards: Freshly parsed cards, each with the key field
+            existing_docs: Stored documents for the same scope (booster, package, anime)
+            scope: Fields the updates must also match, e.g. {'package': 'GD01'}, for
+                   keys that are only unique within that scope
+
+        Returns:
+            Dict with new (cards not stored yet, stamped with their hash),
+            updates (batch_update_by_field operations), changes (change log
+            entries) and unchanged / rehashed counts
+        """
+        stored = {doc.get(self.key): doc for doc in existing_docs if doc.get(self.key) is not None}
+        result = {'new': [], 'updates': [], 'changes': [], 'unchanged': 0, 'rehashed': 0}
+        detected_at = datetime.now()
+
+        for card in cards:
+            doc = stored.get(card.get(self.key))
+            if doc is None:
+                result['new'].append(self.stamp(card))
+                continue
+
+            complete = all(field in card for field in self.fields)
+            new_hash = content_hash(card, self.fields) if complete else None
+            if complete and doc.get(self.hash_field) == new_hash:
+                result['unchanged'] += 1
+                continue
+
+            changed = {field: card[field] for field in self.fields
+                       if field in card and doc.get(field) != card[field]}
+            if not changed and not complete:
+                result['unchanged'] += 1
+                continue
+            update_data = dict(changed)
+            if complete:
+                update_data[self.hash_field] = new_hash
+            update = {
+                'field_name': self.key,
+                'field_value': card[self.key],
+                'update_data': update_data,
+            }
+            if scope:
+                update['filter'] = dict(scope)
+            result['updates'].append(update)
+            if not changed:
+                # Stored before hashes existed: only record the hash
+                result['rehashed'] += 1
+                continue
+            result['changes'].append({
+                'site': self.site,
+                'collection': self.collection_name,
+                **(scope or {}),
+                self.key: card[self.key],
+                'changes': {field: {'old': doc.get(field), 'new': value} for field, value in changed.items()},
+                'detected_at': detected_at,
+            })
+        return result
+
+    def apply(self, result: Dict[str, Any]) -> bool:
+        """
+        Write the $set updates in bulk and log the changes
+
+        Returns:
+            True if every update was written (or there was nothing to write)
+        """
+        changes = result['changes']
+        print(f"🩹 {self.site}: {len(changes)} card(s) with errata, {result['unchanged']} unchanged, "
+              f"{result['rehashed']} hash(es) recorded, {len(result['new'])} new")
+        for change in changes:
+            fields = ', '.join(change['changes'])
+            print(f"   {change[self.key]}: {fields}")
+
+        if not result['updates']:
+            return True
+        if not self.collection_name:
+            print("⚠️ MongoDB collection name not found in environment variables")
+            return False
+
+        written = self.mongo.batch_update_by_field(self.collection_name, result['updates'])['success']
+        if written and changes and self.changes_collection:
+            self.mongo.upload_data(data=changes, collection_name=self.changes_collection)
+        return written
+
+    def run(self, cards: Iterable[Dict[str, Any]], existing_docs: Iterable[Dict[str, Any]],
+            scope: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        compare() and apply() in one step
+
+        Returns:
+            Parsed cards that aren't stored yet
+        """
+        result = self.compare(cards, existing_docs, scope)
+        self.apply(result)
+        return result['new']
@@ -0,0 +1,287 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+from service.api_service import ApiService, host_turn
+from service.parse_service import parse_html
+
+# Where per-URL-pattern transport decisions are remembered between runs (empty disables)
+DOCUMENT_TRANSPORT_FILE = os.getenv('DOCUMENT_TRANSPORT_FILE', os.path.join('.cache', 'transport.json'))
+# Patterns that needed a browser are probed over HTTP again after this many days
+DOCUMENT_TRANSPORT_RECHECK_DAYS = float(os.getenv('DOCUMENT_TRANSPORT_RECHECK_DAYS', '7'))
+# Browsers started on demand for pages that need JavaScript
+DOCUMENT_BROWSER_POOL_SIZE = int(os.getenv('DOCUMENT_BROWSER_POOL_SIZE', '1'))
+
+HTML_HEADERS = {
+    'User-Agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'ja,en;q=0.8',
+    'Content-Type': None,  # ApiService defaults to JSON; a page GET has no body
+}
+
+
+def url_pattern(url: str) -> str:
+    """
+    Group URLs that share a page template, e.g.
+    https://duelmasters.fandom.com/wiki/Bolshack_Dragon -> duelmasters.fandom.com/wiki/*
+
+    Path segments containing digits and the last segment of a nested path
+    become '*'; the query string is ignored.
+    """
+    parts = urlsplit(url)
+    segments = [s for s in parts.path.split('/') if s]
+    pattern = [
+        '*' if any(c.isdigit() for c in seg) or (i == len(segments) - 1 and len(segments) > 1) else seg
+        for i, seg in enumerate(segments)
+    ]
+    path = '/' + '/'.join(pattern)
+    if segments and parts.path.endswith('/') and pattern[-1] != '*':
+        path += '/'
+    return parts.netloc.lower() + path
+
+
+class DocumentFetcher:
+    """
+    Fetches HTML documents over plain HTTP when that is enough, and through a
+    pooled headless browser only when the page needs JavaScript.
+
+    In auto mode the first URL of each pattern is fetched over HTTP and
+    checked for the expected selector; if it is missing but a browser finds it,
+    the pattern is marked as needing a browser. Once a pattern is known to work
+    over HTTP, a page without the selector is returned as is (matched False).
+    Decisions are remembered in memory and in DOCUMENT_TRANSPORT_FILE.
+
+    Example:
+        fetcher = DocumentFetcher()
+        result = fetcher.fetch(url, selector='table.wikitable')
+        if result['success']:
+            soup = BeautifulSoup(result['html'], 'html.parser')
+    """
+
+    def __init__(self, pool=None, driver_factory=None, api: Optional[ApiService] = None, timeout: int = 30,
+                 store_path: Optional[str] = DOCUMENT_TRANSPORT_FILE):
+        """
+        Initialize the fetcher
+
+        Args:
+            pool: WebDriverPool to borrow browsers from (default: one started lazily)
+            driver_factory: Callable creating drivers for the lazily started pool
+                            (default: SeleniumService.create_driver with the scrape profile)
+            api: ApiService used for HTTP requests (default: one with browser-like headers)
+            timeout: Seconds to wait for a response or for the selector to appear
+            store_path: JSON file with remembered decisions (None/empty keeps them in memory only)
+        """
+        self.api = api or ApiService(default_headers=HTML_HEADERS, timeout=timeout)
+        self.timeout = timeout
+        self.store_path = store_path
+        self._pool = pool
+        self._owns_pool = pool is None
+        self._driver_factory = driver_factory
+        self._lock = threading.Lock()
+        self._decisions: Dict[str, Dict[str, str]] = self._load_decisions()
+        self.stats = {'http': 0, 'browser': 0, 'fallbacks': 0}
+
+    def _load_decisions(self) -> Dict[str, Dict[str, str]]:
+        if not self.store_path:
+            return {}
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable transport decisions {self.store_path}: {e}")
+            return {}
+
+    def _save_decisions(self):
+        # Caller holds the lock
+        if not self.store_path:
+            return
+        try:
+            directory = os.path.dirname(self.store_path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._decisions, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.store_path)
+        except OSError as e:
+            print(f"⚠️ Could not save transport decisions to {self.store_path}: {e}")
+
+    def transport_for(self, pattern: str) -> Optional[str]:
+        """Remembered transport ('http' or 'browser') for a URL pattern, or None if unknown or due a recheck"""
+        with self._lock:
+            decision = self._decisions.get(pattern)
+        if not decision:
+            return None
+        if decision['transport'] == 'browser':
+            try:
+                checked_at = datetime.fromisoformat(decision['checked_at'])
+            except (KeyError, ValueError):
+                return None
+            if datetime.now() - checked_at > timedelta(days=DOCUMENT_TRANSPORT_RECHECK_DAYS):
+                return None
+        return decision['transport']
+
+    def remember(self, pattern: str, transport: str):
+        with self._lock:
+            previous = self._decisions.get(pattern, {}).get('transport')
+            self._decisions[pattern] = {'transport': transport, 'checked_at': datetime.now().isoformat()}
+            self._save_decisions()
+        if previous != transport:
+            print(f"🧭 {pattern} -> {transport}")
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def _has_selector(html: str, selector: Optional[str]) -> bool:
+        if not selector:
+            return True
+        if not html:
+            return False
+        return parse_html(html).select_one(selector) is not None
+
+    def _fetch_http(self, url: str) -> Dict[str, Any]:
+        try:
+            response = self.api.session.get(url, headers=self.api.default_headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            return {'success': False, 'status': 0, 'html': None, 'url': url, 'error': str(e)}
+        # Without a charset header requests assumes ISO-8859-1, which garbles Japanese pages
+        if 'charset' not in response.headers.get('content-type', '').lower():
+            response.encoding = response.apparent_encoding
+        ok = 200 <= response.status_code < 300
+        return {
+            'success': ok,
+            'status': response.status_code,
+            'html': response.text if ok else None,
+            'url': response.url,
+            'error': None if ok else f"HTTP {response.status_code}",
+        }
+
+    def _browser_pool(self):
+        with self._lock:
+            if self._pool is None:
+                from service.selenium_service import WebDriverPool
+                self._pool = WebDriverPool(size=DOCUMENT_BROWSER_POOL_SIZE, factory=self._driver_factory, profile="scrape")
+            return self._pool
+
+    def _fetch_browser(self, url: str, selector: Optional[str]) -> Dict[str, Any]:
+        from selenium.webdriver.common.by import By
+        from service.selenium_service import wait_for_count_stable, wait_for_network_idle
+
+        try:
+            with self._browser_pool().acquire() as driver:
+                with host_turn(url):
+                    driver.get(url)
+                if selector:
+                    # Until the list stops growing, so a JS-filled list isn't captured half-rendered
+                    # (a missing selector is reported through the check in fetch)
+                    wait_for_count_stable(driver, By.CSS_SELECTOR, selector, timeout=self.timeout)
+                else:
+                    wait_for_network_idle(driver, timeout=self.timeout)
+                return {'success': True, 'status': 200, 'html': driver.page_source,
+                        'url': driver.current_url, 'error': None}
+        except Exception as e:
+            return {'success': False, 'status': 0, 'html': None, 'url': url, 'error': str(e)}
+
+    def fetch(self, url: str, selector: Optional[str] = None, require_js: Optional[bool] = None,
+              pattern: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch a document with the cheapest transport that works
+
+        Args:
+            url: Page URL
+            selector: CSS selector the page must contain to count as fully rendered
+            require_js: True to always use a browser, False to never use one,
+                        None to decide per URL pattern
+            pattern: Override the URL pattern decisions are remembered under
+
+        Returns:
+            Dict with success, html, url, transport ('http'/'browser'), matched
+            (selector found) and error
+        """
+        pattern = pattern or url_pattern(url)
+        remembered = None if require_js is not None else self.transport_for(pattern)
+
+        result = None
+        if require_js is not True and remembered != 'browser':
+            result = self._fetch_http(url)
+            result['transport'] = 'http'
+            result['matched'] = result['success'] and self._has_selector(result['html'], selector)
+            # A pattern known to work over HTTP without the selector is just an empty page
+            # (e.g. past the last list page), not a reason to start a browser
+            if result['matched'] or require_js is False or remembered == 'http':
+                if result['matched'] and remembered is None and require_js is None:
+                    self.remember(pattern, 'http')
+                self._count('http')
+                return result
+            self._count('fallbacks')
+
+        http_result = result
+        result = self._fetch_browser(url, selector)
+        result['transport'] = 'browser'
+        result['matched'] = result['success'] and self._has_selector(result['html'], selector)
+        self._count('browser')
+        # Only a page the browser could render but plain HTTP could not proves JS is needed;
+        # when neither finds the selector (e.g. an empty result page) keep the old decision
+        if require_js is None and http_result is not None and result['matched']:
+            self.remember(pattern, 'browser')
+        if not result['success'] and http_result is not None and http_result['success']:
+            # Browser unavailable: the HTTP response is better than nothing
+            return http_result
+        return result
+
+    def close(self):
+        """Shut down the browser pool if this fetcher started it"""
+        with self._lock:
+            pool = self._pool if self._owns_pool else None
+            if pool is not None:
+                self._pool = None
+        if pool is not None:
+            pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_document_fetcher() -> DocumentFetcher:
+    """Process-wide DocumentFetcher shared by scrapers that don't manage their own"""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = DocumentFetcher()
+            atexit.register(_default_fetcher.close)
+        return _default_fetcher
+
+
+def fetch_document(url: str, selector: Optional[str] = None, require_js: Optional[bool] = None,
+                   pattern: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Fetch a page over HTTP, falling back to a pooled browser when it needs JavaScript
+
+    Args:
+        url: Page URL
+        selector: CSS selector the page must contain
+        require_js: True/False to force a transport, None to auto-detect per URL pattern
+        pattern: Override the URL pattern decisions are remembered under
+
+    Returns:
+        Result dict, see DocumentFetcher.fetch
+    """
+    return get_document_fetcher().fetch(url, selector=selector, require_js=require_js, pattern=pattern)
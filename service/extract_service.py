@@ -0,0 +1,252 @@
+"""
+Declarative field extraction from lxml trees.
+
+A site describes its card fields once as a spec (selector, attribute,
+post-processing, default); compile_spec turns it into an Extractor that runs
+precompiled XPath against each card element and keeps per-field timing and
+failure counts, so a scraper's parsing cost and breakage are visible:
+
+    CARD_SPEC = {
+        'cardName': 'div.cardName',
+        'power': Field('div.power', post=remove('Power')),
+        'attribute': Field('div.attribute img', attr='alt', post=split_list('/'), default=['none']),
+    }
+    card_extractor = compile_spec(CARD_SPEC, name='onepiece')
+    card = card_extractor(dl_element)
+    card_extractor.report()
+
+Selectors are a CSS subset (tag, .class, #id, descendant and '>' child
+combinators), or XPath with an "xpath:" prefix, both relative to the element.
+"""
+
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from lxml import etree
+
+_REQUIRED = object()
+
+
+class ExtractError(Exception):
+    """A required field was missing or its post-processing failed"""
+
+
+class Field:
+    """One extracted field"""
+
+    def __init__(self, selector: str = '', attr: str = 'text', index: Optional[int] = 0,
+                 post: Optional[Callable[[Any], Any]] = None, default: Any = _REQUIRED):
+        """
+        Args:
+            selector: CSS subset or "xpath:..." relative to the element ("" is the element itself)
+            attr: "text" (stripped text content), "html" (inner markup) or an attribute name
+            index: Which match to use; None returns a list of every match
+            post: Function applied to the value (or list), e.g. remove('Power')
+            default: Value when the selector doesn't match or post fails
+                     (no default: the field is required and the element fails)
+        """
+        self.selector = selector
+        self.attr = attr
+        self.index = index
+        self.post = post
+        self.default = default
+
+    @property
+    def required(self) -> bool:
+        return self.default is _REQUIRED
+
+
+_CSS_STEP = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:[.#][\w-]+)*)$')
+
+
+def css_to_xpath(selector: str) -> str:
+    """
+    Translate a CSS subset to XPath relative to the context element
+
+    Supports tag, *, .class, #id, descendant (space) and child (>) combinators.
+    """
+    xpath = '.'
+    axis = '//'
+    for token in selector.replace('>', ' > ').split():
+        if token == '>':
+            axis = '/'
+            continue
+        match = _CSS_STEP.match(token)
+        if not match:
+            raise ValueError(f"Unsupported selector '{selector}' (use an 'xpath:' selector)")
+        step = match.group('tag') or '*'
+        for kind, value in re.findall(r'([.#])([\w-]+)', match.group('rest')):
+            if kind == '.':
+                step += f"[contains(concat(' ', normalize-space(@class), ' '), ' {value} ')]"
+            else:
+                step += f"[@id='{value}']"
+        xpath += axis + step
+        axis = '//'
+    return xpath
+
+
+def _text(element) -> str:
+    return ''.join(element.itertext()).strip()
+
+
+def _inner_html(element) -> str:
+    parts = [element.text or '']
+    parts += [etree.tostring(child, encoding='unicode', method='html') for child in element]
+    return ''.join(parts)
+
+
+class Extractor:
+    """Compiled spec; call it with an lxml element to get a dict of fields"""
+
+    def __init__(self, fields: Dict[str, Field], name: str = 'extract'):
+        self.name = name
+        self.fields = fields
+        self._compiled = []
+        for key, field in fields.items():
+            if field.selector.startswith('xpath:'):
+                path = field.selector[len('xpath:'):]
+            else:
+                path = css_to_xpath(field.selector) if field.selector else '.'
+            if field.attr == 'text':
+                read = _text
+            elif field.attr == 'html':
+                read = _inner_html
+            else:
+                read = (lambda attr: lambda element: element.get(attr, ''))(field.attr)
+            self._compiled.append((key, field, etree.XPath(path), read))
+        self._lock = threading.Lock()
+        self._stats = {key: {'calls': 0, 'seconds': 0.0, 'defaults': 0, 'failures': 0} for key in fields}
+        self.elements = 0
+        self.failed_elements = 0
+
+    def __call__(self, element) -> Dict[str, Any]:
+        """
+        Extract every field from one element
+
+        Raises:
+            ExtractError: A required field was missing or failed post-processing
+        """
+        result = {}
+        timings = []
+        error = None
+        for key, field, xpath, read in self._compiled:
+            started = time.perf_counter()
+            outcome = 'ok'
+            try:
+                matches = xpath(element)
+                if field.index is None:
+                    value = [read(match) for match in matches]
+                elif len(matches) > field.index:
+                    value = read(matches[field.index])
+                else:
+                    value = None
+                if value is None:
+                    raise LookupError(f"no match for '{field.selector}'")
+                if field.post is not None:
+                    value = field.post(value)
+            except Exception as e:
+                if field.required:
+                    outcome = 'failures'
+                    error = ExtractError(f"{self.name}.{key}: {e}")
+                else:
+                    outcome = 'defaults'
+                    value = field.default
+            timings.append((key, time.perf_counter() - started, outcome))
+            if error is not None:
+                break
+            result[key] = value
+        self._record(timings, error is not None)
+        if error is not None:
+            raise error
+        return result
+
+    def _record(self, timings, failed: bool):
+        with self._lock:
+            self.elements += 1
+            self.failed_elements += int(failed)
+            for key, seconds, outcome in timings:
+                stats = self._stats[key]
+                stats['calls'] += 1
+                stats['seconds'] += seconds
+                if outcome != 'ok':
+                    stats[outcome] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per field: calls, total seconds, defaults used and failures"""
+        with self._lock:
+            return {key: dict(values) for key, values in self._stats.items()}
+
+    def report(self):
+        """Print elements processed, total time and any fields that defaulted or failed"""
+        stats = self.stats()
+        total = sum(values['seconds'] for values in stats.values())
+        print(f"📐 {self.name}: {self.elements} elements, {self.failed_elements} failed, "
+              f"{total * 1000:.1f}ms in field extraction")
+        for key, values in stats.items():
+            if values['defaults'] or values['failures']:
+                print(f"   {key}: {values['defaults']} defaulted, {values['failures']} failed "
+                      f"of {values['calls']} ({values['seconds'] * 1000:.1f}ms)")
+
+
+def compile_spec(spec: Dict[str, Union[str, tuple, Field]], name: str = 'extract') -> Extractor:
+    """
+    Compile a field spec once
+
+    Args:
+        spec: Field name -> Field, or the shorthands "css" (stripped text) and
+              ("css", attr), as in the browser extract spec
+        name: Label for errors and the report, e.g. "onepiece"
+
+    Returns:
+        Extractor
+    """
+    fields = {}
+    for key, value in spec.items():
+        if isinstance(value, Field):
+            fields[key] = value
+        elif isinstance(value, str):
+            fields[key] = Field(value)
+        elif isinstance(value, tuple):
+            fields[key] = Field(value[0], attr=value[1])
+        else:
+            raise ValueError(f"Unsupported field spec for '{key}': {value!r}")
+    return Extractor(fields, name=name)
+
+
+# Post-processing helpers
+
+def remove(*labels: str) -> Callable[[str], str]:
+    """Drop label text (e.g. 'Power') from the value and strip it"""
+    def apply(value: str) -> str:
+        for label in labels:
+            value = value.replace(label, '')
+        return value.strip()
+    return apply
+
+
+def chain(*steps: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Apply several post-processing steps in order"""
+    def apply(value):
+        for step in steps:
+            value = step(value)
+        return value
+    return apply
+
+
+def split_list(separator: str) -> Callable[[str], List[str]]:
+    """Split on separator into stripped parts ('' gives [])"""
+    return lambda value: [part.strip() for part in value.split(separator)] if value else []
+
+
+def first_match(pattern: str, default: Any = None) -> Callable[[str], Any]:
+    """First regex match in the value (group 1 if the pattern has a group), or default"""
+    compiled = re.compile(pattern)
+
+    def apply(value: str):
+        match = compiled.search(value)
+        if not match:
+            return default
+        return match.group(1) if compiled.groups else match.group()
+    return apply
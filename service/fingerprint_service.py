@@ -0,0 +1,158 @@
+"""
+Cheap "has anything changed?" probes for check-scrapers.
+
+A scraper hashes the part of a page it actually reads (e.g. the card blocks
+of a card list) and compares it with the fingerprint stored on its last
+successful run; parsing, image checks and database work only happen when the
+content changed:
+
+    blocks = tree.xpath(css_to_xpath('dl.modalCol'))
+    page_fingerprint = fingerprint(blocks)
+    if not fingerprints.changed('onepiece:556801', page_fingerprint):
+        return
+    ...  # parse, upload
+    fingerprints.save('onepiece:556801', page_fingerprint, cards=len(blocks))
+
+Save only after the work succeeded, so a failed run is retried next time.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+# MongoDB collection holding the last fingerprint per probe key
+FINGERPRINT_COLLECTION = os.getenv('C_FINGERPRINTS', 'CL_page_fingerprints')
+# Set to 1 to treat every page as changed (stored fingerprints are still updated)
+FINGERPRINT_FORCE = os.getenv('FINGERPRINT_FORCE', '0') not in ('0', 'false', 'no')
+
+_WHITESPACE = re.compile(r'\s+')
+_BETWEEN_TAGS = re.compile(r'>\s+<')
+# Cache-busting query strings on asset URLs change without the content changing
+_ASSET_QUERY = re.compile(r'((?:src|data-src|srcset)="[^"?]*)\?[^"]*"')
+
+
+def normalize_block(block: Any) -> str:
+    """
+    Canonical text of one content block
+
+    Args:
+        block: lxml element, BeautifulSoup tag, or a string
+
+    Returns:
+        Markup with whitespace collapsed and asset query strings removed
+    """
+    if isinstance(block, bytes):
+        markup = block.decode('utf-8', errors='replace')
+    elif isinstance(block, str):
+        markup = block
+    elif hasattr(block, 'getroottree'):
+        from lxml import etree
+        markup = etree.tostring(block, encoding='unicode', method='html', with_tail=False)
+    else:
+        markup = str(block)
+    markup = _ASSET_QUERY.sub(r'\1"', markup)
+    markup = _BETWEEN_TAGS.sub('><', markup)
+    return _WHITESPACE.sub(' ', markup).strip()
+
+
+def fingerprint(blocks: Iterable[Any]) -> str:
+    """sha256 over the normalized blocks, in page order"""
+    digest = hashlib.sha256()
+    for block in blocks:
+        digest.update(normalize_block(block).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class FingerprintStore:
+    """
+    Last seen fingerprint per probe key ("<site>:<page>") in MongoDB.
+
+    Lookups that fail (no Mongo configuration, network error) count as
+    "changed", so a broken store never hides new content.
+    """
+
+    def __init__(self, collection_name: str = FINGERPRINT_COLLECTION, collection=None, force: bool = FINGERPRINT_FORCE):
+        """
+        Initialize the store
+
+        Args:
+            collection_name: MongoDB collection for the fingerprints
+            collection: Collection object to use instead of connecting
+            force: Report every page as changed
+        """
+        self.collection_name = collection_name
+        self.force = force
+        self._collection = collection
+        self._lock = threading.Lock()
+
+    def _get_collection(self):
+        with self._lock:
+            if self._collection is None:
+                from service.mongo_service import MongoService
+                self._collection = MongoService()._get_collection(self.collection_name)
+            return self._collection
+
+    def get(self, key: str) -> Optional[str]:
+        """Stored fingerprint for key, or None"""
+        doc = self._get_collection().find_one({'_id': key}, {'fingerprint': 1})
+        return doc['fingerprint'] if doc else None
+
+    def changed(self, key: str, value: str) -> bool:
+        """
+        Whether the content differs from the last saved run
+
+        Args:
+            key: Probe key, e.g. "onepiece:556801"
+            value: Current fingerprint
+
+        Returns:
+            True when there is no stored fingerprint, it differs, or it can't be read
+        """
+        if self.force:
+            return True
+        try:
+            stored = self.get(key)
+        except Exception as e:
+            print(f"⚠️ Could not read fingerprint for {key} ({e}), treating it as changed")
+            return True
+        return stored != value
+
+    def save(self, key: str, value: str, **info) -> bool:
+        """
+        Store the fingerprint after the content was processed
+
+        Args:
+            key: Probe key
+            value: Fingerprint
+            **info: Extra fields kept with it, e.g. cards=120
+
+        Returns:
+            True if saved
+        """
+        try:
+            self._get_collection().update_one(
+                {'_id': key},
+                {'$set': {'fingerprint': value, 'updated_at': datetime.now(), **info}},
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not save fingerprint for {key}: {e}")
+            return False
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_fingerprint_store() -> FingerprintStore:
+    """Process-wide FingerprintStore on FINGERPRINT_COLLECTION"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = FingerprintStore()
+        return _default_store
@@ -2,7 +2,7 @@ import os
 import subprocess
 from datetime import datetime
 import json
-import requests
+from service.api_service import get_http_session
 import base64
 
 
@@ -71,7 +71,7 @@ class GitHubService:
             "Accept": "application/vnd.github.v3+json"
         }
 
-        response = requests.get(url, headers=headers)
+        response = get_http_session().get(url, headers=headers)
         if response.status_code == 200:
             file_data = response.json()
 
@@ -133,7 +133,7 @@ class GitHubService:
             "Accept": "application/vnd.github.v3+json"
         }
 
-        response = requests.get(self.api_url, headers=headers)
+        response = get_http_session().get(self.api_url, headers=headers)
         if response.status_code == 200:
             file_data = response.json()
             try:
@@ -171,7 +171,7 @@ class GitHubService:
                 data["sha"] = file_sha
 
             headers = {"Authorization": f"Bearer {self.github_token}"}
-            response = requests.put(update_url, headers=headers, json=data)
+            response = get_http_session().put(update_url, headers=headers, json=data)
 
             if response.status_code in [200, 201]:
                 print(f"✅ Successfully updated {file_path} on GitHub")
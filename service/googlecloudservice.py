@@ -1,21 +1,30 @@
 from google.cloud import storage
-import requests
 import tempfile
 import os
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 from service.googlecredentials import get_google_credentials
+from service.api_service import get_http_session
 
-def upload_image_to_gcs(image_url, filename, filepath, bucket_name="images.geekstack.dev", skip_if_exists=True):
+# Concurrent uploads in a shared ImageIngestor
+IMAGE_INGEST_WORKERS = int(os.getenv('IMAGE_INGEST_WORKERS', '8'))
 
-    try:
-        # Get credentials and setup GCS client early to check for existing file
-        credentials = get_google_credentials()
-        if not credentials:
-            raise Exception("No GCP credentials found. Set GOOGLE_APPLICATION_CREDENTIALS environment variable or provide a credentials file.")
+def _get_bucket(bucket_name):
+    credentials = get_google_credentials()
+    if not credentials:
+        raise Exception("No GCP credentials found. Set GOOGLE_APPLICATION_CREDENTIALS environment variable or provide a credentials file.")
 
-        client = storage.Client(credentials=credentials)
-        bucket = client.get_bucket(bucket_name)
+    client = storage.Client(credentials=credentials)
+    return client.get_bucket(bucket_name)
+
+def upload_image_to_gcs(image_url, filename, filepath, bucket_name="images.geekstack.dev", skip_if_exists=True, bucket=None):
+
+    try:
+        # Setup GCS client early to check for existing file (unless the caller shares a bucket)
+        if bucket is None:
+            bucket = _get_bucket(bucket_name)
         blob = bucket.blob(f"{filepath}{filename}.webp")
         
         # Check if file already exists
@@ -42,7 +51,7 @@ def upload_image_to_gcs(image_url, filename, filepath, bucket_name="images.geeks
             "Upgrade-Insecure-Requests": "1",
         }
         
-        response = requests.get(image_url, stream=True, headers=headers, timeout=30)
+        response = get_http_session().get(image_url, stream=True, headers=headers, timeout=30)
         print(f"Response status code: {response.status_code}")
         
         if response.status_code != 200:
@@ -83,6 +92,74 @@ def upload_image_to_gcs(image_url, filename, filepath, bucket_name="images.geeks
         print(f"❌ Failed to upload {filename} to GCS: {e}")
         return image_url  # fallback to original
 
+class ImageIngestor:
+    """
+    Shared pool for image uploads: one GCS client and bucket for every upload,
+    a worker limit, and each target uploaded once even when several scrapers
+    submit it (e.g. a card reprinted in two series).
+
+    Example:
+        with ImageIngestor() as ingestor:
+            futures = [ingestor.submit(url, card_uid, gcs_path) for url, card_uid in images]
+            urls = [future.result() for future in futures]
+    """
+
+    def __init__(self, workers=IMAGE_INGEST_WORKERS, bucket_name="images.geekstack.dev", skip_if_exists=True):
+        """
+        Initialize the ingestor
+
+        Args:
+            workers: Concurrent uploads
+            bucket_name: Target GCS bucket
+            skip_if_exists: Keep images already in the bucket
+        """
+        self.bucket_name = bucket_name
+        self.skip_if_exists = skip_if_exists
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="image-ingest")
+        self._lock = threading.Lock()
+        self._bucket = None
+        self._futures = {}
+
+    def _get_bucket(self):
+        with self._lock:
+            if self._bucket is None:
+                try:
+                    self._bucket = _get_bucket(self.bucket_name)
+                except Exception as e:
+                    # upload_image_to_gcs reports it per image and falls back to the source URL
+                    print(f"⚠️ Could not open GCS bucket {self.bucket_name}: {e}")
+                    return None
+            return self._bucket
+
+    def _upload(self, image_url, filename, filepath):
+        return upload_image_to_gcs(image_url, filename, filepath, bucket_name=self.bucket_name,
+                                   skip_if_exists=self.skip_if_exists, bucket=self._get_bucket())
+
+    def submit(self, image_url, filename, filepath):
+        """
+        Queue an upload
+
+        Returns:
+            Future with the public URL (the source URL if the upload failed)
+        """
+        key = (filepath, filename)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._executor.submit(self._upload, image_url, filename, filepath)
+                self._futures[key] = future
+        return future
+
+    def close(self):
+        """Wait for queued uploads and stop the workers"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
 def upload_data_to_gcs(data, file_name, folder_path="backups", bucket_name="images.geekstack.dev", data_type='json', skip_if_exists=True):
     """
     Upload data directly to Google Cloud Storage (without creating a local file)
@@ -0,0 +1,220 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# off (default), on (serve fresh entries, revalidate stale ones) or replay (cache only, never the network)
+HTTP_CACHE = os.getenv('HTTP_CACHE', 'off').lower()
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join('.cache', 'http'))
+# Seconds an entry is served without asking the server (0: always revalidate)
+HTTP_CACHE_TTL = float(os.getenv('HTTP_CACHE_TTL', '3600'))
+# Per-host overrides, e.g. "www.onepiece-cardgame.com=0,ws-blau.com=86400"
+HTTP_CACHE_HOST_TTLS = os.getenv('HTTP_CACHE_HOST_TTLS', '')
+# Hosts always fetched from the network in "on" mode (state that changes under us, e.g. GitHub file shas)
+HTTP_CACHE_BYPASS_HOSTS = os.getenv('HTTP_CACHE_BYPASS_HOSTS', 'api.github.com')
+
+# Request headers that change the response and so are part of the key
+CACHE_KEY_HEADERS = ('Accept', 'Accept-Language', 'Authorization')
+# The body is stored decoded, so these no longer describe it
+_DROPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+
+
+class ReplayModeError(requests.exceptions.RequestException):
+    """A request that can't be served from the cache was made in replay mode"""
+
+
+def _parse_host_ttls(value: str) -> Dict[str, float]:
+    ttls = {}
+    for item in value.split(','):
+        host, _, seconds = item.partition('=')
+        if host.strip() and seconds.strip():
+            try:
+                ttls[host.strip().lower()] = float(seconds)
+            except ValueError:
+                print(f"⚠️ Ignoring invalid HTTP_CACHE_HOST_TTLS entry: {item}")
+    return ttls
+
+
+class HttpCache:
+    """
+    On-disk cache of GET responses, one gzip file per URL and key headers.
+
+    Fresh entries (younger than the host's TTL) are served without a request;
+    stale ones are revalidated with If-None-Match / If-Modified-Since, so an
+    unchanged page costs a 304 instead of a download. Requests to bypass hosts
+    or carrying credentials (Authorization) always go to the network and are
+    only recorded for replay. In replay mode every entry is served regardless
+    of age and nothing is ever sent: a GET that isn't cached gets a 504 and
+    any other method raises ReplayModeError.
+
+    Used by PooledSession when HTTP_CACHE is on/replay:
+        HTTP_CACHE=replay python scrapers/onepiece/opcheckscrape.py
+    """
+
+    def __init__(self, root: str = HTTP_CACHE_DIR, mode: str = 'on', ttl: float = HTTP_CACHE_TTL,
+                 host_ttls: Optional[Dict[str, float]] = None, bypass_hosts: Optional[Iterable[str]] = None):
+        """
+        Initialize the cache
+
+        Args:
+            root: Directory the entries are stored under
+            mode: 'on' or 'replay'
+            ttl: Default freshness lifetime in seconds
+            host_ttls: Lifetime per hostname (default: from HTTP_CACHE_HOST_TTLS)
+            bypass_hosts: Hosts never served from the cache in on mode (default: from HTTP_CACHE_BYPASS_HOSTS)
+        """
+        if mode not in ('on', 'replay'):
+            raise ValueError(f"Unknown HTTP cache mode '{mode}', expected 'on' or 'replay'")
+        self.root = root
+        self.mode = mode
+        self.ttl = ttl
+        self.host_ttls = _parse_host_ttls(HTTP_CACHE_HOST_TTLS) if host_ttls is None else dict(host_ttls)
+        if bypass_hosts is None:
+            bypass_hosts = HTTP_CACHE_BYPASS_HOSTS.split(',')
+        self.bypass_hosts = {host.strip().lower() for host in bypass_hosts if host.strip()}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'downloads': 0, 'misses': 0}
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == 'replay'
+
+    def set_ttl(self, host: str, seconds: float):
+        """Freshness lifetime for one host (0: always revalidate)"""
+        self.host_ttls[host.lower()] = seconds
+
+    def ttl_for(self, url: str) -> float:
+        return self.host_ttls.get((urlsplit(url).hostname or '').lower(), self.ttl)
+
+    def bypasses(self, url: str, headers) -> bool:
+        """Whether a GET must not be answered from the cache (outside replay mode)"""
+        return (urlsplit(url).hostname or '').lower() in self.bypass_hosts or bool(headers.get('Authorization'))
+
+    @staticmethod
+    def key(url: str, headers) -> str:
+        """Cache key for a GET of url with the given (merged) request headers"""
+        varying = [f"{name.lower()}:{headers.get(name)}" for name in CACHE_KEY_HEADERS if headers.get(name)]
+        return hashlib.sha256('\n'.join([url] + varying).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.gz")
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def load(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        """(metadata, body) of an entry, or None"""
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rb') as f:
+                raw = f.read()
+            meta, _, body = raw.partition(b'\n')
+            return json.loads(meta), body
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError) as e:
+            print(f"⚠️ Ignoring unreadable HTTP cache entry {path}: {e}")
+            return None
+
+    def _write(self, key: str, meta: Dict, body: bytes):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent readers never see a half-written file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(json.dumps(meta, ensure_ascii=False).encode('utf-8') + b'\n' + body)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write HTTP cache entry {path}: {e}")
+
+    def is_fresh(self, meta: Dict) -> bool:
+        return self.replay or time.time() - meta['stored_at'] < self.ttl_for(meta['url'])
+
+    @staticmethod
+    def validators(meta: Dict) -> Dict[str, str]:
+        """Conditional request headers for revalidating an entry"""
+        stored = CaseInsensitiveDict(meta['headers'])
+        headers = {}
+        if stored.get('ETag'):
+            headers['If-None-Match'] = stored['ETag']
+        if stored.get('Last-Modified'):
+            headers['If-Modified-Since'] = stored['Last-Modified']
+        return headers
+
+    def store(self, key: str, response: requests.Response):
+        """Save a 200 response to a GET"""
+        self._count('downloads')
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS}
+        meta = {'url': response.url, 'status': response.status_code, 'reason': response.reason,
+                'headers': headers, 'stored_at': time.time()}
+        self._write(key, meta, response.content)
+
+    def refresh(self, key: str, meta: Dict, body: bytes, not_modified: requests.Response) -> Dict:
+        """Mark an entry fresh again after a 304, taking the server's updated validators"""
+        meta = {**meta, 'stored_at': time.time()}
+        headers = CaseInsensitiveDict(meta['headers'])
+        for name in ('ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Date'):
+            if name in not_modified.headers:
+                headers[name] = not_modified.headers[name]
+        meta['headers'] = dict(headers)
+        self._write(key, meta, body)
+        return meta
+
+    def response(self, meta: Dict, body: bytes, request: requests.PreparedRequest, status: str) -> requests.Response:
+        """Rebuild a requests.Response from an entry; X-Cache tells HIT from REVALIDATED"""
+        self._count('hits' if status == 'HIT' else 'revalidated')
+        response = requests.Response()
+        response.status_code = meta['status']
+        response.reason = meta.get('reason') or 'OK'
+        response.headers = CaseInsensitiveDict({**meta['headers'], 'X-Cache': status})
+        response._content = body
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = meta['url']
+        response.request = request
+        return response
+
+    def miss(self, request: requests.PreparedRequest) -> requests.Response:
+        """In replay mode: a 504 (as for Cache-Control: only-if-cached) for a URL that isn't cached"""
+        self._count('misses')
+        response = requests.Response()
+        response.status_code = 504
+        response.reason = 'Not in HTTP cache (replay mode)'
+        response.headers = CaseInsensitiveDict({'X-Cache': 'MISS'})
+        response._content = b''
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        return response
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def replay_mode() -> bool:
+    """Whether HTTP_CACHE=replay, i.e. nothing may be sent over the network"""
+    return HTTP_CACHE == 'replay'
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Process-wide cache configured by HTTP_CACHE, or None when it is off"""
+    global _default_cache
+    if HTTP_CACHE == 'off':
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache(mode=HTTP_CACHE)
+            print(f"🗄️ HTTP cache {HTTP_CACHE_DIR} ({HTTP_CACHE})")
+        return _default_cache
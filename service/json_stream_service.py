@@ -0,0 +1,207 @@
+"""
+Tolerant, incremental parsing of the flat JSON objects LLM translations return.
+
+Models occasionally wrap the object in code fences, leave inner quotes
+unescaped, put raw newlines inside strings or stop mid-object. Rather than
+failing the whole response, the parser keeps every key/value pair it could
+read completely. It can be fed a response chunk by chunk (e.g. from a
+stream) and reports pairs as soon as they are complete.
+"""
+
+import json
+from typing import Any, Dict, Optional, Tuple
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class IncrementalJsonParser:
+    """Reads "key": value pairs from a (possibly malformed or partial) JSON object"""
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._state = 'start'
+        self._key = None
+        self.result: Dict[str, Any] = {}
+        self.done = False
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """
+        Add more response text
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            Dict of the pairs completed by this chunk
+        """
+        self._buf += chunk
+        return self._parse(final=False)
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Mark the end of the response and return every complete pair.
+        A value cut off by the end of the response is dropped.
+        """
+        self._parse(final=True)
+        return self.result
+
+    def _parse(self, final: bool) -> Dict[str, Any]:
+        new = {}
+        buf = self._buf
+        while self._pos < len(buf) and not self.done:
+            if self._state == 'start':
+                brace = buf.find('{', self._pos)
+                if brace < 0:
+                    self._pos = len(buf)
+                    break
+                self._pos = brace + 1
+                self._state = 'key'
+
+            elif self._state == 'key':
+                c = buf[self._pos]
+                if c == '}':
+                    self.done = True
+                elif c == '"':
+                    read = self._read_string(self._pos + 1, final, is_key=True)
+                    if read is None:
+                        break
+                    self._key, self._pos = read
+                    self._state = 'colon'
+                    continue
+                self._pos += 1  # whitespace, commas and stray characters
+
+            elif self._state == 'colon':
+                c = buf[self._pos]
+                if c.isspace():
+                    self._pos += 1
+                elif c == ':':
+                    self._pos += 1
+                    self._state = 'value'
+                else:
+                    self._state = 'key'  # key without a value
+
+            elif self._state == 'value':
+                c = buf[self._pos]
+                if c.isspace():
+                    self._pos += 1
+                    continue
+                if c == '"':
+                    read = self._read_string(self._pos + 1, final, is_key=False)
+                else:
+                    read = self._read_scalar(self._pos, final)
+                if read is None:
+                    break
+                value, self._pos = read
+                self.result[self._key] = new[self._key] = value
+                self._state = 'key'
+        return new
+
+    def _read_string(self, start: int, final: bool, is_key: bool) -> Optional[Tuple[str, int]]:
+        """
+        Read a string body starting after its opening quote.
+
+        A quote only closes a value if it is followed by ',' or '}' (or by a
+        newline and the next key), so unescaped quotes inside translations survive.
+
+        Returns:
+            (decoded string, position after the closing quote), or None if incomplete
+        """
+        buf = self._buf
+        out = []
+        i = start
+        while i < len(buf):
+            c = buf[i]
+            if c == '\\':
+                if i + 1 >= len(buf):
+                    return None
+                esc = buf[i + 1]
+                if esc == 'u':
+                    if i + 6 > len(buf):
+                        return None
+                    try:
+                        out.append(chr(int(buf[i + 2:i + 6], 16)))
+                        i += 6
+                        continue
+                    except ValueError:
+                        pass
+                out.append(_ESCAPES.get(esc, esc))
+                i += 2
+                continue
+            if c == '"':
+                if is_key:
+                    return _join(out), i + 1
+                j = i + 1
+                while j < len(buf) and buf[j].isspace():
+                    j += 1
+                if j >= len(buf):
+                    if final:
+                        return _join(out), i + 1
+                    return None  # Can't tell yet whether this quote closes the value
+                if buf[j] in ',}' or (buf[j] == '"' and '\n' in buf[i + 1:j]):
+                    return _join(out), i + 1
+            out.append(c)
+            i += 1
+        return None
+
+    def _read_scalar(self, start: int, final: bool) -> Optional[Tuple[Any, int]]:
+        """Read a number, literal or nested value up to the next top-level ',' or '}'"""
+        buf = self._buf
+        depth = 0
+        in_string = False
+        i = start
+        while i < len(buf):
+            c = buf[i]
+            if in_string:
+                if c == '\\':
+                    i += 1
+                elif c == '"':
+                    in_string = False
+            elif c == '"':
+                in_string = True
+            elif c in '[{':
+                depth += 1
+            elif c in ']}':
+                if depth == 0:
+                    break
+                depth -= 1
+            elif c == ',' and depth == 0:
+                break
+            i += 1
+        else:
+            if not final:
+                return None
+            return None if depth or in_string else (_decode_scalar(buf[start:i]), i)
+        return _decode_scalar(buf[start:i]), i
+
+
+def _join(parts) -> str:
+    # \uXXXX escapes may encode surrogate pairs (emoji); recombine them
+    text = ''.join(parts)
+    try:
+        return text.encode('utf-16', 'surrogatepass').decode('utf-16')
+    except UnicodeError:
+        return text
+
+
+def _decode_scalar(token: str) -> Any:
+    token = token.strip()
+    try:
+        return json.loads(token)
+    except ValueError:
+        return token
+
+
+def parse_json_tolerant(text: str) -> Dict[str, Any]:
+    """
+    Parse every complete key/value pair from possibly malformed JSON object text.
+
+    Args:
+        text: Model output, optionally wrapped in code fences or cut off
+
+    Returns:
+        Dict of the pairs that could be read (empty if none)
+    """
+    parser = IncrementalJsonParser()
+    parser.feed(text)
+    return parser.close()
@@ -0,0 +1,123 @@
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = [0.5, 1, 2, 4, 8, 16, 32, 64, 128]
+
+
+class LatencyHistogram:
+    """
+    Bucketed latency counts plus a window of recent samples for percentiles.
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize the histogram
+
+        Args:
+            window: Number of most recent samples kept for percentile estimates
+        """
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p-th percentile (0-100) of the recent samples, or None without samples"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def to_dict(self) -> Dict:
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'samples': list(self.samples),
+        }
+
+    @classmethod
+    def from_dict(cls, value: Dict, window: int = 200) -> 'LatencyHistogram':
+        histogram = cls(window)
+        counts = list((value or {}).get('buckets', {}).values())
+        if len(counts) == len(histogram.counts):
+            histogram.counts = counts
+        histogram.samples.extend((value or {}).get('samples', []))
+        return histogram
+
+
+class LatencyTracker:
+    """
+    Per-model latency histograms, optionally persisted in an LLM cache store
+    so deadlines derived from them carry over between runs.
+    """
+
+    def __init__(self, store=None, min_samples: int = 10):
+        """
+        Initialize the tracker
+
+        Args:
+            store: Optional cache store (see llm_cache_service) to load/save histograms
+            min_samples: Samples needed before percentiles are trusted
+        """
+        self.store = store
+        self.min_samples = min_samples
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, model: str) -> LatencyHistogram:
+        # Caller holds the lock
+        if model not in self._histograms:
+            saved = None
+            if self.store is not None:
+                try:
+                    saved = self.store.get(f"latency:{model}")
+                except Exception as e:
+                    print(f"⚠️ Could not load latency history for {model}: {e}")
+            self._histograms[model] = LatencyHistogram.from_dict(saved) if saved else LatencyHistogram()
+        return self._histograms[model]
+
+    def record(self, model: str, seconds: float):
+        with self._lock:
+            self._histogram(model).record(seconds)
+
+    def percentile(self, model: str, p: float) -> Optional[float]:
+        """p-th percentile for the model, or None until min_samples have been seen"""
+        with self._lock:
+            histogram = self._histogram(model)
+            if len(histogram.samples) < self.min_samples:
+                return None
+            return histogram.percentile(p)
+
+    def summary(self, models: List[str] = None) -> Dict[str, Dict]:
+        with self._lock:
+            names = models or list(self._histograms)
+            return {
+                model: {
+                    **self._histogram(model).to_dict(),
+                    'p50': self._histogram(model).percentile(50),
+                    'p90': self._histogram(model).percentile(90),
+                }
+                for model in names
+            }
+
+    def save(self):
+        """Persist every histogram touched this run (no-op without a store)"""
+        if self.store is None:
+            return
+        with self._lock:
+            snapshot = {model: histogram.to_dict() for model, histogram in self._histograms.items()}
+        for model, value in snapshot.items():
+            try:
+                self.store.set(f"latency:{model}", value)
+            except Exception as e:
+                print(f"⚠️ Could not save latency history for {model}: {e}")
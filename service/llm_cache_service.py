@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# disk (default), mongo, or none
+LLM_CACHE_BACKEND = os.getenv('LLM_CACHE_BACKEND', 'disk').lower()
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', os.path.join('.cache', 'llm'))
+LLM_CACHE_COLLECTION = os.getenv('LLM_CACHE_COLLECTION', 'CL_llm_cache')
+
+
+def hash_payload(payload: Any) -> str:
+    """Stable sha256 of any JSON-serializable payload"""
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class DiskCacheStore:
+    """One JSON file per key under a root directory"""
+
+    def __init__(self, root: str = LLM_CACHE_DIR):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, digest[:2], f"{digest}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)['value']
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def set(self, key: str, value: Any):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent readers never see a half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'created_at': datetime.now().isoformat(), 'value': value}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class MongoCacheStore:
+    """Cache entries as documents in a MongoDB collection, so they survive CI runners"""
+
+    def __init__(self, collection_name: str = LLM_CACHE_COLLECTION):
+        from service.mongo_service import MongoService
+        self.collection = MongoService()._get_collection(collection_name)
+
+    def get(self, key: str) -> Optional[Any]:
+        doc = self.collection.find_one({'_id': key}, {'value': 1})
+        return doc['value'] if doc else None
+
+    def set(self, key: str, value: Any):
+        self.collection.update_one(
+            {'_id': key},
+            {'$set': {'value': value, 'created_at': datetime.now()}},
+            upsert=True
+        )
+
+    def delete(self, key: str):
+        self.collection.delete_one({'_id': key})
+
+
+def create_cache_store(backend: str = LLM_CACHE_BACKEND):
+    """Build the configured cache store, or None if caching is disabled or unavailable"""
+    if backend == 'none':
+        return None
+    if backend == 'mongo':
+        try:
+            return MongoCacheStore()
+        except Exception as e:
+            print(f"⚠️ Mongo LLM cache unavailable ({e}), falling back to disk")
+    return DiskCacheStore()
+
+
+class LLMResponseCache:
+    """
+    Cache of raw OpenRouter completions keyed by (model, prompt hash).
+
+    Only complete responses are stored. Callers bypass the cache on retries so
+    a response that failed to parse is refreshed rather than replayed.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    @staticmethod
+    def make_key(payload: Dict) -> str:
+        model = payload.get('model', '')
+        return f"completion:{model}:{hash_payload(payload)}"
+
+    def get(self, payload: Dict) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        try:
+            value = self.store.get(self.make_key(payload))
+        except Exception as e:
+            print(f"⚠️ LLM cache read failed: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, payload: Dict, response: Dict):
+        if not self.enabled:
+            return
+        try:
+            self.store.set(self.make_key(payload), response)
+        except Exception as e:
+            print(f"⚠️ LLM cache write failed: {e}")
+
+    def invalidate(self, payload: Dict):
+        """Drop a cached response that turned out to be unusable"""
+        if not self.enabled:
+            return
+        try:
+            self.store.delete(self.make_key(payload))
+        except Exception as e:
+            print(f"⚠️ LLM cache delete failed: {e}")
+
+
+class TranslationCheckpoint:
+    """
+    Records completed translation batches for a run id so a rerun of the same
+    series only pays for the batches that did not finish last time.
+    """
+
+    def __init__(self, run_id: str, store=None):
+        self.run_id = run_id
+        self.store = store
+        self._keys: List[str] = []
+        self._lock = threading.Lock()
+
+    def _key(self, batch_key: str) -> str:
+        return f"checkpoint:{self.run_id}:{batch_key}"
+
+    @staticmethod
+    def batch_key(*parts: Any) -> str:
+        """Hash of the batch content plus anything else that affects its output"""
+        return hash_payload(parts)
+
+    def load(self, batch_key: str) -> Optional[Any]:
+        if self.store is None:
+            return None
+        key = self._key(batch_key)
+        try:
+            value = self.store.get(key)
+        except Exception as e:
+            print(f"⚠️ Checkpoint read failed: {e}")
+            return None
+        if value is not None:
+            with self._lock:
+                self._keys.append(key)
+        return value
+
+    def save(self, batch_key: str, value: Any):
+        if self.store is None:
+            return
+        key = self._key(batch_key)
+        try:
+            self.store.set(key, value)
+            with self._lock:
+                self._keys.append(key)
+        except Exception as e:
+            print(f"⚠️ Checkpoint write failed: {e}")
+
+    def clear(self):
+        """Drop every checkpoint this run loaded or saved (call once the run fully succeeds)"""
+        if self.store is None:
+            return
+        with self._lock:
+            keys, self._keys = self._keys, []
+        for key in set(keys):
+            try:
+                self.store.delete(key)
+            except Exception as e:
+                print(f"⚠️ Checkpoint cleanup failed: {e}")
@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from service.latency_service import LatencyHistogram
+
+# Where run summaries are written (set to an empty string to disable the artifact)
+LLM_TELEMETRY_DIR = os.getenv('LLM_TELEMETRY_DIR', os.path.join('.cache', 'telemetry'))
+# Include bucketed latency histograms per operation and model in the summary
+LLM_TELEMETRY_HISTOGRAMS = os.getenv('LLM_TELEMETRY_HISTOGRAMS', '0') not in ('0', 'false', 'no')
+
+
+class LLMTelemetry:
+    """
+    Per-run record of every LLM request: latency, tokens, cost, model and outcome,
+    plus retries and parse failures per operation (e.g. "unionarena", "haikyuu").
+    """
+
+    def __init__(self, directory: Optional[str] = LLM_TELEMETRY_DIR, histograms: bool = LLM_TELEMETRY_HISTOGRAMS):
+        """
+        Initialize the telemetry for one run
+
+        Args:
+            directory: Directory for the JSON summary artifact (None/empty disables it)
+            histograms: Include latency histograms in the summary
+        """
+        self.started_at = datetime.now()
+        self.histograms = histograms
+        self.path = None
+        if directory:
+            self.path = os.path.join(directory, f"llm_{self.started_at:%Y%m%d_%H%M%S}_{os.getpid()}.json")
+        self._requests: List[Dict] = []
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def record_request(self, operation: str, model: str, latency: float, status: str, usage: Optional[Dict] = None):
+        """
+        Record one request
+
+        Args:
+            operation: What the request was for, e.g. "unionarena"
+            model: Model that served it
+            latency: Seconds spent
+            status: ok, partial (cut off), error, cancelled (lost a hedge) or cache_hit
+            usage: OpenRouter usage block, if any
+        """
+        usage = usage or {}
+        entry = {
+            'operation': operation,
+            'model': model,
+            'status': status,
+            'latency': round(latency, 3),
+            'prompt_tokens': usage.get('prompt_tokens') or 0,
+            'completion_tokens': usage.get('completion_tokens') or 0,
+            'cached_tokens': (usage.get('prompt_tokens_details') or {}).get('cached_tokens') or 0,
+            'cost': usage.get('cost') or 0,
+            'at': time.time(),
+        }
+        with self._lock:
+            self._requests.append(entry)
+
+    def record_retry(self, operation: str):
+        with self._lock:
+            self._counters[operation]['retries'] += 1
+
+    def record_parse_failure(self, operation: str):
+        with self._lock:
+            self._counters[operation]['parse_failures'] += 1
+
+    def _aggregate(self, entries: List[Dict]) -> Dict:
+        latency = LatencyHistogram(window=max(1, len(entries)))
+        statuses = defaultdict(int)
+        for entry in entries:
+            statuses[entry['status']] += 1
+            if entry['status'] != 'cache_hit':
+                latency.record(entry['latency'])
+        stats = {
+            'requests': len(entries),
+            'statuses': dict(statuses),
+            'latency_total': round(sum(e['latency'] for e in entries), 3),
+            'latency_p50': latency.percentile(50),
+            'latency_p90': latency.percentile(90),
+            'latency_max': max(latency.samples) if latency.samples else None,
+            'prompt_tokens': sum(e['prompt_tokens'] for e in entries),
+            'completion_tokens': sum(e['completion_tokens'] for e in entries),
+            'cached_tokens': sum(e['cached_tokens'] for e in entries),
+            'cost': round(sum(e['cost'] for e in entries), 6),
+        }
+        if self.histograms:
+            stats['latency_histogram'] = latency.to_dict()['buckets']
+        return stats
+
+    def summary(self) -> Dict:
+        with self._lock:
+            entries = list(self._requests)
+            counters = {op: dict(values) for op, values in self._counters.items()}
+
+        by_operation = defaultdict(list)
+        by_model = defaultdict(list)
+        for entry in entries:
+            by_operation[entry['operation']].append(entry)
+            by_model[entry['model']].append(entry)
+
+        operations = {}
+        for operation in set(by_operation) | set(counters):
+            operations[operation] = {
+                **self._aggregate(by_operation.get(operation, [])),
+                'retries': counters.get(operation, {}).get('retries', 0),
+                'parse_failures': counters.get(operation, {}).get('parse_failures', 0),
+            }
+
+        return {
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'total': {
+                **self._aggregate(entries),
+                'retries': sum(c.get('retries', 0) for c in counters.values()),
+                'parse_failures': sum(c.get('parse_failures', 0) for c in counters.values()),
+            },
+            'by_operation': operations,
+            'by_model': {model: self._aggregate(items) for model, items in by_model.items()},
+            'slowest': sorted(entries, key=lambda e: e['latency'], reverse=True)[:10],
+        }
+
+    def write(self) -> Optional[str]:
+        """
+        Write the summary artifact and print a one-line overview
+
+        Returns:
+            Path written, or None if disabled or nothing was recorded
+        """
+        with self._lock:
+            if not self._requests and not self._counters:
+                return None
+        summary = self.summary()
+        total = summary['total']
+        print(f"📊 LLM telemetry: {total['requests']} requests, p90 {total['latency_p90'] or 0:.1f}s, "
+              f"{total['prompt_tokens']}+{total['completion_tokens']} tokens, ${total['cost']:.4f}, "
+              f"{total['retries']} retries, {total['parse_failures']} parse failures")
+        if not self.path:
+            return None
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"⚠️ Could not write LLM telemetry to {self.path}: {e}")
+            return None
+        return self.path
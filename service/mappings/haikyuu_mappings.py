@@ -5,6 +5,8 @@ Centralized storage for all Haikyuu-specific card game terminology.
 
 import re
 
+from service.mappings.term_matcher import TermMatcher
+
 # ========================
 # HAIKYUU BREAK TERMINOLOGY MAPPINGS
 # ========================
@@ -96,10 +98,14 @@ ALL_MAPPINGS = {
 }
 
 
+# Compiled once; every text is then translated in a single pass
+_TERMINOLOGY_MATCHER = TermMatcher(ALL_MAPPINGS, spacing=True, single_char_boundaries=True)
+
+
 def apply_terminology_mappings(text):
     """
     Apply pre-defined Haikyuu terminology mappings to Japanese text.
-    Processes from longest to shortest keys to avoid partial replacements.
+    Longest terms win where terms overlap, and replaced text is never rescanned.
     Automatically adds spaces around mapped terms when needed.
     
     Args:
@@ -111,38 +117,21 @@ def apply_terminology_mappings(text):
     if not text or text.strip() == '-':
         return text
     
-    result = text
-    # Sort by length (longest first) to avoid partial replacements
-    sorted_terms = sorted(ALL_MAPPINGS.keys(), key=len, reverse=True)
+    return _TERMINOLOGY_MATCHER.sub(text)
+
+
+def build_cardname_matcher(cardname_mapping):
+    """
+    Compile a Japanese cardName -> English cardName mapping for
+    apply_cardname_consistency_for_translation. Build it once per run.
     
-    for jp_term in sorted_terms:
-        english_term = ALL_MAPPINGS[jp_term]
-        
-        # For single-character terms, use word boundaries
-        if len(jp_term) == 1:
-            pattern = r'\b' + re.escape(jp_term) + r'\b'
-        else:
-            pattern = re.escape(jp_term)
-        
-        def replace_with_spacing(match):
-            start = match.start()
-            end = match.end()
-            
-            # Add space before if needed
-            space_before = ''
-            if start > 0 and result[start - 1] not in ' \n\t':
-                space_before = ' '
-            
-            # Add space after if needed
-            space_after = ''
-            if end < len(result) and result[end] not in ' \n\t':
-                space_after = ' '
-            
-            return space_before + english_term + space_after
-        
-        result = re.sub(pattern, replace_with_spacing, result)
+    Args:
+        cardname_mapping (dict): Mapping of Japanese cardName -> English cardName
     
-    return result
+    Returns:
+        TermMatcher: Matcher replacing card names without added spacing
+    """
+    return TermMatcher(cardname_mapping)
 
 
 def apply_cardname_consistency_for_translation(effectsJP_text, cardname_mapping):
@@ -152,19 +141,18 @@ def apply_cardname_consistency_for_translation(effectsJP_text, cardname_mapping)
     
     Args:
         effectsJP_text (str): Original Japanese effects text
-        cardname_mapping (dict): Mapping of Japanese cardName -> English cardName
+        cardname_mapping (dict | TermMatcher): Mapping of Japanese cardName -> English
+            cardName, or a matcher from build_cardname_matcher (much faster across many texts)
     
     Returns:
         str: Modified text with cardNames replaced for translation
     """
-    modified_effects = effectsJP_text
-    
-    # Replace any cardNames that appear in effects with their English translations
-    for jp_name, en_name in cardname_mapping.items():
-        if jp_name in modified_effects:
-            modified_effects = modified_effects.replace(jp_name, en_name)
+    if not isinstance(cardname_mapping, TermMatcher):
+        cardname_mapping = build_cardname_matcher(cardname_mapping)
     
-    return modified_effects
+    # Replace any cardNames that appear in effects with their English translations,
+    # preferring the longest name where one contains another
+    return cardname_mapping.sub(effectsJP_text)
 
 
 # ========================
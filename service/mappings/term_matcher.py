@@ -0,0 +1,86 @@
+"""
+Single-pass, longest-match-first term substitution.
+
+The terms of a mapping are compiled once into a regex shaped like a trie
+(shared prefixes are matched once, longer continuations are tried before
+shorter ones), so replacing every term in a text is one scan instead of one
+re.sub per term. Replacements are never rescanned, so an English value can't
+be matched again by a later term.
+"""
+
+import re
+from typing import Dict, Optional
+
+_WHITESPACE = ' \n\t'
+
+
+def _trie_pattern(trie: Dict) -> str:
+    # trie maps a character to its subtrie; the '' key marks the end of a term
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(trie.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # Greedy optional: keep going for a longer term, fall back to the one ending here
+    return f'(?:{body})?' if '' in trie else body
+
+
+class TermMatcher:
+    """
+    Compiled mapping of terms → replacements.
+
+    Example:
+        matcher = TermMatcher({"サーブエリア": "Serve Area"}, spacing=True)
+        matcher.sub("サーブエリアに置く")  # "Serve Area に置く"
+    """
+
+    def __init__(self, mapping: Dict[str, str], spacing: bool = False, single_char_boundaries: bool = False):
+        """
+        Compile the mapping
+
+        Args:
+            mapping: Term → replacement
+            spacing: Pad replacements with a space where they touch non-whitespace
+            single_char_boundaries: Only match one-character terms as whole words
+        """
+        self.mapping = {term: value for term, value in mapping.items() if term}
+        self.spacing = spacing
+
+        trie: Dict = {}
+        bounded = []
+        for term in self.mapping:
+            if single_char_boundaries and len(term) == 1:
+                bounded.append(r'\b' + re.escape(term) + r'\b')
+                continue
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        alternatives = [p for p in [_trie_pattern(trie)] if p] + bounded
+        self.pattern: Optional[re.Pattern] = re.compile('|'.join(alternatives)) if alternatives else None
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def sub(self, text: str) -> str:
+        """Replace every term in text in one left-to-right pass"""
+        if not text or self.pattern is None:
+            return text
+
+        out = []
+        last = 0
+        for match in self.pattern.finditer(text):
+            start, end = match.span()
+            out.append(text[last:start])
+            if self.spacing:
+                emitted = out[-1] if out[-1] else (out[-2] if len(out) > 1 else '')
+                if emitted and emitted[-1] not in _WHITESPACE:
+                    out.append(' ')
+            out.append(self.mapping[match.group(0)])
+            if self.spacing and end < len(text) and text[end] not in _WHITESPACE:
+                out.append(' ')
+            last = end
+        if not out:
+            return text
+        out.append(text[last:])
+        return ''.join(out)
@@ -3,7 +3,7 @@ Union Arena TCG terminology and icon mappings.
 Centralized storage for all Union Arena-specific card game terminology and alt text mappings.
 """
 
-import re
+from service.mappings.term_matcher import TermMatcher
 
 # ========================
 # UNION ARENA ALT TEXT MAPPINGS
@@ -69,10 +69,28 @@ ALL_MAPPINGS = {
 }
 
 
+def format_alt_text_mapping_for_prompt(indent='  '):
+    """
+    Render ALT_TEXT_MAPPING as prompt lines, e.g. "  'レイド': '[Raid]',".
+    Output only changes when the mapping does, so prompts built from it stay cacheable.
+    
+    Args:
+        indent (str): Prefix for each line
+        
+    Returns:
+        str: One mapping entry per line
+    """
+    return '\n'.join(f"{indent}{jp!r}: {en!r}," for jp, en in ALT_TEXT_MAPPING.items())
+
+
+# Compiled once; every text is then mapped in a single pass
+_MAPPINGS_MATCHER = TermMatcher(ALL_MAPPINGS, spacing=True)
+
+
 def apply_unionarena_mappings(text):
     """
     Apply pre-defined Union Arena mappings to text.
-    Processes from longest to shortest keys to avoid partial replacements.
+    Longest terms win where terms overlap, and replaced text is never rescanned.
     
     Args:
         text (str): Text containing alt text or game terminology
@@ -83,32 +101,4 @@ def apply_unionarena_mappings(text):
     if not text or text.strip() == '-':
         return text
     
-    result = text
-    # Sort by length (longest first) to avoid partial replacements
-    sorted_terms = sorted(ALL_MAPPINGS.keys(), key=len, reverse=True)
-    
-    for jp_term in sorted_terms:
-        english_term = ALL_MAPPINGS[jp_term]
-        
-        # Use word boundaries for matching
-        pattern = re.escape(jp_term)
-        
-        def replace_with_spacing(match):
-            start = match.start()
-            end = match.end()
-            
-            # Add space before if needed
-            space_before = ''
-            if start > 0 and result[start - 1] not in ' \n\t':
-                space_before = ' '
-            
-            # Add space after if needed
-            space_after = ''
-            if end < len(result) and result[end] not in ' \n\t':
-                space_after = ' '
-            
-            return space_before + english_term + space_after
-        
-        result = re.sub(pattern, replace_with_spacing, result)
-    
-    return result
+    return _MAPPINGS_MATCHER.sub(text)
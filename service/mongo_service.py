@@ -44,7 +44,7 @@ class MongoService:
         return collection
 
     def upload_data(self, data, collection_name, backup_before_upload=False):
-        """Upload data to MongoDB collection"""
+        """Upload data to MongoDB collection, returns True if the insert succeeded"""
         try:
             if backup_before_upload:
                 # Backup current MongoDB collection before upload
@@ -59,8 +59,10 @@ class MongoService:
             # Insert new data
             result = collection.insert_many(data)
             print(f"✅ Inserted {len(result.inserted_ids)} documents into MongoDB.")
+            return True
         except Exception as e:
             print(f"❌ MongoDB upload failed: {e}")
+            return False
 
     def backup_collection(self, collection_name):
         """Create backup of MongoDB collection and upload to GCS"""
@@ -253,7 +255,8 @@ class MongoService:
         
         Args:
             collection_name: Name of the collection
-            update_operations: List of dicts with format {'field_name': name, 'field_value': value, 'update_data': data}
+            update_operations: List of dicts with format {'field_name': name, 'field_value': value, 'update_data': data},
+                               optionally with 'filter': {field: value} to narrow the match (e.g. to one package)
             batch_size: Max operations per bulk_write call (default 1000 to avoid memory/timeout issues)
         
         Returns:
@@ -284,7 +287,7 @@ class MongoService:
                     field_value = op['field_value']
                     update_data = op['update_data']
                     
-                    query = {field_name: field_value}
+                    query = {**op.get('filter', {}), field_name: field_value}
                     update = {"$set": update_data}
                     operations.append(UpdateOne(query, update))
                 
@@ -3,29 +3,194 @@ import json
 import requests
 import time
 import re
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from typing import Dict, Any, List, Union
 from dotenv import load_dotenv
 
 from service.mappings.haikyuu_mappings import (
     apply_terminology_mappings,
     apply_cardname_consistency_for_translation,
+    build_cardname_matcher,
 )
+from service.mappings.unionarena_mappings import format_alt_text_mapping_for_prompt
+from service.segment_service import translate_segmented, needs_translation
+from service.json_stream_service import IncrementalJsonParser, parse_json_tolerant
+from service.latency_service import LatencyTracker
+from service.llm_telemetry_service import LLMTelemetry
+from service.llm_cache_service import LLMResponseCache, TranslationCheckpoint, create_cache_store
 load_dotenv()
 
-def batch_data_for_translation(data: List[Dict], batch_size: int = 12) -> List[List[Dict]]:
+# Number of translation batches kept in flight at once
+OPENROUTER_MAX_CONCURRENCY = int(os.getenv('OPENROUTER_MAX_CONCURRENCY', '4'))
+
+# Estimated input tokens of card text per batch. Output is roughly the same size,
+# so this keeps responses well inside max_tokens while filling short-card batches.
+OPENROUTER_BATCH_TOKEN_BUDGET = int(os.getenv('OPENROUTER_BATCH_TOKEN_BUDGET', '1500'))
+
+_CJK_CHARS = re.compile(r'[\u3000-\u30ff\u3400-\u9fff\uff00-\uffef]')
+
+# Stream completions over SSE so a slow reply keeps everything generated before a timeout
+OPENROUTER_STREAM = os.getenv('OPENROUTER_STREAM', '1') not in ('0', 'false', 'no')
+# Seconds allowed between stream chunks, and for the whole streamed reply
+OPENROUTER_READ_TIMEOUT = float(os.getenv('OPENROUTER_READ_TIMEOUT', '30'))
+OPENROUTER_STREAM_DEADLINE = float(os.getenv('OPENROUTER_STREAM_DEADLINE', '120'))
+
+# Comma-separated models tried after OPENROUTER_MODEL, in order
+OPENROUTER_FALLBACK_MODELS = [m.strip() for m in os.getenv('OPENROUTER_FALLBACK_MODELS', '').split(',') if m.strip()]
+# Seconds a request may take before a hedge is sent to the next model. Once a model
+# has enough history its p90 latency is used instead, capped at this budget.
+OPENROUTER_LATENCY_BUDGET = float(os.getenv('OPENROUTER_LATENCY_BUDGET', '60'))
+
+# Ask for schema-constrained JSON output: auto (when the model advertises
+# structured_outputs), on, or off
+OPENROUTER_STRUCTURED_OUTPUT = os.getenv('OPENROUTER_STRUCTURED_OUTPUT', 'auto').lower()
+
+# model id → supported_parameters, fetched once per process from /models
+_MODEL_PARAMETERS: Dict[str, List[str]] = {}
+_MODEL_PARAMETERS_LOCK = threading.Lock()
+
+# One telemetry record per run, shared by every OpenRouterService in the process
+_run_telemetry = None
+_run_telemetry_lock = threading.Lock()
+
+
+def get_run_telemetry() -> LLMTelemetry:
+    """Process-wide LLMTelemetry, whose summary is written once at exit"""
+    global _run_telemetry
+    with _run_telemetry_lock:
+        if _run_telemetry is None:
+            _run_telemetry = LLMTelemetry()
+            atexit.register(_run_telemetry.write)
+        return _run_telemetry
+
+def build_translation_schema(keys: List[str]) -> Dict:
+    """
+    response_format requesting a flat object with exactly the given string keys.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "translations",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {key: {"type": "string"} for key in keys},
+                "required": list(keys),
+                "additionalProperties": False
+            }
+        }
+    }
+
+# Providers that only cache prompt prefixes marked with cache_control breakpoints.
+# OpenAI, DeepSeek, Grok etc. cache identical prefixes automatically.
+CACHE_CONTROL_MODEL_PREFIXES = ('anthropic/', 'google/gemini')
+
+# Static Union Arena instructions. Everything before the Context section is identical
+# for every request, so providers can reuse the cached prefix across batches and series.
+UNIONARENA_SYSTEM_PROMPT = """You are translating trading card game effects.
+
+- This is official card effect text.
+- Translation must sound natural and professional for anime TCGs.
+
+CONTEXT AUTHORITY RULE (CRITICAL):
+- The provided context defines the official canon for names, terminology, and romanization.
+- Use the naming and romanization conventions implied by the context.
+- Do NOT default to literal translation or pinyin/kunrei/hepburn unless the context clearly implies it.
+- If multiple romanizations exist, choose the one most commonly used in official anime/game localizations for this context.
+- Name Mapping Example: 龐煖 should always be romanized as "Hou Ken" (not "Pang Nuan") in the Kingdom context.
+
+STRICT RULES (must follow all):
+1. REMOVE all HTML tags completely (e.g. <dd>, <br>, etc).
+2. For any <img> tag, REPLACE it with its alt text. If the alt value matches the following mapping, use the mapped English tag instead (otherwise, use the alt value in square brackets):
+Alt Text to English Tag Mapping:
+{alt_text_mapping}
+
+If the alt value is not in the mapping, use the alt value in square brackets, e.g. [alt value].
+3. Preserve line breaks where effects are logically separated.
+4. Do NOT add explanations, notes, or commentary.
+5. Do NOT summarize or paraphrase — translate faithfully with TCG-style wording.
+6. Use consistent card-game terminology (e.g. "BP", "AP", "draw a card") and preserve effect headers such as [On Attack], [On Appearance], [When in Front L], [When Removed].
+7. Output ONLY valid JSON.
+8. Preserve the exact key names (item_X_fieldname).
+9. Values must be strings.
+
+The user message is the Input JSON. Reply with the Output JSON only.
+
+Context:
+- Anime/Manga/Game universe: {context}
+- Source language: {source_lang}
+- Target language: {target_lang}
+- Fields to translate: {fields}"""
+
+def build_unionarena_system_prompt(context: str, source_lang: str, target_lang: str, fields_to_translate: List[str]) -> str:
+    """
+    Build the Union Arena system message. Byte-identical for the same arguments.
+    """
+    return UNIONARENA_SYSTEM_PROMPT.format(
+        alt_text_mapping=format_alt_text_mapping_for_prompt(),
+        context=context,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        fields=' | '.join(fields_to_translate)
+    )
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token estimate without a tokenizer dependency.
+    
+    Japanese runs close to one token per character, other text about four
+    characters per token.
+    """
+    if not text:
+        return 0
+    text = str(text)
+    cjk = len(_CJK_CHARS.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+def batch_data_for_translation(data: List[Dict], batch_size: int = 12, token_budget: int = None, fields: List[str] = None) -> List[List[Dict]]:
     """
     Split a list of card data into batches for efficient API processing.
     
     Args:
         data: List of card dicts to batch
-        batch_size: Number of cards per batch (default 12)
+        batch_size: Maximum number of cards per batch (default 12)
+        token_budget: If set, also close a batch once the estimated tokens of its
+                      translatable fields would exceed this budget
+        fields: Fields counted towards the token budget (default: every field)
     
     Returns:
         List of batches (each a list of card dicts)
     """
     if not data:
         return []
-    return [data[i:i+batch_size] for i in range(0, len(data), batch_size)]
+    if not token_budget:
+        return [data[i:i+batch_size] for i in range(0, len(data), batch_size)]
+    
+    def weigh(item):
+        values = [item.get(f) for f in fields] if fields else list(item.values())
+        return sum(estimate_tokens(json.dumps(v, ensure_ascii=False)) for v in values if v)
+    
+    return pack_by_token_budget(data, weigh, token_budget, batch_size)
+
+def pack_by_token_budget(items: List[Any], weigh, token_budget: int, max_items: int) -> List[List[Any]]:
+    """
+    Greedily pack items into batches of at most token_budget estimated tokens
+    and max_items items. An item larger than the budget gets a batch of its own.
+    """
+    batches = []
+    current, current_tokens = [], 0
+    for item in items:
+        tokens = weigh(item)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
 
 def repair_json_string(text: str) -> Dict:
     """
@@ -61,10 +226,12 @@ def repair_json_string(text: str) -> Dict:
     except json.JSONDecodeError:
         pass
     
-    return None
+    # Last attempt: keep every key/value pair that can be read, even from a
+    # cut-off object or one with unescaped quotes inside values
+    return parse_json_tolerant(text) or None
 
 class OpenRouterService:
-    def __init__(self, api_key=None, model=None, site_url=None, site_name=None):
+    def __init__(self, api_key=None, model=None, site_url=None, site_name=None, fallback_models=None, latency_budget=None):
         """
         Initialize OpenRouter service for AI-powered translations
         
@@ -73,6 +240,10 @@ class OpenRouterService:
             model: OpenRouter model to use. If None, will try to get from environment
             site_url: Optional site URL for rankings on openrouter.ai
             site_name: Optional site title for rankings on openrouter.ai
+            fallback_models: Ordered models to hedge/fall back to when the primary is
+                             slow or failing. If None, uses OPENROUTER_FALLBACK_MODELS
+            latency_budget: Seconds before a hedged request goes to the next model.
+                            If None, uses OPENROUTER_LATENCY_BUDGET (60)
         """
         self.api_key = api_key or os.getenv('OPENROUTER_API_KEY')
         if self.api_key:
@@ -100,6 +271,23 @@ class OpenRouterService:
         if site_name:
             self.headers["X-Title"] = site_name
         
+        # Completion cache + batch checkpoints (LLM_CACHE_BACKEND: disk, mongo or none)
+        self.cache_store = create_cache_store()
+        self.response_cache = LLMResponseCache(self.cache_store)
+        
+        # Resolved lazily on the first structured request (see _structured_output_enabled)
+        self.structured_output = None
+        
+        # Primary model first, then fallbacks in order
+        self.fallback_models = [m for m in (fallback_models if fallback_models is not None else OPENROUTER_FALLBACK_MODELS) if m != self.model]
+        self.latency_budget = latency_budget or OPENROUTER_LATENCY_BUDGET
+        self.latency = LatencyTracker(self.cache_store)
+        if self.fallback_models:
+            print(f"✓ Fallback models: {', '.join(self.fallback_models)} (latency budget {self.latency_budget:.0f}s)")
+        
+        # Per-run request telemetry; the summary is written after each translation run and at exit
+        self.telemetry = get_run_telemetry()
+        
     def translate_titles_batch(self, 
                               titles: List[str], 
                               source_lang: str = "Japanese",
@@ -133,8 +321,10 @@ class OpenRouterService:
         
         # Make API request with retries
         for attempt in range(max_retries):
+            if attempt:
+                self.telemetry.record_retry('titles')
             try:
-                response = self._make_request(prompt)
+                response = self._make_request(prompt, use_cache=attempt == 0, operation='titles')
                 
                 if response and 'choices' in response and len(response['choices']) > 0:
                     translated_text = response['choices'][0]['message']['content'].strip()
@@ -157,6 +347,7 @@ class OpenRouterService:
                         
                     except json.JSONDecodeError as e:
                         print(f"Failed to parse translation response: {e}")
+                        self.telemetry.record_parse_failure('titles')
                         if attempt == max_retries - 1:
                             return {
                                 'success': False,
@@ -249,8 +440,10 @@ class OpenRouterService:
         
         # Make API request with retries
         for attempt in range(max_retries):
+            if attempt:
+                self.telemetry.record_retry('fields')
             try:
-                response = self._make_request(prompt)
+                response = self._make_request(prompt, use_cache=attempt == 0, operation='fields')
                 
                 if response and 'choices' in response and len(response['choices']) > 0:
                     translated_text = response['choices'][0]['message']['content'].strip()
@@ -292,6 +485,7 @@ class OpenRouterService:
                         
                     except json.JSONDecodeError as e:
                         print(f"Failed to parse translation response: {e}")
+                        self.telemetry.record_parse_failure('fields')
                         if attempt == max_retries - 1:
                             return {
                                 'success': False,
@@ -330,7 +524,12 @@ class OpenRouterService:
                     keep_original: bool = True,
                     context: str = None,
                     max_retries: int = 3,
-                    batch_size: int = 12) -> Dict:
+                    batch_size: int = 12,
+                    segment_fields: List[str] = None,
+                    max_concurrency: int = None,
+                    on_batch_failure: str = "abort",
+                    run_id: str = None,
+                    token_budget: int = None) -> Dict:
         """
         Translate specified fields in a list of JSON objects using batch processing.
         Splits data into batches and makes multiple API calls if needed.
@@ -342,12 +541,25 @@ class OpenRouterService:
             target_lang: Target language  
             keep_original: If True, keeps original in fieldJP format
             context: Context for translation (e.g., anime/game name)
-            max_retries: Number of retry attempts per batch
-            batch_size: Number of cards per API call (default 12)
+            max_retries: Retry attempts for a single card; larger failing batches are
+                         split in half and retried instead of being resent whole
+            batch_size: Maximum number of cards per API call (default 12)
+            segment_fields: Fields (e.g. ["effect"]) translated per line/keyword segment
+                            through the segment cache instead of as whole strings
+            max_concurrency: Batches in flight at once (default OPENROUTER_MAX_CONCURRENCY env, 4)
+            on_batch_failure: "abort" returns the failed batch's result and cancels pending
+                              batches; "keep_original" keeps the failed batch's items
+                              untranslated, lists them in failed_indices and carries on
+            token_budget: Estimated prompt tokens of card text per batch
+                          (default OPENROUTER_BATCH_TOKEN_BUDGET env, 1500)
+            run_id: Checkpoint id (e.g. "unionarena:UA30BT"). Completed batches are
+                    recorded under it so a rerun only translates the missing ones.
         
         Returns:
             Dict with success status and combined translated data
         """
+        if on_batch_failure not in ("abort", "keep_original"):
+            raise ValueError(f"Unknown on_batch_failure policy: {on_batch_failure}")
         if not data or not fields_to_translate:
             return {
                 'success': True,
@@ -357,47 +569,132 @@ class OpenRouterService:
         if context is None or context.strip() == "":
             raise ValueError("Context for translation (e.g., anime/game name) must be provided and non-empty.")
         
-        # Split data into batches
-        batches = batch_data_for_translation(data, batch_size)
-        print(f"[Batch Processing] Processing {len(data)} cards in {len(batches)} batch(es) (batch size: {batch_size})")
+        segment_fields = [f for f in (segment_fields or []) if f in fields_to_translate]
+        segment_failed = []
+        if segment_fields:
+            data = self._translate_segment_fields_unionarena(
+                data, segment_fields, source_lang, target_lang,
+                keep_original, context, max_retries, batch_size, max_concurrency, run_id,
+                token_budget
+            )
+            # Cards whose segment fields are still Japanese had segments that failed to translate
+            segment_failed = [
+                index for index, item in enumerate(data)
+                if any(isinstance(item.get(field), str) and needs_translation(item[field]) for field in segment_fields)
+            ]
+            if segment_failed:
+                print(f"[Segments] {len(segment_failed)} card(s) left with untranslated {', '.join(segment_fields)}")
+            fields_to_translate = [f for f in fields_to_translate if f not in segment_fields]
+            if not fields_to_translate:
+                success = len(segment_failed) < len(data)
+                return {
+                    'success': success,
+                    'error': None if success else 'No segments could be translated',
+                    'translated_data': data,
+                    'original_data': data,
+                    'fields_translated': segment_fields,
+                    'failed_indices': segment_failed,
+                    'raw_response': None
+                }
+        
+        # Split data into batches sized by estimated prompt tokens, capped at batch_size cards
+        token_budget = token_budget or OPENROUTER_BATCH_TOKEN_BUDGET
+        batches = batch_data_for_translation(data, batch_size, token_budget, fields_to_translate)
+        max_concurrency = max(1, min(max_concurrency or OPENROUTER_MAX_CONCURRENCY, len(batches)))
+        print(f"[Batch Processing] Processing {len(data)} cards in {len(batches)} batch(es) (max {batch_size} cards / ~{token_budget} tokens each, concurrency: {max_concurrency})")
+        
+        checkpoint = TranslationCheckpoint(run_id, self.cache_store) if run_id else None
+        batch_keys = [
+            TranslationCheckpoint.batch_key(batch, fields_to_translate, source_lang, target_lang, keep_original, context, self.model)
+            for batch in batches
+        ]
+        
+        batch_results = [None] * len(batches)
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = {}
+            for batch_idx, batch in enumerate(batches):
+                if checkpoint:
+                    completed = checkpoint.load(batch_keys[batch_idx])
+                    if completed is not None:
+                        print(f"[Batch {batch_idx + 1}/{len(batches)}] ✓ Restored from checkpoint")
+                        batch_results[batch_idx] = {'success': True, 'translated_data': completed}
+                        continue
+                print(f"[Batch {batch_idx + 1}/{len(batches)}] Translating {len(batch)} cards...")
+                future = executor.submit(
+                    self._translate_batch_unionarena_bisecting,
+                    batch,
+                    fields_to_translate,
+                    source_lang,
+                    target_lang,
+                    keep_original,
+                    context,
+                    max_retries
+                )
+                futures[future] = batch_idx
+            
+            for future in as_completed(futures):
+                batch_idx = futures[future]
+                try:
+                    batch_result = future.result()
+                except Exception as e:
+                    batch_result = {
+                        'success': False,
+                        'error': str(e),
+                        'translated_data': batches[batch_idx],
+                        'raw_response': None
+                    }
+                batch_results[batch_idx] = batch_result
+                
+                if not batch_result['success']:
+                    print(f"[Batch {batch_idx + 1}] Failed: {batch_result.get('error', 'Unknown error')}")
+                    if on_batch_failure == "abort":
+                        for pending in futures:
+                            pending.cancel()
+                        return batch_result  # Return failure immediately
+                else:
+                    if checkpoint:
+                        checkpoint.save(batch_keys[batch_idx], batch_result['translated_data'])
+                    print(f"[Batch {batch_idx + 1}] ✓ Completed")
         
+        # Reassemble in input order and combine token usage
         all_translated_data = []
+        failed_indices = []
         total_token_usage = {
             'total_tokens': 0,
             'prompt_tokens': 0,
             'completion_tokens': 0
         }
-        
-        for batch_idx, batch in enumerate(batches, 1):
-            print(f"[Batch {batch_idx}/{len(batches)}] Translating {len(batch)} cards...")
-            
-            # Process this batch
-            batch_result = self._translate_batch_unionarena(
-                batch,
-                fields_to_translate,
-                source_lang,
-                target_lang,
-                keep_original,
-                context,
-                max_retries
-            )
-            
-            if not batch_result['success']:
-                print(f"[Batch {batch_idx}] Failed: {batch_result.get('error', 'Unknown error')}")
-                return batch_result  # Return failure immediately
-            
-            all_translated_data.extend(batch_result['translated_data'])
+        offset = 0
+        for batch, batch_result in zip(batches, batch_results):
+            if batch_result['success']:
+                all_translated_data.extend(batch_result['translated_data'])
+            elif 'failed_indices' in batch_result:
+                # Bisected batch: keep the halves that did translate
+                all_translated_data.extend(batch_result['translated_data'])
+                failed_indices.extend(offset + i for i in batch_result['failed_indices'])
+            else:
+                all_translated_data.extend(batch)
+                failed_indices.extend(range(offset, offset + len(batch)))
+            offset += len(batch)
             
             # Accumulate token usage
             if batch_result.get('token_usage'):
-                total_token_usage['total_tokens'] += batch_result['token_usage'].get('total_tokens', 0)
-                total_token_usage['prompt_tokens'] += batch_result['token_usage'].get('prompt_tokens', 0)
-                total_token_usage['completion_tokens'] += batch_result['token_usage'].get('completion_tokens', 0)
-            
-            print(f"[Batch {batch_idx}] ✓ Completed")
+                total_token_usage['total_tokens'] += batch_result['token_usage'].get('total_tokens') or 0
+                total_token_usage['prompt_tokens'] += batch_result['token_usage'].get('prompt_tokens') or 0
+                total_token_usage['completion_tokens'] += batch_result['token_usage'].get('completion_tokens') or 0
         
-        print(f"\n[Summary] Successfully translated {len(all_translated_data)} cards total")
+        # Everything landed, so the checkpoints for this run are no longer needed
+        if checkpoint and not failed_indices:
+            checkpoint.clear()
+        failed_indices = sorted(set(failed_indices) | set(segment_failed))
+        # Keep per-model latency history for the next run's hedge deadlines
+        self.latency.save()
+        self.telemetry.write()
+        
+        print(f"\n[Summary] Successfully translated {len(all_translated_data) - len(failed_indices)} cards total")
         print(f"[Batches] Processed {len(batches)} batch(es)")
+        if failed_indices:
+            print(f"[Batches] {len(failed_indices)} card(s) left untranslated after batch failures")
         print(f"[Token Usage] Total: {total_token_usage['total_tokens']}, Prompt: {total_token_usage['prompt_tokens']}, Completion: {total_token_usage['completion_tokens']}")
         
         return {
@@ -405,9 +702,142 @@ class OpenRouterService:
             'translated_data': all_translated_data,
             'original_data': data,
             'fields_translated': fields_to_translate,
+            'failed_indices': failed_indices,
+            'token_usage': total_token_usage,
             'raw_response': None
         }
 
+    def _translate_segment_fields_unionarena(self,
+                    data: List[Dict],
+                    segment_fields: List[str],
+                    source_lang: str,
+                    target_lang: str,
+                    keep_original: bool,
+                    context: str,
+                    max_retries: int,
+                    batch_size: int,
+                    max_concurrency: int = None,
+                    run_id: str = None,
+                    token_budget: int = None) -> List[Dict]:
+        """
+        Translate the given fields segment by segment, reusing cached clauses.
+        
+        Only segments missing from the cache are sent to the LLM, as their own
+        batched translate_fields_unionarena call under the same context.
+        
+        Returns:
+            Copies of the input items with the segment fields translated where possible
+        """
+        values = list(dict.fromkeys(
+            item[field]
+            for item in data
+            for field in segment_fields
+            if isinstance(item.get(field), str) and item[field].strip()
+        ))
+        
+        def translate_many(segments: List[str]) -> Dict[str, str]:
+            segment_data = [{'segment': segment} for segment in segments]
+            result = self.translate_fields_unionarena(
+                segment_data, ['segment'], source_lang, target_lang,
+                keep_original=False, context=context,
+                max_retries=max_retries, batch_size=batch_size,
+                max_concurrency=max_concurrency, on_batch_failure="keep_original",
+                token_budget=token_budget,
+                run_id=f"{run_id}:segments" if run_id else None
+            )
+            if not result['success']:
+                return {}
+            # Anything still in Japanese came back untranslated; leave it uncached
+            return {
+                segment: item['segment']
+                for segment, item in zip(segments, result['translated_data'])
+                if isinstance(item.get('segment'), str) and not needs_translation(item['segment'])
+            }
+        
+        translations = translate_segmented(values, translate_many,
+                                           namespace=f"{self.model}:unionarena:{context}:{target_lang}")
+        
+        translated_data = []
+        for item in data:
+            new_item = item.copy()
+            for field in segment_fields:
+                if item.get(field) in translations:
+                    if keep_original:
+                        new_item[f"{field}JP"] = item[field]
+                    new_item[field] = translations[item[field]]
+            translated_data.append(new_item)
+        return translated_data
+
+    def _translate_batch_unionarena_bisecting(self,
+                    data: List[Dict],
+                    fields_to_translate: List[str],
+                    source_lang: str,
+                    target_lang: str,
+                    keep_original: bool,
+                    context: str,
+                    max_retries: int) -> Dict:
+        """
+        Translate a batch, splitting it in half on failure instead of resending it whole.
+        
+        A multi-card batch gets a single attempt, plus one more if the request
+        itself failed (network error, 429). If the response is unusable
+        (malformed, or still missing keys) each half is translated on its own,
+        recursively, so one bad card costs a handful of small calls rather than
+        max_retries full-size ones. A batch whose requests keep failing is not
+        split, since smaller calls would not help. Only single cards get the
+        full max_retries.
+        
+        Returns:
+            Dict in the same shape as _translate_batch_unionarena. On failure,
+            translated_data still holds whatever halves did succeed and
+            failed_indices lists the cards (within this batch) that did not.
+        """
+        attempts = max_retries if len(data) == 1 else 1
+        result = self._translate_batch_unionarena(
+            data, fields_to_translate, source_lang, target_lang, keep_original, context, attempts
+        )
+        if not result['success'] and len(data) > 1 and result.get('error_kind') == 'request':
+            print(f"[Bisect] Batch of {len(data)} request failed ({result.get('error')}), retrying once before giving up")
+            retry = self._translate_batch_unionarena(
+                data, fields_to_translate, source_lang, target_lang, keep_original, context, 1
+            )
+            retry['token_usage'] = {
+                key: (result.get('token_usage') or {}).get(key, 0) + (retry.get('token_usage') or {}).get(key, 0)
+                for key in ('total_tokens', 'prompt_tokens', 'completion_tokens')
+            }
+            result = retry
+        if result['success']:
+            return result
+        if len(data) == 1 or result.get('error_kind') == 'request':
+            return {**result, 'failed_indices': list(range(len(data)))}
+        
+        mid = len(data) // 2
+        print(f"[Bisect] Batch of {len(data)} failed ({result.get('error', 'Unknown error')}), retrying as {mid} + {len(data) - mid}")
+        halves = [
+            self._translate_batch_unionarena_bisecting(
+                half, fields_to_translate, source_lang, target_lang, keep_original, context, max_retries
+            )
+            for half in (data[:mid], data[mid:])
+        ]
+        
+        token_usage = {'total_tokens': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+        for usage in [result.get('token_usage')] + [half.get('token_usage') for half in halves]:
+            for key in token_usage:
+                token_usage[key] += (usage or {}).get(key) or 0
+        
+        failed = [half for half in halves if not half['success']]
+        failed_indices = halves[0].get('failed_indices', []) + [mid + i for i in halves[1].get('failed_indices', [])]
+        return {
+            'success': not failed,
+            'error': failed[0].get('error') if failed else None,
+            'failed_indices': failed_indices,
+            'translated_data': halves[0]['translated_data'] + halves[1]['translated_data'],
+            'original_data': data,
+            'fields_translated': fields_to_translate,
+            'raw_response': None,
+            'token_usage': token_usage
+        }
+
     def _translate_batch_unionarena(self,
                     data: List[Dict],
                     fields_to_translate: List[str],
@@ -453,188 +883,409 @@ class OpenRouterService:
                 'message': 'No content found to translate'
             }
         
-        prompt = f"""
-    You are translating trading card game effects.
-
-    Context:
-    - Anime/Manga/Game universe: {context}
-    - This is official card effect text.
-    - Translation must sound natural and professional for anime TCGs.
-    - Source language: {source_lang}
-    - Target language: {target_lang}
-    - Fields to translate: {' | '.join(fields_to_translate)}
-
-
-    CONTEXT AUTHORITY RULE (CRITICAL):
-    - The provided context defines the official canon for names, terminology, and romanization.
-    - Use the naming and romanization conventions implied by the context.
-    - Do NOT default to literal translation or pinyin/kunrei/hepburn unless the context clearly implies it.
-    - If multiple romanizations exist, choose the one most commonly used in official anime/game localizations for this context.
-    - Name Mapping Example: 龐煖 should always be romanized as "Hou Ken" (not "Pang Nuan") in the Kingdom context.
-
-    STRICT RULES (must follow all):
-    1. REMOVE all HTML tags completely (e.g. <dd>, <br>, etc).
-    2. For any <img> tag, REPLACE it with its alt text. If the alt value matches the following mapping, use the mapped English tag instead (otherwise, use the alt value in square brackets):
-    Alt Text to English Tag Mapping:
-      'インパクト（1）': '[Impact 1]',
-      'インパクト（2）': '[Impact 2]',
-      'インパクト（3）': '[Impact 3]',
-      'インパクト（4）': '[Impact 4]',
-      'インパクト': '[Impact]',
-      '2回ブロック': '[Block x2]',
-      '2回アタック': '[Attack x2]',
-      '狙い撃ち': '[Snipe]',
-      'インパクト（+1）': '[Impact +1]',
-      'ステップ': '[Step]',
-      'ダメージ': '[Damage]',
-      'ダメージ（+1）': '[Damage +1]',
-      'ダメージ（2）': '[Damage 2]',
-      'ダメージ（3）': '[Damage 3]',
-      'ダメージ（4）': '[Damage 4]',
-      'ダメージ（5）': '[Damage 5]',
-      'ダメージ（6）': '[Damage 6]',
-      'ダメージ（7）': '[Damage 7]',
-      'インパクト無効': '[Impact Negate]',
-      'ターン1': '[Once Per Turn]',
-      'レストにする': '[Rest this card]',
-      'このカードを退場させる': '[Retire this card]',
-      '手札を1枚場外に置く': '[Place 1 card from hand to Outside Area]',
-      '手札を2枚場外に置く': '[Place 2 cards from hand to Outside Area]',
-      '手札を3枚場外に置く': '[Place 3 cards from hand to Outside Area]',
-      'フロントLにある場合': '[When In Front Line]',
-      'エナジーLにある場合': '[When In Energy Line]',
-      '場外にある場合': '[When In Outside Area]',
-      '除外エリアにある場合': '[When In Remove Area]',
-      'APを1支払う': '[Pay 1 AP]',
-      'レイド': '[Raid]',
-      '登場時': '[On Play]',
-      '退場時': '[On Retire]',
-      'ブロック時': '[When Blocking]',
-      '起動メイン': '[Activate Main]',
-      'アタック時': '[When Attacking]',
-      '自分のターン中': '[Your Turn]',
-      '相手のターン中': "[Opponent's Turn]",
-      'トリガー': '[Trigger]',
-
-    If the alt value is not in the mapping, use the alt value in square brackets, e.g. [alt value].
-    3. Preserve line breaks where effects are logically separated.
-    4. Do NOT add explanations, notes, or commentary.
-    5. Do NOT summarize or paraphrase — translate faithfully with TCG-style wording.
-    6. Use consistent card-game terminology (e.g. "BP", "AP", "draw a card") and preserve effect headers such as [On Attack], [On Appearance], [When in Front L], [When Removed].
-    7. Output ONLY valid JSON.
-    8. Preserve the exact key names (item_X_fieldname).
-    9. Values must be strings.
-
-    Input JSON:
-    {json.dumps(all_translations, ensure_ascii=False, indent=2)}
-
-    Output JSON:
-    """
-
+        system_prompt = build_unionarena_system_prompt(context, source_lang, target_lang, fields_to_translate)
+        
+        # Keys received so far. A reply that stops early (timeout or max_tokens) keeps
+        # its complete pairs and only the missing keys are requested again.
+        translated_dict = {}
+        token_usage = {'total_tokens': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+        translated_text = None
+        last_error = 'Max retries exceeded'
+        # 'request' when the call itself failed (network, 429), 'response' when the reply was unusable
+        last_error_kind = 'request'
         
         # Make API request with retries
-        for attempt in range(max_retries):
+        attempt = 0
+        requests_made = 0
+        while attempt < max_retries:
+            pending = {key: value for key, value in all_translations.items() if key not in translated_dict}
+            prompt = json.dumps(pending, ensure_ascii=False, indent=2)
+            if requests_made:
+                self.telemetry.record_retry('unionarena')
+            requests_made += 1
             try:
-                response = self._make_request(prompt)
+                response = self._make_request(prompt, use_cache=attempt == 0, system_prompt=system_prompt,
+                                              response_keys=list(pending), operation='unionarena')
                 # Track token usage if available
                 usage_info = response.get('usage', {}) if response else {}
                 total_tokens = usage_info.get('total_tokens')
                 prompt_tokens = usage_info.get('prompt_tokens')
                 completion_tokens = usage_info.get('completion_tokens')
+                cached_tokens = (usage_info.get('prompt_tokens_details') or {}).get('cached_tokens')
                 if total_tokens is not None:
-                    print(f"[OpenRouter] Token usage: total={total_tokens}, prompt={prompt_tokens}, completion={completion_tokens}")
+                    print(f"[OpenRouter] Token usage: total={total_tokens}, prompt={prompt_tokens} (cached={cached_tokens or 0}), completion={completion_tokens}")
+                for key in token_usage:
+                    token_usage[key] += usage_info.get(key) or 0
                 
                 if response and 'choices' in response and len(response['choices']) > 0:
                     translated_text = response['choices'][0]['message']['content'].strip()
+                    finish_reason = response['choices'][0].get('finish_reason')
                     # Clean up response
                     if translated_text.startswith('```json'):
                         translated_text = translated_text.replace('```json', '').replace('```', '')
                     elif translated_text.startswith('```'):
                         translated_text = translated_text.replace('```', '')
-                    try:
-                        translated_dict = repair_json_string(translated_text.strip())
-                        
-                        if translated_dict is None:
-                            raise json.JSONDecodeError("Could not repair JSON", translated_text, 0)
-                        
-                        # Apply translations back to original data
-                        translated_data = []
-                        for i, item in enumerate(data):
-                            new_item = item.copy()
-                            for field in fields_to_translate:
-                                key = f"item_{i}_{field}"
-                                if key in translated_dict:
-                                    # Backup original if requested
-                                    if keep_original and field in item:
-                                        new_item[f"{field}JP"] = item[field]
-                                    # Set translated value
-                                    new_item[field] = translated_dict[key]
-                            translated_data.append(new_item)
-                        print(f"✓ Successfully translated {len(all_translations)} fields across {len(data)} objects")
-                        return {
-                            'success': True,
-                            'translated_data': translated_data,
-                            'original_data': data,
-                            'fields_translated': fields_to_translate,
-                            'raw_response': translated_text,
-                            'token_usage': usage_info
-                        }
-                    except json.JSONDecodeError as e:
-                        print(f"Failed to parse translation response: {e}")
-                        if attempt == max_retries - 1:
-                            return {
-                                'success': False,
-                                'error': f'JSON parse error: {e}',
-                                'translated_data': data,  # Return original on failure
-                                'raw_response': translated_text,
-                                'token_usage': usage_info
-                            }
+                    
+                    parsed = response.get('parsed_pairs') or repair_json_string(translated_text.strip()) or {}
+                    received = {key: value for key, value in parsed.items() if key in pending}
+                    translated_dict.update(received)
+                    
+                    if len(translated_dict) == len(all_translations):
+                        break
+                    if received:
+                        # Progress made, so this doesn't count as a failed attempt
+                        print(f"[Partial] Received {len(received)}/{len(pending)} keys ({finish_reason}), re-requesting the remaining {len(pending) - len(received)}")
+                        continue
+                    last_error = f"JSON parse error: no usable keys in response ({finish_reason})"
+                    last_error_kind = 'response'
+                    print(f"Failed to parse translation response: {last_error}")
+                    self.telemetry.record_parse_failure('unionarena')
                 else:
+                    last_error = 'Invalid response from OpenRouter'
+                    last_error_kind = 'response'
                     print(f"Invalid response from OpenRouter: {response}")
             except Exception as e:
+                last_error = str(e)
+                last_error_kind = 'request'
                 print(f"Translation attempt {attempt + 1} failed: {e}")
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)
-                else:
-                    return {
-                        'success': False,
-                        'error': str(e),
-                        'translated_data': data,  # Return original on failure
-                        'raw_response': None,
-                        'token_usage': None
-                    }
+            attempt += 1
+        
+        # A multi-card batch must come back whole so the caller can split it otherwise;
+        # a single card keeps whichever of its fields did translate
+        missing = len(all_translations) - len(translated_dict)
+        if not translated_dict or (missing and len(data) > 1):
+            return {
+                'success': False,
+                'error': last_error if not translated_dict else f"Incomplete response ({missing}/{len(all_translations)} keys missing)",
+                'error_kind': last_error_kind if not translated_dict else 'response',
+                'translated_data': data,  # Return original on failure
+                'raw_response': translated_text,
+                'token_usage': token_usage
+            }
         
+        # Apply translations back to original data
+        translated_data = []
+        for i, item in enumerate(data):
+            new_item = item.copy()
+            for field in fields_to_translate:
+                key = f"item_{i}_{field}"
+                if key in translated_dict:
+                    # Backup original if requested
+                    if keep_original and field in item:
+                        new_item[f"{field}JP"] = item[field]
+                    # Set translated value
+                    new_item[field] = translated_dict[key]
+            translated_data.append(new_item)
+        print(f"✓ Successfully translated {len(translated_dict)} fields across {len(data)} objects")
         return {
-            'success': False,
-            'error': 'Max retries exceeded',
-            'translated_data': data,
-            'raw_response': None
+            'success': True,
+            'translated_data': translated_data,
+            'original_data': data,
+            'fields_translated': fields_to_translate,
+            'raw_response': translated_text,
+            'token_usage': token_usage
         }
 
-    def _make_request(self, prompt: str) -> Dict:
+    def _make_request(self, prompt: str, use_cache: bool = True, system_prompt: str = None, response_keys: List[str] = None, operation: str = 'request') -> Dict:
         """
         Make request to OpenRouter API
+        
+        Args:
+            prompt: User prompt
+            use_cache: Serve from / store to the response cache. Retries pass False
+                       so a cached response that failed to parse gets refreshed.
+            system_prompt: Optional static instructions, sent first so the provider
+                           can cache them as a prompt prefix
+            response_keys: Keys the reply must contain. If the model supports
+                           structured outputs, the reply is constrained to a JSON
+                           object with exactly these string fields.
+            operation: Telemetry label for the request (e.g. "unionarena")
         """
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, self._system_message(system_prompt))
         payload = {
             "model": self.model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
+            "messages": messages,
             "max_tokens": 4500,
             "temperature": 0.1  # Low temperature for consistent translations
         }
         
+        if response_keys and self._structured_output_enabled():
+            payload["response_format"] = build_translation_schema(response_keys)
+            # Only route to providers that honor response_format
+            payload["provider"] = {"require_parameters": True}
+            try:
+                return self._post_completion(payload, use_cache=use_cache, parse_json=True, operation=operation)
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 400:
+                    raise
+                # Provider rejected the schema; fall back to free-form JSON for this run
+                print(f"⚠️ Structured output rejected for {self.model}, falling back to prompt-only JSON")
+                self.structured_output = False
+                del payload["response_format"]
+                del payload["provider"]
+        
+        return self._post_completion(payload, use_cache=use_cache, parse_json=bool(response_keys), operation=operation)
+    
+    def _structured_output_enabled(self) -> bool:
+        """
+        Whether to send response_format, per OPENROUTER_STRUCTURED_OUTPUT and the
+        model's supported_parameters on OpenRouter
+        """
+        if self.structured_output is None:
+            if OPENROUTER_STRUCTURED_OUTPUT in ('on', 'off'):
+                self.structured_output = OPENROUTER_STRUCTURED_OUTPUT == 'on'
+            else:
+                self.structured_output = 'structured_outputs' in self._get_model_parameters()
+            print(f"[OpenRouter] Structured output {'enabled' if self.structured_output else 'disabled'} for {self.model}")
+        return self.structured_output
+    
+    def _get_model_parameters(self, model: str = None) -> List[str]:
+        """supported_parameters for a model (default self.model), or [] if the model list is unavailable"""
+        with _MODEL_PARAMETERS_LOCK:
+            if not _MODEL_PARAMETERS:
+                try:
+                    response = requests.get(f"{self.base_url}/models", headers=self.headers, timeout=15)
+                    response.raise_for_status()
+                    for entry in response.json().get('data', []):
+                        _MODEL_PARAMETERS[entry.get('id')] = entry.get('supported_parameters') or []
+                except Exception as e:
+                    print(f"⚠️ Could not fetch OpenRouter model list: {e}")
+                    return []
+            return _MODEL_PARAMETERS.get(model or self.model, [])
+    
+    def _system_message(self, content: str) -> Dict:
+        """
+        System message for a static prompt prefix, with a cache_control breakpoint
+        for providers that need one to cache it
+        """
+        if self.model.startswith(CACHE_CONTROL_MODEL_PREFIXES):
+            return {
+                "role": "system",
+                "content": [
+                    {"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}
+                ]
+            }
+        return {"role": "system", "content": content}
+    
+    def _post_completion(self, payload: Dict, use_cache: bool = True, parse_json: bool = False, operation: str = 'request') -> Dict:
+        """
+        POST a chat completion payload, going through the response cache
+        
+        Args:
+            payload: Chat completion request body
+            use_cache: Serve from / store to the response cache
+            parse_json: The reply is a JSON object; when streaming, its complete
+                        key/value pairs are returned under 'parsed_pairs'
+            operation: Telemetry label for the request
+        """
+        if use_cache:
+            cached = self.response_cache.get(payload)
+            if cached is not None:
+                print(f"[OpenRouter] Cache hit for {payload['model']}")
+                self.telemetry.record_request(operation, payload['model'], 0.0, 'cache_hit')
+                return cached
+        
+        result = self._hedged_completion(payload, parse_json, operation)
+        
+        # Only cache complete answers; truncated, timed-out or empty ones should be re-asked
+        choices = result.get('choices') or []
+        if choices and choices[0].get('finish_reason') not in ('length', 'timeout') and choices[0].get('message', {}).get('content'):
+            self.response_cache.set(payload, result)
+        return result
+    
+    def _hedged_completion(self, payload: Dict, parse_json: bool = False, operation: str = 'request') -> Dict:
+        """
+        Send a completion, hedging to the fallback models when the current one is slow.
+        
+        Each model gets until its deadline (p90 of its recorded latency, capped at
+        latency_budget) before the same request is also sent to the next model.
+        A model that errors out hands over immediately. The first complete reply
+        wins and the streams still running are cancelled. If nothing completes,
+        the best partial reply is returned, or the last error raised.
+        
+        Only streamed requests are hedged: a blocking POST can't be cancelled, so
+        the losing side would keep running (and billing) after the winner returns.
+        Without streaming the fallback models are tried in turn, only after an error.
+        """
+        if not self.fallback_models:
+            return self._send_completion(payload, parse_json, operation=operation)
+        
+        models = [payload['model']] + [m for m in self.fallback_models if m != payload['model']]
+        if not OPENROUTER_STREAM:
+            for index, model in enumerate(models):
+                try:
+                    return self._send_completion(self._payload_for_model(payload, model), parse_json, operation=operation)
+                except Exception as e:
+                    if index == len(models) - 1:
+                        raise
+                    print(f"[Fallback] {model} failed ({e}), trying {models[index + 1]}")
+        
+        cancel = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(models))
+        futures = {}
+        partial = None
+        last_error = None
+        try:
+            for index, model in enumerate(models):
+                if index > 0:
+                    print(f"[Hedge] Sending duplicate request to {model}")
+                futures[executor.submit(self._send_completion, self._payload_for_model(payload, model), parse_json, cancel, operation)] = model
+                
+                deadline = time.monotonic() + self._hedge_deadline(model)
+                is_last = index == len(models) - 1
+                while futures:
+                    timeout = None if is_last else max(0, deadline - time.monotonic())
+                    done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+                    if not done:
+                        break  # Deadline passed: hedge with the next model
+                    for future in done:
+                        model_done = futures.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            last_error = e
+                            print(f"[Hedge] {model_done} failed: {e}")
+                            continue
+                        choice = (result.get('choices') or [{}])[0]
+                        if choice.get('message', {}).get('content') and choice.get('finish_reason') not in ('length', 'timeout'):
+                            if model_done != payload['model']:
+                                print(f"[Hedge] Using reply from {model_done}")
+                            return result
+                        partial = partial or result
+                    if not futures and not is_last:
+                        break  # Everything in flight failed: move on to the next model now
+            if partial is not None:
+                return partial
+            raise last_error or requests.RequestException("No model returned a completion")
+        finally:
+            cancel.set()
+            executor.shutdown(wait=False)
+    
+    def _hedge_deadline(self, model: str) -> float:
+        p90 = self.latency.percentile(model, 90)
+        return min(self.latency_budget, p90) if p90 else self.latency_budget
+    
+    def _payload_for_model(self, payload: Dict, model: str) -> Dict:
+        """Copy of payload for another model, dropping response_format if it can't honor it"""
+        if model == payload['model']:
+            return payload
+        payload = {**payload, 'model': model}
+        if 'response_format' in payload and 'structured_outputs' not in self._get_model_parameters(model):
+            payload.pop('response_format')
+            payload.pop('provider', None)
+        return payload
+    
+    def _send_completion(self, payload: Dict, parse_json: bool = False, cancel: threading.Event = None, operation: str = 'request') -> Dict:
+        """
+        One network round trip (streamed or not), recording its latency per model
+        and the request in the run telemetry
+        """
+        # Ask OpenRouter to report cost in usage (sent only, so cache keys are unaffected)
+        body = {**payload, 'usage': {'include': True}}
+        started = time.monotonic()
+        try:
+            if OPENROUTER_STREAM:
+                result = self._stream_completion(body, parse_json, cancel)
+            else:
+                response = requests.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=self.headers,
+                    json=body,
+                    timeout=OPENROUTER_READ_TIMEOUT
+                )
+                response.raise_for_status()
+                result = response.json()
+        except Exception:
+            cancelled = cancel is not None and cancel.is_set()
+            self.telemetry.record_request(operation, payload['model'], time.monotonic() - started, 'cancelled' if cancelled else 'error')
+            raise
+        elapsed = time.monotonic() - started
+        
+        if cancel is not None and cancel.is_set():
+            # Finished after the other side of a hedge won, not a real latency
+            self.telemetry.record_request(operation, payload['model'], elapsed, 'cancelled', result.get('usage'))
+            return result
+        
+        finish_reason = (result.get('choices') or [{}])[0].get('finish_reason')
+        status = 'partial' if finish_reason in ('length', 'timeout') else 'ok'
+        self.telemetry.record_request(operation, payload['model'], elapsed, status, result.get('usage'))
+        self.latency.record(payload['model'], elapsed)
+        return result
+    
+    def _stream_completion(self, payload: Dict, parse_json: bool = False, cancel: threading.Event = None) -> Dict:
+        """
+        Stream a completion over SSE and assemble it into the non-streaming response shape.
+        
+        If the stream stalls or runs past OPENROUTER_STREAM_DEADLINE after some content
+        has arrived, the partial reply is returned with finish_reason 'timeout' instead
+        of raising, so callers can keep what was generated and ask only for the rest.
+        Setting cancel stops reading (used to drop the losing side of a hedge).
+        """
+        parser = IncrementalJsonParser() if parse_json else None
+        content = []
+        finish_reason = None
+        usage = {}
+        model = payload.get('model')
+        deadline = time.monotonic() + OPENROUTER_STREAM_DEADLINE
+        
         response = requests.post(
             f"{self.base_url}/chat/completions",
             headers=self.headers,
-            json=payload,
-            timeout=30
+            json={**payload, "stream": True},
+            timeout=(10, OPENROUTER_READ_TIMEOUT),
+            stream=True
         )
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if cancel is not None and cancel.is_set():
+                    break
+                if time.monotonic() > deadline:
+                    raise requests.Timeout(f"stream exceeded {OPENROUTER_STREAM_DEADLINE:.0f}s")
+                # Skip keep-alive comments (": OPENROUTER PROCESSING") and blank lines
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    break
+                chunk = json.loads(data)
+                if chunk.get('error'):
+                    raise requests.RequestException(f"stream error: {chunk['error']}")
+                model = chunk.get('model') or model
+                usage = chunk.get('usage') or usage
+                for choice in chunk.get('choices') or []:
+                    delta = (choice.get('delta') or {}).get('content') or ''
+                    if delta:
+                        content.append(delta)
+                        if parser:
+                            parser.feed(delta)
+                    finish_reason = choice.get('finish_reason') or finish_reason
+        except (requests.RequestException, ValueError) as e:  # stalls, dropped connections, bad chunks
+            if isinstance(e, requests.HTTPError) or not content:
+                raise
+            finish_reason = 'timeout'
+            received = f", {len(parser.result)} complete keys kept" if parser else ""
+            print(f"⏱️ Stream cut off after {len(''.join(content))} chars ({e}){received}")
+        finally:
+            response.close()
         
-        response.raise_for_status()
-        return response.json()
+        result = {
+            'model': model,
+            'choices': [{
+                'message': {'role': 'assistant', 'content': ''.join(content)},
+                'finish_reason': finish_reason
+            }],
+            'usage': usage
+        }
+        if parser:
+            result['parsed_pairs'] = parser.close()
+        return result
 
-    def translate_haikyuu(self, json_file_path: str = None, data: List[Dict] = None, fields_to_translate: List[tuple] = None, output_file_path: str = None, batch_size: int = 20) -> Dict:
+    def translate_haikyuu(self, json_file_path: str = None, data: List[Dict] = None, fields_to_translate: List[tuple] = None, output_file_path: str = None, batch_size: int = 20, segmented: bool = False, run_id: str = None) -> Dict:
         """
         Translate Haikyuu card game data from Japanese to English with consistency checking.
         
@@ -649,7 +1300,13 @@ class OpenRouterService:
             fields_to_translate (list): List of tuples (source_field, target_field) to translate.
                                        Default: [('cardNameJP', 'cardName'), ('effectsJP', 'effects'), ('notesJP', 'notes')]
             output_file_path (str): Path to save the output JSON file. Only used if json_file_path is provided.
-            batch_size (int): Number of translations per API call (default 20)
+            batch_size (int): Maximum translations per API call (default 20). Batches are
+                              also capped by OPENROUTER_BATCH_TOKEN_BUDGET and split in
+                              half when a reply comes back short.
+            segmented (bool): If True, effects/notes are split into line and keyword segments
+                              and only segments missing from the segment cache are sent out
+            run_id (str): Checkpoint id (e.g. "haikyuu:HV-P01"). Completed batches are recorded
+                          under it so a rerun after a failure only translates the missing ones.
         
         Returns:
             dict: Result containing:
@@ -690,6 +1347,9 @@ class OpenRouterService:
             print("HAIKYUU CARD TRANSLATION - WITH CONSISTENCY CHECKING")
             print("=" * 80)
             
+            checkpoint = TranslationCheckpoint(run_id, self.cache_store) if run_id else None
+            all_batches_complete = True
+            
             # ========================
             # STAGE 1: Translate cardNames
             # ========================
@@ -711,21 +1371,11 @@ class OpenRouterService:
                     print(f"Found {len(cardname_jp_values)} unique cardNameJP values")
                     
                     # Translate cardNameJP values in batches
-                    for batch_start in range(0, len(cardname_jp_values), batch_size):
-                        batch_end = min(batch_start + batch_size, len(cardname_jp_values))
-                        batch_texts = cardname_jp_values[batch_start:batch_end]
-                        
-                        try:
-                            print(f"  [{batch_start + 1}/{len(cardname_jp_values)}] Translating batch of {len(batch_texts)} cardNames...")
-                            translations = self._translate_batch_haikyuu(batch_texts)
-                            
-                            for i, original_value in enumerate(batch_texts):
-                                if i < len(translations):
-                                    cardname_translation_map[original_value] = translations[i]
-                                    print(f"    ✓ {original_value} → {translations[i]}")
-                        except Exception as e:
-                            print(f"  ⚠️  Warning: Failed to translate batch: {str(e)}")
-                            continue
+                    cardname_translation_map = self._translate_texts_haikyuu(cardname_jp_values, batch_size, checkpoint)
+                    for original_value, translation in cardname_translation_map.items():
+                        print(f"    ✓ {original_value} → {translation}")
+                    if len(cardname_translation_map) < len(cardname_jp_values):
+                        all_batches_complete = False
                     
                     # Apply cardName translations
                     for card in card_data:
@@ -764,12 +1414,13 @@ class OpenRouterService:
                 # Create mapping from treated (with English cardNames) -> original
                 treated_to_original = {}
                 treated_values = []
+                cardname_matcher = build_cardname_matcher(cardname_translation_map)
                 
                 for original_value in jp_values:
                     # Apply cardName consistency for translation (creates a modified copy)
                     treated_value = apply_cardname_consistency_for_translation(
                         original_value,
-                        cardname_translation_map
+                        cardname_matcher
                     )
                     treated_values.append(treated_value)
                     treated_to_original[treated_value] = original_value
@@ -779,24 +1430,22 @@ class OpenRouterService:
                     print(f"    (applying cardName consistency for translation purposes only)")
                 
                 # Translate treated values in batches
-                translation_map = {}
-                for batch_start in range(0, len(treated_values), batch_size):
-                    batch_end = min(batch_start + batch_size, len(treated_values))
-                    batch_texts = treated_values[batch_start:batch_end]
-                    
-                    try:
-                        print(f"  [{batch_start + 1}/{len(treated_values)}] Translating batch of {len(batch_texts)} items...")
-                        translations = self._translate_batch_haikyuu(batch_texts)
-                        
-                        for i, treated_value in enumerate(batch_texts):
-                            if i < len(translations):
-                                # Store mapping from ORIGINAL value to translation
-                                original_value = treated_to_original[treated_value]
-                                translation_map[original_value] = translations[i]
-                                print(f"    ✓ Translated")
-                    except Exception as e:
-                        print(f"  ⚠️  Warning: Failed to translate batch: {str(e)}")
-                        continue
+                if segmented:
+                    treated_translations = translate_segmented(
+                        treated_values,
+                        lambda segments: self._translate_texts_haikyuu(segments, batch_size, checkpoint),
+                        namespace=f"{self.model}:haikyuu"
+                    )
+                else:
+                    treated_translations = self._translate_texts_haikyuu(treated_values, batch_size, checkpoint)
+                if len(treated_translations) < len(treated_values):
+                    all_batches_complete = False
+                
+                # Store mapping from ORIGINAL value to translation
+                translation_map = {
+                    treated_to_original[treated_value]: translation
+                    for treated_value, translation in treated_translations.items()
+                }
                 
                 # Apply translations to cards
                 for card in card_data:
@@ -810,6 +1459,12 @@ class OpenRouterService:
                 all_translation_maps[source_field] = translation_map
                 print(f"✓ {source_field} translated: {len(translation_map)} unique values")
             
+            # Every batch landed, so this run's checkpoints are no longer needed
+            if checkpoint and all_batches_complete:
+                checkpoint.clear()
+            self.latency.save()
+            self.telemetry.write()
+            
             # ========================
             # STAGE 3: Save output (if file-based)
             # ========================
@@ -852,6 +1507,81 @@ class OpenRouterService:
             traceback.print_exc()
             return {'success': False, 'error': error_msg}
 
+    def _translate_texts_haikyuu(self, texts: List[str], batch_size: int, checkpoint: TranslationCheckpoint = None, token_budget: int = None) -> Dict[str, str]:
+        """
+        Translate texts in token-budgeted batches via _translate_batch_haikyuu.
+        
+        Args:
+            texts (list): Texts to translate
+            batch_size (int): Maximum texts per API call
+            checkpoint (TranslationCheckpoint): Optional checkpoint to restore/record complete batches
+            token_budget (int): Estimated prompt tokens per call (default OPENROUTER_BATCH_TOKEN_BUDGET env)
+        
+        Returns:
+            dict: text → translation. Texts that failed even on their own are left out.
+        """
+        token_budget = token_budget or OPENROUTER_BATCH_TOKEN_BUDGET
+        batches = pack_by_token_budget(texts, estimate_tokens, token_budget, batch_size)
+        
+        translation_map = {}
+        done = 0
+        for batch_texts in batches:
+            batch_key = TranslationCheckpoint.batch_key(batch_texts, self.model)
+            translations = checkpoint.load(batch_key) if checkpoint else None
+            if translations is not None:
+                print(f"  [{done + 1}/{len(texts)}] ✓ Restored batch of {len(batch_texts)} items from checkpoint")
+            else:
+                print(f"  [{done + 1}/{len(texts)}] Translating batch of {len(batch_texts)} items...")
+                translations = self._translate_batch_haikyuu_bisecting(batch_texts)
+                if checkpoint and None not in translations:
+                    checkpoint.save(batch_key, translations)
+            
+            for text, translation in zip(batch_texts, translations):
+                if translation is not None:
+                    translation_map[text] = translation
+            print(f"    ✓ Translated {sum(t is not None for t in translations)}/{len(batch_texts)}")
+            done += len(batch_texts)
+        return translation_map
+
+    def _translate_batch_haikyuu_bisecting(self, texts: List[str]) -> List[str]:
+        """
+        Translate a batch, asking again only for what a short reply left out.
+        
+        If the reply stops early (e.g. a stream timeout) its leading translations
+        are kept and only the remaining texts are re-requested. A reply with
+        nothing usable is split in half instead. A request that fails outright
+        (network error, 429, 5xx) is retried once after a pause and never split,
+        since smaller calls would not help.
+        
+        Returns:
+            list: Translations aligned with texts, None where a text still failed
+        """
+        max_attempts = 2
+        for attempt in range(max_attempts):
+            try:
+                translations = self._translate_batch_haikyuu(texts)
+                break
+            except Exception as e:
+                print(f"  ⚠️  Warning: Failed to translate batch of {len(texts)} (attempt {attempt + 1}/{max_attempts}): {str(e)}")
+                if attempt == max_attempts - 1:
+                    return [None] * len(texts)
+                self.telemetry.record_retry('haikyuu')
+                time.sleep(2 ** (attempt + 1))
+        
+        if len(translations) >= len(texts):
+            return translations[:len(texts)]
+        if translations:
+            print(f"  [Partial] Got {len(translations)}/{len(texts)} translations, requesting the remaining {len(texts) - len(translations)}")
+            self.telemetry.record_retry('haikyuu')
+            return translations + self._translate_batch_haikyuu_bisecting(texts[len(translations):])
+        if len(texts) == 1:
+            return [None]
+        
+        self.telemetry.record_retry('haikyuu')
+        mid = len(texts) // 2
+        print(f"  [Bisect] No usable translations for {len(texts)} texts, retrying as {mid} + {len(texts) - mid}")
+        return self._translate_batch_haikyuu_bisecting(texts[:mid]) + self._translate_batch_haikyuu_bisecting(texts[mid:])
+
     def _translate_batch_haikyuu(self, texts: List[str]) -> List[str]:
         """
         Translate a batch of Japanese Haikyuu card texts to English.
@@ -885,10 +1615,7 @@ re-translating, and no substituting a different but similar-sounding term."""
         payload = {
             "model": self.model,
             "messages": [
-                {
-                    "role": "system",
-                    "content": system_prompt
-                },
+                self._system_message(system_prompt),
                 {
                     "role": "user",
                     "content": f"""Translate these {len(texts)} Japanese card texts to English.
@@ -904,14 +1631,7 @@ Leave any [Bracketed Tag] exactly as given — do not translate or reword it.
         }
         
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            result = response.json()
+            result = self._post_completion(payload, operation='haikyuu')
             response_text = result['choices'][0]['message']['content'].strip()
             
             # Parse the numbered translations - handle multi-line translations
@@ -925,6 +1645,8 @@ Leave any [Bracketed Tag] exactly as given — do not translate or reword it.
             pattern = r'^(\d+)\.\s+'
             
             lines = response_text.split('\n')
+            numbered = []
+            current_number = None
             current_translation = None
             
             for line in lines:
@@ -933,9 +1655,10 @@ Leave any [Bracketed Tag] exactly as given — do not translate or reword it.
                     # This line starts a new numbered item
                     # Save the previous translation if it exists
                     if current_translation is not None:
-                        translations.append(current_translation.strip())
+                        numbered.append((current_number, current_translation.strip()))
                     
                     # Start the new translation (remove the number and period)
+                    current_number = int(match.group(1))
                     current_translation = line[match.end():]
                 elif current_translation is not None:
                     # This is a continuation of the current translation
@@ -946,7 +1669,23 @@ Leave any [Bracketed Tag] exactly as given — do not translate or reword it.
             
             # Don't forget to add the last translation
             if current_translation is not None:
-                translations.append(current_translation.strip())
+                numbered.append((current_number, current_translation.strip()))
+            
+            # Only trust the run numbered 1, 2, 3... from the start; after a skipped
+            # or repeated number the positions no longer line up with the input
+            for number, translation in numbered:
+                if number != len(translations) + 1:
+                    break
+                translations.append(translation)
+            
+            # A reply cut off (max_tokens or stream timeout) ends mid-sentence, so its last item is unusable
+            if result['choices'][0].get('finish_reason') in ('length', 'timeout') and translations:
+                translations.pop()
+            
+            # Don't replay an incomplete answer from the cache next time
+            if len(translations) < len(texts):
+                self.response_cache.invalidate(payload)
+                self.telemetry.record_parse_failure('haikyuu')
             
             return translations
         except Exception as e:
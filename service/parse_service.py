@@ -0,0 +1,149 @@
+"""
+Shared HTML parsing for the scrapers.
+
+parse_html builds a BeautifulSoup tree with lxml (several times faster than
+html.parser) when it is installed, optionally keeping only the elements a
+scraper reads (e.g. only "dl.modalCol" on a One Piece card list), and
+remembers the tree per response so a page parsed for its cards isn't parsed
+again for its pagination links.
+"""
+
+import os
+import re
+import threading
+import weakref
+from typing import Iterable, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml (default, falls back to html.parser when missing) or html.parser
+HTML_PARSER = os.getenv('HTML_PARSER', 'lxml')
+
+_parser = None
+_parser_lock = threading.Lock()
+# Parsed trees per response object, dropped together with the response
+_tree_cache = weakref.WeakKeyDictionary()
+_tree_cache_lock = threading.Lock()
+
+
+def default_parser() -> str:
+    """HTML_PARSER if its library is installed, otherwise html.parser"""
+    global _parser
+    with _parser_lock:
+        if _parser is None:
+            _parser = HTML_PARSER
+            if _parser == 'lxml':
+                try:
+                    import lxml  # noqa: F401
+                except ImportError:
+                    print("⚠️ lxml is not installed, parsing with html.parser")
+                    _parser = 'html.parser'
+        return _parser
+
+
+def _class_pattern(classes) -> re.Pattern:
+    # While parsing, class is still the raw attribute string ("indexItemBox cf"), so match whole words
+    return re.compile(r'(?:^|\s)(?:' + '|'.join(re.escape(c) for c in classes) + r')(?:\s|$)')
+
+
+def strainer(only: Union[str, Iterable[str], SoupStrainer, None]) -> Optional[SoupStrainer]:
+    """
+    SoupStrainer for simple "tag.class" targets
+
+    Args:
+        only: "tag", "tag.class" or ".class", a list of those, or a SoupStrainer.
+              Several targets are combined by class when they all have one,
+              otherwise by tag name, so the parsed tree may be a superset the
+              caller still filters.
+
+    Returns:
+        SoupStrainer, or None to parse the whole document
+    """
+    if only is None or isinstance(only, SoupStrainer):
+        return only
+    targets = [only] if isinstance(only, str) else list(only)
+    parsed = [(target.partition('.')[0] or None, target.partition('.')[2] or None) for target in targets]
+    if len(parsed) == 1:
+        name, css_class = parsed[0]
+        return SoupStrainer(name, class_=_class_pattern([css_class])) if css_class else SoupStrainer(name)
+    if all(css_class for _, css_class in parsed):
+        return SoupStrainer(class_=_class_pattern([css_class for _, css_class in parsed]))
+    if all(name for name, _ in parsed):
+        return SoupStrainer([name for name, _ in parsed])
+    raise ValueError(f"Combine targets that all have a class or all have a tag name: {targets}")
+
+
+def _content(source) -> Union[str, bytes]:
+    # Responses hand over bytes so the parser can honour the page's <meta charset>,
+    # unless the caller already fixed the encoding
+    if hasattr(source, 'content') and hasattr(source, 'encoding'):
+        return source.text if source.encoding and source.encoding.lower() != 'iso-8859-1' else source.content
+    if isinstance(source, dict):
+        return source.get('content') or source.get('data') or ''
+    return source
+
+
+def parse_html(source, only: Union[str, Iterable[str], SoupStrainer, None] = None,
+               parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse a page into BeautifulSoup
+
+    Args:
+        source: HTML text or bytes, a requests Response (its tree is cached, so
+                parsing the same response again with the same arguments is free)
+                or an ApiService result dict
+        only: Elements to keep, see strainer()
+        parser: BeautifulSoup parser (default: lxml when installed)
+
+    Returns:
+        BeautifulSoup tree. A cached tree is shared, so don't modify it in place.
+    """
+    parser = parser or default_parser()
+    key = (parser, repr(only))
+    cacheable = hasattr(source, 'content') and hasattr(source, 'encoding')
+    if cacheable:
+        with _tree_cache_lock:
+            tree = _tree_cache.get(source, {}).get(key)
+        if tree is not None:
+            return tree
+
+    tree = BeautifulSoup(_content(source), parser, parse_only=strainer(only))
+
+    if cacheable:
+        with _tree_cache_lock:
+            _tree_cache.setdefault(source, {})[key] = tree
+    return tree
+
+
+def parse_lxml(source):
+    """
+    Parse a page into an lxml.html tree (for compiled extractors, see extract_service)
+
+    Args:
+        source: HTML text or bytes, a requests Response (tree cached like parse_html)
+                or an ApiService result dict
+
+    Returns:
+        Root lxml.html element
+    """
+    import lxml.html
+    from bs4.dammit import UnicodeDammit
+
+    cacheable = hasattr(source, 'content') and hasattr(source, 'encoding')
+    if cacheable:
+        with _tree_cache_lock:
+            tree = _tree_cache.get(source, {}).get('lxml.html')
+        if tree is not None:
+            return tree
+
+    content = _content(source)
+    if isinstance(content, bytes):
+        # Same charset detection BeautifulSoup uses (BOM, <meta charset>, then guessing)
+        content = UnicodeDammit(content, is_html=True).unicode_markup
+    tree = lxml.html.document_fromstring(content or '<html></html>')
+
+    if cacheable:
+        with _tree_cache_lock:
+            _tree_cache.setdefault(source, {})['lxml.html'] = tree
+    return tree
+
@@ -0,0 +1,179 @@
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter with adaptive backoff.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. When the
+    remote side throttles us (HTTP 429 and similar), `penalize()` halves the
+    current rate and pauses all callers; every successful call nudges the rate
+    back up towards `max_rate` via `reward()`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 min_rate: float = 0.2, max_rate: Optional[float] = None,
+                 increase_step: float = 0.05):
+        """
+        Initialize the token bucket
+
+        Args:
+            rate: Starting refill rate in tokens per second
+            capacity: Maximum burst size (default: same as rate, at least 1)
+            min_rate: Floor the rate never drops below when penalized
+            max_rate: Ceiling the rate never exceeds when rewarded (default: starting rate)
+            increase_step: Tokens/second added back after each successful call
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate) if max_rate else self.rate
+        self.increase_step = float(increase_step)
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until `tokens` are available, then consume them"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return
+                    wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """
+        Multiplicatively decrease the rate after a throttling response
+
+        Args:
+            retry_after: Seconds to pause all callers (e.g. from a Retry-After header).
+                         Defaults to the time needed to refill one token at the new rate.
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+            self._tokens = 0.0
+            print(f"🐢 Rate limited, slowing down to {self.rate:.2f} req/s (pausing {pause:.1f}s)")
+
+    def reward(self):
+        """Additively increase the rate after a successful call"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def slow_down(self, factor: float = 0.75):
+        """Multiplicatively decrease the rate without pausing callers (e.g. when latency climbs)"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * factor)
+
+
+class HostRateLimiter:
+    """
+    AIMD rate control per host, built from one TokenBucket per hostname.
+
+    Callers acquire a token before each request and report the outcome:
+    healthy responses raise the host's rate step by step, 429/503 halve it and
+    pause the host (for Retry-After when given), and latency well above the
+    host's usual level or other server errors slow it down without pausing.
+    """
+
+    def __init__(self, rate: float, max_rate: float, min_rate: float = 0.2, burst: float = 1,
+                 increase_step: float = 0.5, latency_factor: float = 2.0):
+        """
+        Initialize the limiter
+
+        Args:
+            rate: Starting requests per second for a host not seen before
+            max_rate: Ceiling the rate climbs to while the host stays healthy
+            min_rate: Floor the rate never drops below
+            burst: Requests a host may be sent back to back after being idle
+            increase_step: Requests/second added after each healthy response
+            latency_factor: Recent latency this many times the usual level counts as overload
+        """
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.increase_step = increase_step
+        self.latency_factor = latency_factor
+        self._buckets: Dict[str, TokenBucket] = {}
+        # host -> [usual latency (slow average), recent latency (fast average), samples, last slow-down]
+        self._latency: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, capacity=self.burst, min_rate=self.min_rate,
+                                                  max_rate=self.max_rate, increase_step=self.increase_step)
+            return self._buckets[host]
+
+    def set_rate(self, host: str, rate: float, max_rate: Optional[float] = None):
+        """
+        Start a host at a different rate
+
+        Args:
+            host: Hostname, e.g. "ws-blau.com"
+            rate: Starting requests per second
+            max_rate: Ceiling for this host (default: the limiter's)
+        """
+        with self._lock:
+            self._buckets[host] = TokenBucket(rate, capacity=self.burst, min_rate=min(self.min_rate, rate),
+                                              max_rate=max_rate or max(self.max_rate, rate),
+                                              increase_step=self.increase_step)
+
+    def acquire(self, host: str):
+        """Block until the host may be sent another request"""
+        self.bucket(host).acquire()
+
+    def _latency_climbing(self, host: str, latency: float) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            stats = self._latency.setdefault(host, [latency, latency, 0, 0.0])
+            stats[0] += 0.05 * (latency - stats[0])
+            stats[1] += 0.3 * (latency - stats[1])
+            stats[2] += 1
+            # Needs some history, and one slow-down per second at most so a single spike can't collapse the rate
+            if stats[2] >= 10 and stats[1] > self.latency_factor * stats[0] and now - stats[3] > 1.0:
+                stats[3] = now
+                return True
+            return False
+
+    def record(self, host: str, status: Optional[int], latency: float, retry_after: Optional[float] = None):
+        """
+        Report the outcome of a request
+
+        Args:
+            host: Hostname the request went to
+            status: HTTP status, or None if it failed without a response
+            latency: Seconds the request took
+            retry_after: Seconds from a Retry-After header, if any
+        """
+        bucket = self.bucket(host)
+        if status in (429, 503):
+            bucket.penalize(retry_after)
+        elif status is None or status >= 500:
+            bucket.slow_down()
+        elif self._latency_climbing(host, latency):
+            print(f"🐢 {host} is slowing down, easing off to {bucket.rate * 0.75:.2f} req/s")
+            bucket.slow_down()
+        else:
+            bucket.reward()
@@ -0,0 +1,207 @@
+"""
+Segment-level translation cache for templated card effects.
+
+Card effects are assembled from recurring clauses ("[On Play]", "【登場時】",
+"カードを1枚引く" ...). Whole-string caching rarely hits because every card
+combines them differently, so effects are split on line breaks and leading
+keyword tags, each segment is translated (or served from cache) on its own,
+and the result is stitched back together with the original separators.
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Line separators seen across scrapers: real newlines, the literal "\n"
+# Union Arena stores, and raw <br> tags.
+_LINE_BREAK = re.compile(r'(\r?\n|\\n|<br\s*/?>)', re.IGNORECASE)
+
+# Keyword tags that lead an effect line, e.g. "[On Play]", "【登場時】", "■"
+_LEADING_TAG = re.compile(r'\s*(\[[^\]\n]*\]|【[^】\n]*】|《[^》\n]*》|■|▶|◆)')
+
+# Hiragana, katakana, CJK ideographs and halfwidth katakana
+_NEEDS_TRANSLATION = re.compile(r'[\u3040-\u30ff\u3400-\u9fff\uff66-\uff9f]')
+
+
+def needs_translation(text: str) -> bool:
+    """True if the segment contains Japanese text worth sending to a translator"""
+    return bool(text) and bool(_NEEDS_TRANSLATION.search(text))
+
+
+def split_segments(text: str) -> List[Tuple[str, bool]]:
+    """
+    Split effect text into (piece, translatable) tuples.
+
+    Joining every piece in order reproduces the input exactly. Separators,
+    whitespace and already-English tags are marked as not translatable.
+
+    Args:
+        text: Effect text to split
+
+    Returns:
+        List of (piece, translatable) tuples
+    """
+    pieces = []
+    for part in _LINE_BREAK.split(text):
+        if not part:
+            continue
+        if _LINE_BREAK.fullmatch(part):
+            pieces.append((part, False))
+            continue
+
+        # Peel off leading keyword tags one at a time
+        pos = 0
+        while True:
+            match = _LEADING_TAG.match(part, pos)
+            if not match:
+                break
+            if match.start(1) > pos:
+                pieces.append((part[pos:match.start(1)], False))
+            tag = match.group(1)
+            pieces.append((tag, needs_translation(tag)))
+            pos = match.end()
+
+        body = part[pos:]
+        stripped = body.strip()
+        if not stripped:
+            if body:
+                pieces.append((body, False))
+            continue
+
+        lead = body[:len(body) - len(body.lstrip())]
+        trail = body[len(body.rstrip()):]
+        if lead:
+            pieces.append((lead, False))
+        pieces.append((stripped, needs_translation(stripped)))
+        if trail:
+            pieces.append((trail, False))
+
+    return pieces
+
+
+class SegmentCache:
+    """Thread-safe segment → translation cache with optional JSON persistence"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            path: Optional JSON file to load from and save to
+        """
+        self.path = path
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+                print(f"✅ Loaded {len(self._entries)} cached segments from {path}")
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Could not load segment cache {path}: {e}")
+
+    @staticmethod
+    def _key(namespace: str, segment: str) -> str:
+        return f"{namespace}\x1f{segment}"
+
+    def get(self, namespace: str, segment: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(self._key(namespace, segment))
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, namespace: str, segment: str, translation: str):
+        with self._lock:
+            self._entries[self._key(namespace, segment)] = translation
+
+    def save(self):
+        """Write the cache back to disk (no-op without a path)"""
+        if not self.path:
+            return
+        with self._lock:
+            entries = dict(self._entries)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+
+
+# Shared by translationservice and OpenRouterService unless a caller passes its own
+default_segment_cache = SegmentCache(os.getenv('SEGMENT_CACHE_PATH'))
+
+
+def translate_segmented(texts: List[str],
+                        translate_many: Callable[[List[str]], Dict[str, str]],
+                        cache: Optional[SegmentCache] = None,
+                        namespace: str = "") -> Dict[str, str]:
+    """
+    Translate texts segment by segment, only sending uncached segments out.
+
+    Args:
+        texts: Texts to translate
+        translate_many: Callable taking a list of unique segments and returning
+                        a dict of segment → translation. Missing keys keep the original.
+        cache: Segment cache to use (default: shared default_segment_cache)
+        namespace: Cache namespace, e.g. "ja>en" or "ja>en:Kingdom"
+
+    Returns:
+        Dict of original text → reassembled translation. Texts with any segment
+        left untranslated are omitted, matching translate_many's contract.
+    """
+    cache = cache or default_segment_cache
+    segmented = {text: split_segments(text) for text in texts}
+
+    resolved: Dict[str, str] = {}
+    pending: List[str] = []
+    seen = set()
+    for pieces in segmented.values():
+        for piece, translatable in pieces:
+            if not translatable or piece in seen:
+                continue
+            seen.add(piece)
+            cached = cache.get(namespace, piece)
+            if cached is None:
+                pending.append(piece)
+            else:
+                resolved[piece] = cached
+
+    total = len(resolved) + len(pending)
+    print(f"🧩 Segments: {total} unique, {len(resolved)} cached, {len(pending)} to translate")
+
+    if pending:
+        translated = translate_many(pending) or {}
+        for piece in pending:
+            value = translated.get(piece)
+            if value is None:
+                continue  # Not cached, so it is retried next run
+            value = value.strip()
+            cache.set(namespace, piece, value)
+            resolved[piece] = value
+        cache.save()
+
+    return {
+        text: _reassemble(pieces, resolved)
+        for text, pieces in segmented.items()
+        if all(piece in resolved for piece, translatable in pieces if translatable)
+    }
+
+
+def _reassemble(pieces: List[Tuple[str, bool]], resolved: Dict[str, str]) -> str:
+    out = ""
+    for piece, translatable in pieces:
+        if translatable:
+            piece = resolved.get(piece, piece)
+            # "【登場時】カードを…" has no space, but "[On Play]Draw…" needs one
+            if out and piece[:1].isascii() and piece[:1].isalnum() and not out[-1].isspace():
+                out += " "
+        out += piece
+    return out
@@ -4,16 +4,389 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import json
+import threading
 import time
 import os
 
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Browsing profiles: "default" loads pages like a normal browser, "scrape" skips
+# everything a scraper never reads (images, media, fonts, ads/analytics, animations)
+SELENIUM_PROFILES = ("default", "scrape")
+
+# Chrome URL patterns ('*' wildcard) blocked via CDP in the scrape profile.
+# Blocking a request never changes the DOM, so <img src> etc. can still be read.
+SCRAPE_BLOCKED_RESOURCES = [
+    # Images
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*", "*.bmp*",
+    # Media
+    "*.mp4*", "*.webm*", "*.m4v*", "*.mov*", "*.mp3*", "*.m4a*", "*.ogg*", "*.wav*", "*.m3u8*",
+    # Fonts
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+]
+SCRAPE_BLOCKED_HOSTS = [
+    "*googletagmanager.com*", "*google-analytics.com*", "*analytics.google.com*",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*", "*adservice.google.*",
+    "*amazon-adsystem.com*", "*criteo.com*", "*criteo.net*", "*taboola.com*", "*outbrain.com*",
+    "*scorecardresearch.com*", "*quantserve.com*", "*quantcount.com*", "*hotjar.com*", "*clarity.ms*",
+    "*connect.facebook.net*", "*platform.twitter.com*", "*ads-twitter.com*", "*analytics.tiktok.com*",
+    "*yjtag.yahoo.co.jp*", "*nitropay.com*", "*pubmatic.com*",
+    "*rubiconproject.com*", "*adnxs.com*", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    "*use.typekit.net*",
+]
+# Extra comma-separated patterns to block in the scrape profile
+SELENIUM_EXTRA_BLOCKED_URLS = [p.strip() for p in os.getenv('SELENIUM_EXTRA_BLOCKED_URLS', '').split(',') if p.strip()]
+
+# Injected before any page script runs: no CSS animations/transitions or smooth scrolling
+_DISABLE_ANIMATIONS_JS = """
+(() => {
+    const css = '*, *::before, *::after { animation: none !important; transition: none !important; '
+        + 'scroll-behavior: auto !important; caret-color: auto !important; }';
+    const inject = () => {
+        const style = document.createElement('style');
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) { inject(); } else { document.addEventListener('DOMContentLoaded', inject); }
+})();
+"""
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def resolve_chromedriver_path():
+    """
+    Resolve the chromedriver binary once per process.
+    
+    Uses CHROMEDRIVER_PATH if set, otherwise webdriver_manager (downloaded/cached
+    on the first call only). Returns None to let Selenium Manager resolve it.
+    """
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            path = os.getenv('CHROMEDRIVER_PATH')
+            if not path:
+                try:
+                    from webdriver_manager.chrome import ChromeDriverManager
+                    path = ChromeDriverManager().install()
+                except Exception as e:
+                    print(f"⚠️ webdriver_manager unavailable ({e}), letting Selenium resolve chromedriver")
+                    path = ""
+            _chromedriver_path = path
+        return _chromedriver_path or None
+
+
+def chrome_service():
+    """Chrome Service using the resolved chromedriver binary"""
+    path = resolve_chromedriver_path()
+    return Service(path) if path else Service()
+
+
+# Counts in-flight fetch/XHR requests and the time of the last network activity.
+# Registered through CDP for every new document, and installed on the current one on demand.
+_NETWORK_TRACKER_JS = """
+(() => {
+    if (window.__gsNet) return;
+    const net = window.__gsNet = {inflight: 0, last: performance.now()};
+    const touch = (delta) => { net.inflight = Math.max(0, net.inflight + delta); net.last = performance.now(); };
+    const fetch = window.fetch;
+    if (fetch) {
+        window.fetch = function (...args) {
+            touch(1);
+            try {
+                return fetch.apply(this, args).finally(() => touch(-1));
+            } catch (e) {
+                touch(-1);
+                throw e;
+            }
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        touch(1);
+        this.addEventListener('loadend', () => touch(-1), {once: true});
+        return send.apply(this, args);
+    };
+})();
+"""
+
+_NETWORK_IDLE_JS = _NETWORK_TRACKER_JS + """
+const net = window.__gsNet;
+let last = net.last;
+for (const entry of performance.getEntriesByType('resource')) {
+    last = Math.max(last, entry.responseEnd || entry.startTime);
+}
+return [document.readyState, net.inflight, performance.now() - last];
+"""
+
+# Milliseconds since the last DOM mutation (observer installed on first call per document)
+_DOM_QUIET_JS = """
+const root = (arguments[0] && document.querySelector(arguments[0])) || document.documentElement;
+if (!window.__gsDom || window.__gsDom.root !== root) {
+    const state = window.__gsDom = {root: root, last: performance.now()};
+    new MutationObserver(() => { state.last = performance.now(); })
+        .observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return [document.readyState, performance.now() - window.__gsDom.last];
+"""
+
+
+# Interprets a compiled extraction spec (see compile_extract_spec) in the page and
+# returns the result as one JSON string, so only the extracted fields cross the wire
+_EXTRACT_JS = """
+const spec = arguments[0];
+const root = typeof arguments[1] === 'string' ? document.querySelector(arguments[1]) : (arguments[1] || document);
+if (!root) return 'null';
+
+const select = (scope, sel, all) => {
+    if (!sel) return all ? [scope] : scope;
+    if (sel.startsWith('xpath:')) {
+        const expr = sel.slice(6);
+        if (!all) {
+            return document.evaluate(expr, scope, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        const snapshot = document.evaluate(expr, scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        return Array.from({length: snapshot.snapshotLength}, (_, i) => snapshot.snapshotItem(i));
+    }
+    return all ? Array.from(scope.querySelectorAll(sel)) : scope.querySelector(sel);
+};
+
+const read = (el, attr) => {
+    if (!el) return null;
+    switch (attr) {
+        case 'text': return (el.textContent || '').trim();
+        case 'innerText': return (el.innerText || '').trim();
+        case 'html': return el.innerHTML;
+        case 'outerHTML': return el.outerHTML;
+        case 'strings': {
+            const out = [];
+            const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+            while (walker.nextNode()) {
+                const text = walker.currentNode.nodeValue.trim();
+                if (text) out.push(text);
+            }
+            return out;
+        }
+        default: return el.getAttribute ? el.getAttribute(attr) : null;
+    }
+};
+
+const run = (node, scope) => {
+    if (node.fields) {
+        const object = (el) => {
+            if (!el) return null;
+            const out = {};
+            for (const [name, child] of Object.entries(node.fields)) out[name] = run(child, el);
+            return out;
+        };
+        return node.all ? select(scope, node.sel, true).map(object) : object(select(scope, node.sel, false));
+    }
+    return node.all ? select(scope, node.sel, true).map(el => read(el, node.attr))
+                    : read(select(scope, node.sel, false), node.attr);
+};
+
+return JSON.stringify(run(spec, root));
+"""
+
+
+def compile_extract_spec(spec):
+    """
+    Normalize a declarative field spec for extract()
+    
+    Field forms:
+        "css"                      text of the first match
+        ("css", "attr")            attribute of the first match; attr may also be
+                                   "text", "innerText", "html", "outerHTML" or
+                                   "strings" (trimmed text nodes, like stripped_strings)
+        ["css"] / [("css", attr)]  the same for every match, as a list
+        {"_each": "css", ...}      a list of objects, one per match, fields relative to it
+        {"_scope": "css", ...}     one object for the first match (None if missing)
+    
+    A selector of "" means the element itself; "xpath:..." is evaluated as XPath
+    relative to the current element.
+    
+    Returns:
+        Compiled spec (a plain dict that can be passed to extract repeatedly)
+    """
+    if isinstance(spec, dict) and spec.get('_compiled'):
+        return spec
+    
+    def field(value):
+        if isinstance(value, dict):
+            if '_each' in value:
+                sel, all_ = value['_each'], True
+            else:
+                sel, all_ = value.get('_scope', ''), False
+            fields = {name: field(child) for name, child in value.items() if name not in ('_each', '_scope')}
+            return {'sel': sel, 'all': all_, 'fields': fields}
+        if isinstance(value, list):
+            if len(value) != 1:
+                raise ValueError(f"List fields take exactly one item spec, got {value!r}")
+            compiled = field(value[0])
+            compiled['all'] = True
+            return compiled
+        if isinstance(value, tuple):
+            sel, attr = value
+            return {'sel': sel, 'attr': attr, 'all': False}
+        if isinstance(value, str):
+            return {'sel': value, 'attr': 'text', 'all': False}
+        raise ValueError(f"Unsupported extraction spec: {value!r}")
+    
+    compiled = field(spec if isinstance(spec, dict) else {'value': spec})
+    compiled['_compiled'] = True
+    return compiled
+
+
+def extract(driver, spec, root=None):
+    """
+    Extract structured data from the current page in a single execute_script
+    
+    Args:
+        driver: WebDriver
+        spec: Field spec (see compile_extract_spec), raw or compiled
+        root: CSS selector or WebElement to evaluate the spec against (default: document)
+        
+    Returns:
+        Dict of extracted fields, or None if root was not found
+    """
+    return json.loads(driver.execute_script(_EXTRACT_JS, compile_extract_spec(spec), root))
+
+
+def _wait_until(driver, condition, timeout, poll):
+    """WebDriverWait.until that returns None instead of raising on timeout"""
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll,
+                             ignored_exceptions=(WebDriverException,)).until(condition)
+    except TimeoutException:
+        return None
+
+
+def wait_for_js(driver, script, *args, timeout=10, poll=0.1):
+    """
+    Poll a JavaScript predicate until it returns something truthy
+    
+    Args:
+        driver: WebDriver
+        script: JS body evaluated with execute_script (use `return ...`)
+        *args: Arguments passed to the script as arguments[0..]
+        timeout: Maximum seconds to wait
+        poll: Seconds between evaluations
+        
+    Returns:
+        The script's truthy result, or None on timeout
+    """
+    result = _wait_until(driver, lambda d: d.execute_script(script, *args), timeout, poll)
+    if not result:
+        print(f"⚠️ JS condition not met within {timeout} seconds")
+        return None
+    return result
+
+
+def wait_for_count_stable(driver, by, value, stable_for=0.5, min_count=1, timeout=10, poll=0.1):
+    """
+    Wait until the number of matching elements stops changing
+    
+    Args:
+        driver: WebDriver
+        by: Locator strategy (By.CSS_SELECTOR, ...)
+        value: Locator value
+        stable_for: Seconds the count must stay unchanged
+        min_count: Count that must be reached before it can be considered stable
+        timeout: Maximum seconds to wait
+        poll: Seconds between counts
+        
+    Returns:
+        Number of matching elements (the last count seen if the timeout hit)
+    """
+    deadline = time.monotonic() + timeout
+    count = -1
+    changed_at = time.monotonic()
+    while True:
+        try:
+            current = len(driver.find_elements(by, value))
+        except WebDriverException:
+            current = -1
+        now = time.monotonic()
+        if current != count:
+            count, changed_at = current, now
+        elif count >= min_count and now - changed_at >= stable_for:
+            return count
+        if now >= deadline:
+            print(f"⚠️ Element count for {by}='{value}' not stable within {timeout} seconds (last: {max(count, 0)})")
+            return max(count, 0)
+        time.sleep(poll)
+
+
+def wait_for_network_idle(driver, idle=0.5, timeout=10, max_inflight=0, poll=0.1):
+    """
+    Wait until the page has had no network activity for `idle` seconds
+    
+    fetch/XHR calls are tracked by a script Chrome injects (via CDP) into every
+    new document; finished subresources come from the Resource Timing API.
+    
+    Args:
+        driver: WebDriver
+        idle: Seconds without requests starting or finishing
+        timeout: Maximum seconds to wait
+        max_inflight: Requests allowed to stay open (long-polling, analytics beacons)
+        poll: Seconds between checks
+        
+    Returns:
+        True once idle, False on timeout
+    """
+    if not getattr(driver, '_network_tracker_registered', False):
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _NETWORK_TRACKER_JS})
+        except Exception:
+            pass  # Non-Chromium driver: the tracker is still installed on the current document
+        driver._network_tracker_registered = True
+    
+    def idle_now(d):
+        state, inflight, quiet_ms = d.execute_script(_NETWORK_IDLE_JS)
+        return state != 'loading' and inflight <= max_inflight and quiet_ms >= idle * 1000
+    
+    if _wait_until(driver, idle_now, timeout, poll):
+        return True
+    print(f"⚠️ Network not idle within {timeout} seconds")
+    return False
+
+
+def wait_for_dom_quiet(driver, quiet=0.5, timeout=10, root_selector=None, poll=0.1):
+    """
+    Wait until the DOM has not mutated for `quiet` seconds
+    
+    Args:
+        driver: WebDriver
+        quiet: Seconds without mutations
+        timeout: Maximum seconds to wait
+        root_selector: Only watch this subtree (default: whole document)
+        poll: Seconds between checks
+        
+    Returns:
+        True once quiet, False on timeout
+    """
+    def quiet_now(d):
+        state, quiet_ms = d.execute_script(_DOM_QUIET_JS, root_selector)
+        return state != 'loading' and quiet_ms >= quiet * 1000
+    
+    if _wait_until(driver, quiet_now, timeout, poll):
+        return True
+    print(f"⚠️ DOM still changing after {timeout} seconds")
+    return False
+
+
 class SeleniumService:
     """Selenium service layer for web automation"""
     
-    def __init__(self, headless=True, window_size="1920,1080", timeout=10):
+    def __init__(self, headless=True, window_size="1920,1080", timeout=10, profile="default"):
         """
         Initialize Selenium service
         
@@ -21,25 +394,87 @@ class SeleniumService:
             headless: Run browser in headless mode
             window_size: Browser window size
             timeout: Default wait timeout in seconds
+            profile: "default", or "scrape" to skip images/media/fonts/trackers,
+                     disable animations and return from get() once the DOM is ready
         """
+        if profile not in SELENIUM_PROFILES:
+            raise ValueError(f"Unknown Selenium profile '{profile}', expected one of {SELENIUM_PROFILES}")
         self.driver = None
         self.wait = None
         self.headless = headless
         self.window_size = window_size
         self.timeout = timeout
+        self.profile = profile
         self._setup_driver()
     
-    def _setup_driver(self):
-        """Setup Chrome driver with optimized options"""
+    @staticmethod
+    def apply_profile_options(chrome_options, profile="default"):
+        """
+        Add the browser-side settings of a profile to existing Chrome options
+        
+        Args:
+            chrome_options: selenium Options to modify
+            profile: Profile name (see SELENIUM_PROFILES)
+            
+        Returns:
+            The same options object
+        """
+        if profile != "scrape":
+            return chrome_options
+        
+        # get() returns at DOMContentLoaded instead of waiting for every subresource
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--force-prefers-reduced-motion")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_argument("--disable-remote-fonts")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-notifications")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.media_stream": 2,
+            "profile.managed_default_content_settings.notifications": 2,
+            "profile.managed_default_content_settings.geolocation": 2,
+            "profile.managed_default_content_settings.plugins": 2,
+        })
+        return chrome_options
+    
+    @staticmethod
+    def apply_profile(driver, profile="default"):
+        """
+        Apply the DevTools side of a profile to a running driver (request
+        blocking and animation suppression survive navigations).
+        
+        Args:
+            driver: Chrome WebDriver
+            profile: Profile name (see SELENIUM_PROFILES)
+        """
+        if profile != "scrape":
+            return driver
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {
+                "urls": SCRAPE_BLOCKED_RESOURCES + SCRAPE_BLOCKED_HOSTS + SELENIUM_EXTRA_BLOCKED_URLS
+            })
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _DISABLE_ANIMATIONS_JS})
+        except Exception as e:
+            # Non-Chromium drivers have no CDP; the Chrome prefs still apply
+            print(f"⚠️ Could not apply scrape profile via DevTools: {str(e)}")
+        return driver
+    
+    @staticmethod
+    def build_options(headless=True, window_size="1920,1080", user_agent=DEFAULT_USER_AGENT, profile="default"):
+        """Chrome options shared by SeleniumService and WebDriverPool"""
         chrome_options = Options()
         
-        if self.headless:
+        if headless:
             chrome_options.add_argument("--headless=new")
         
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument(f"--window-size={self.window_size}")
+        chrome_options.add_argument(f"--window-size={window_size}")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--disable-plugins")
@@ -50,13 +485,25 @@ class SeleniumService:
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
         # User agent to avoid detection
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
+        chrome_options.add_argument(f"--user-agent={user_agent}")
+        return SeleniumService.apply_profile_options(chrome_options, profile)
+    
+    @staticmethod
+    def create_driver(headless=True, window_size="1920,1080", profile="default"):
+        """Start a Chrome driver with the shared options and resolved chromedriver"""
+        driver = webdriver.Chrome(
+            service=chrome_service(),
+            options=SeleniumService.build_options(headless, window_size, profile=profile)
+        )
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return SeleniumService.apply_profile(driver, profile)
+    
+    def _setup_driver(self):
+        """Setup Chrome driver with optimized options"""
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self.driver = self.create_driver(self.headless, self.window_size, self.profile)
             self.wait = WebDriverWait(self.driver, self.timeout)
-            print(f"✅ Selenium driver initialized successfully")
+            print(f"✅ Selenium driver initialized successfully ({self.profile} profile)")
         except Exception as e:
             print(f"❌ Failed to create Chrome driver: {str(e)}")
             print("⚠️ Make sure chromedriver is installed and in PATH")
@@ -249,6 +696,36 @@ class SeleniumService:
         time.sleep(seconds)
         print(f"⏳ Waited {seconds} seconds")
     
+    def extract(self, spec, root=None):
+        """
+        Extract fields described by a declarative spec in one round trip
+        (see compile_extract_spec for the spec format)
+        
+        Returns:
+            Dict of extracted fields, or None if root was not found or the script failed
+        """
+        try:
+            return extract(self.driver, spec, root)
+        except Exception as e:
+            print(f"❌ Failed to extract data: {str(e)}")
+            return None
+    
+    def wait_for_js(self, script, *args, timeout=None, poll=0.1):
+        """Poll a JS predicate until truthy; returns its result or None on timeout"""
+        return wait_for_js(self.driver, script, *args, timeout=timeout or self.timeout, poll=poll)
+    
+    def wait_for_count_stable(self, by, value, stable_for=0.5, min_count=1, timeout=None, poll=0.1):
+        """Wait until the number of matching elements stops changing; returns the count"""
+        return wait_for_count_stable(self.driver, by, value, stable_for, min_count, timeout or self.timeout, poll)
+    
+    def wait_for_network_idle(self, idle=0.5, timeout=None, max_inflight=0, poll=0.1):
+        """Wait until no request has started or finished for `idle` seconds"""
+        return wait_for_network_idle(self.driver, idle, timeout or self.timeout, max_inflight, poll)
+    
+    def wait_for_dom_quiet(self, quiet=0.5, timeout=None, root_selector=None, poll=0.1):
+        """Wait until the DOM (or a subtree) has not mutated for `quiet` seconds"""
+        return wait_for_dom_quiet(self.driver, quiet, timeout or self.timeout, root_selector, poll)
+    
     def hover_over_element(self, by, value):
         """Hover over an element"""
         try:
@@ -315,6 +792,152 @@ class SeleniumService:
         self.close()
 
 
+class WebDriverPool:
+    """
+    Pool of warm Chrome drivers that scraping loops (or worker threads) share.
+    
+    Drivers are started lazily up to `size`, health-checked on every acquire,
+    and recycled after `max_pages` uses or when they crash, so a long run pays
+    a handful of Chrome cold starts instead of one per page.
+    
+    Example:
+        with WebDriverPool(size=2) as pool:
+            with pool.acquire() as driver:
+                driver.get(url)
+    """
+    
+    def __init__(self, size=1, max_pages=50, factory=None, headless=True, window_size="1920,1080", prewarm=False,
+                 profile="default"):
+        """
+        Initialize the pool
+        
+        Args:
+            size: Maximum number of live drivers
+            max_pages: Recycle a driver after this many acquires
+            factory: Callable returning a new WebDriver (default: SeleniumService.create_driver)
+            headless: Run browsers headless (default factory only)
+            window_size: Browser window size (default factory only)
+            prewarm: Start all drivers now rather than on first use
+            profile: Browsing profile (default factory only, see SeleniumService)
+        """
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.factory = factory or (lambda: SeleniumService.create_driver(headless, window_size, profile))
+        self._idle = []
+        self._pages = {}
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        if prewarm:
+            self.warm()
+    
+    def warm(self):
+        """Start drivers in parallel until the pool is full"""
+        with self._cond:
+            missing = self.size - self._live
+            self._live += missing
+        if missing <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            futures = [executor.submit(self.factory) for _ in range(missing)]
+        for future in futures:
+            try:
+                driver = future.result()
+            except Exception as e:
+                print(f"❌ Failed to start pooled driver: {str(e)}")
+                with self._cond:
+                    self._live -= 1
+                continue
+            with self._cond:
+                self._pages[id(driver)] = 0
+                self._idle.append(driver)
+                self._cond.notify()
+        print(f"✅ WebDriver pool warmed: {len(self._idle)} driver(s)")
+    
+    def _checkout(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("WebDriverPool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                self._cond.wait()
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._pages[id(driver)] = 0
+        return driver
+    
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._pages.pop(id(driver), None)
+            self._live -= 1
+            self._cond.notify()
+    
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a healthy driver for the duration of the with-block"""
+        driver = self._checkout()
+        while not self._is_healthy(driver):
+            print("♻️ Replacing unresponsive driver")
+            self._discard(driver)
+            driver = self._checkout()
+        
+        crashed = False
+        try:
+            yield driver
+        except WebDriverException:
+            crashed = True
+            raise
+        finally:
+            with self._cond:
+                self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+                worn_out = self._pages[id(driver)] >= self.max_pages
+                keep = not (crashed or worn_out or self._closed)
+                if keep:
+                    self._idle.append(driver)
+                    self._cond.notify()
+            if not keep:
+                if worn_out and not crashed:
+                    print(f"♻️ Recycling driver after {self.max_pages} pages")
+                self._discard(driver)
+    
+    def close(self):
+        """Quit idle drivers; drivers still in use are quit when released"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for driver in idle:
+            self._discard(driver)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
 def setup_selenium_driver():
     """Legacy function for backward compatibility"""
     return SeleniumService().driver
@@ -1,7 +1,94 @@
 from deep_translator import GoogleTranslator
+from deep_translator.exceptions import TooManyRequests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import threading
 import time
 from tqdm import tqdm
 
+from service.ratelimit_service import TokenBucket
+from service.segment_service import translate_segmented
+
+# Shared across every caller in the process so concurrent scrapers don't
+# collectively exceed the Google quota. Tune via env if needed.
+TRANSLATE_RATE = float(os.getenv('TRANSLATE_RATE', '5'))
+TRANSLATE_MAX_RATE = float(os.getenv('TRANSLATE_MAX_RATE', '10'))
+TRANSLATE_WORKERS = int(os.getenv('TRANSLATE_WORKERS', '8'))
+
+translation_bucket = TokenBucket(rate=TRANSLATE_RATE, capacity=TRANSLATE_RATE, max_rate=TRANSLATE_MAX_RATE)
+
+# GoogleTranslator mutates its own request params on every call, so each
+# worker thread gets its own instance.
+_thread_local = threading.local()
+
+
+def _get_translator(src_lang, dest_lang):
+    translators = getattr(_thread_local, 'translators', None)
+    if translators is None:
+        translators = _thread_local.translators = {}
+    key = (src_lang, dest_lang)
+    if key not in translators:
+        translators[key] = GoogleTranslator(source=src_lang, target=dest_lang)
+    return translators[key]
+
+
+def _is_rate_limit_error(error):
+    if isinstance(error, TooManyRequests):
+        return True
+    message = str(error).lower()
+    return '429' in message or 'too many requests' in message
+
+
+def _translate_with_limiter(text, src_lang, dest_lang, max_retries):
+    """
+    Translate one string through the shared token bucket.
+
+    Raises the last error if every attempt fails.
+    """
+    translator = _get_translator(src_lang, dest_lang)
+    last_error = None
+    for attempt in range(1, max_retries + 1):
+        translation_bucket.acquire()
+        try:
+            translated = translator.translate(str(text))
+            translation_bucket.reward()
+            return translated
+        except Exception as e:
+            last_error = e
+            if _is_rate_limit_error(e):
+                translation_bucket.penalize()
+            elif attempt < max_retries:
+                time.sleep(attempt)
+    raise last_error
+
+
+def _translate_many(texts, src_lang, dest_lang, max_retries, max_workers):
+    """
+    Translate unique strings concurrently.
+
+    Returns:
+        Dict of text → translation. Failed strings are left out.
+    """
+    translations = {}
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_translate_with_limiter, text, src_lang, dest_lang, max_retries): text
+            for text in texts
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Translating entries"):
+            text = futures[future]
+            try:
+                translations[text] = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"\n⚠️ Failed to translate '{text[:50]}': {e}")
+
+    if failed:
+        print(f"⚠️ {failed}/{len(texts)} strings could not be translated and were left as-is")
+    return translations
+
+
 def translate_text(text, src_lang='ja', dest_lang='en', max_retries=3):
     """
     Translates a single text string.
@@ -17,89 +104,93 @@ def translate_text(text, src_lang='ja', dest_lang='en', max_retries=3):
     """
     if not text or str(text).strip() == "":
         return text
-    
-    translator = GoogleTranslator(source=src_lang, target=dest_lang)
-    
-    retry_count = 0
-    while retry_count < max_retries:
-        try:
-            translated = translator.translate(str(text))
-            return translated
-        except Exception as e:
-            retry_count += 1
-            if retry_count < max_retries:
-                time.sleep(2 ** retry_count)  # Exponential backoff
-            else:
-                print(f"⚠️ Failed to translate '{text}': {e}")
-                return text  # Return original text if all retries fail
-    
-    return text  # Fallback
 
-def translate_data(data, 
+    try:
+        return _translate_with_limiter(text, src_lang, dest_lang, max_retries)
+    except Exception as e:
+        print(f"⚠️ Failed to translate '{text}': {e}")
+        return text  # Return original text if all retries fail
+
+def translate_data(data,
                                    fields_to_translate,
                                    src_lang='ja',
                                    dest_lang='en',
                                    batch_size=100,
                                    max_retries=3,
-                                   keep_original=True):
+                                   keep_original=True,
+                                   max_workers=None,
+                                   segmented=False,
+                                   segment_cache=None):
     """
     Translates specified fields in a list of JSON objects together per entry, preserving originals.
 
+    Unique strings are translated concurrently by a pool of workers, all drawing
+    from the shared token bucket so throughput adapts to the Google quota.
+
     Args:
         data: JSON data (list of objects) to translate.
         fields_to_translate: List of keys to translate.
         src_lang: Source language code.
         dest_lang: Target language code.
-        batch_size: Rate limit batch size.
+        batch_size: Unused, kept for backward compatibility (throttling is handled by the token bucket).
         max_retries: Retry attempts per translation.
         keep_original: If True (default), keeps original text in fieldJP. If False, only keeps translated version.
+        max_workers: Concurrent translation workers (default: TRANSLATE_WORKERS env, 8).
+        segmented: If True, split effect-style text into line/keyword segments and
+                   translate (or reuse cached) segments instead of whole strings.
+        segment_cache: SegmentCache to use when segmented (default: shared cache).
 
     Returns:
         Translated JSON data.
     """
-    translator = GoogleTranslator(source=src_lang, target=dest_lang)
+    max_workers = max_workers or TRANSLATE_WORKERS
 
     print(f"🔁 Translating fields: {fields_to_translate}")
     print(f"Total entries: {len(data)}")
 
-    for idx, item in enumerate(tqdm(data, desc="Translating entries")):
-        retry_count = 0
-        while retry_count < max_retries:
-            try:
-                for field in fields_to_translate:
-                    original = item.get(field, "")
-                    if not original or str(original).strip() == "":
-                        continue
-
-                    # Backup original (optional)
-                    if keep_original:
-                        item[f"{field}JP"] = original
-
-                    # Translate and assign
-                    if isinstance(original, list):
-                        translated_list = []
-                        for text in original:
-                            if not text or str(text).strip() == "":
-                                translated_list.append("")
-                                continue
-                            translated = translator.translate(str(text))
-                            translated_list.append(translated)
-                        item[field] = translated_list
-                    # Handle string fields
-                    elif str(original).strip() != "":
-                        item[field] = translator.translate(str(original))
-
-                break  # Success, break retry loop
-            except Exception as e:
-                retry_count += 1
-                if retry_count < max_retries:
-                    time.sleep(2 ** retry_count)
-                else:
-                    print(f"\n⚠️ Failed to translate entry {idx+1}: {e}")
-                    # Optional: Keep original for failed fields
-
-        # Optional: Simple throttle
-        if (idx + 1) % batch_size == 0:
-            time.sleep(1)
-
-    return data  # Return translated data
\ No newline at end of file
+    # Collect every unique non-empty string so duplicates are only translated once
+    unique_texts = []
+    seen = set()
+    for item in data:
+        for field in fields_to_translate:
+            original = item.get(field, "")
+            values = original if isinstance(original, list) else [original]
+            for text in values:
+                if not text or str(text).strip() == "":
+                    continue
+                text = str(text)
+                if text not in seen:
+                    seen.add(text)
+                    unique_texts.append(text)
+
+    translations = {}
+    if unique_texts:
+        translate_many = lambda texts: _translate_many(texts, src_lang, dest_lang, max_retries, max_workers)
+        if segmented:
+            translations = translate_segmented(unique_texts, translate_many,
+                                               cache=segment_cache,
+                                               namespace=f"google:{src_lang}>{dest_lang}")
+        else:
+            translations = translate_many(unique_texts)
+
+    for item in data:
+        for field in fields_to_translate:
+            original = item.get(field, "")
+            if not original or str(original).strip() == "":
+                continue
+
+            # Backup original (optional)
+            if keep_original:
+                item[f"{field}JP"] = original
+
+            # Translate and assign
+            if isinstance(original, list):
+                item[field] = [
+                    translations.get(str(text), text) if text and str(text).strip() != "" else ""
+                    for text in original
+                ]
+            # Handle string fields
+            else:
+                item[field] = translations.get(str(original), original)
+
+    return data  # Return translated data